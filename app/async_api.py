@@ -0,0 +1,541 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Literal, Optional, Union
+
+from .database import get_async_db
+from . import models, schemas, crud, crud_async, response_cache, serialization
+from .auth import get_current_user_async
+from .params import (
+    ADDRESS_FIELDS, ADDRESS_FIELDS_QUERY, BENEFIT_FIELDS, BENEFIT_FIELDS_QUERY, CHUNK_SIZE_QUERY, CONTACT_FIELDS,
+    CONTACT_FIELDS_QUERY, COOPERATOR_FIELDS, COOPERATOR_FIELDS_QUERY, CURSOR_QUERY, EXPAND_QUERY, FIELDS_QUERY,
+    LOCATION_FIELDS, LOCATION_FIELDS_QUERY, ORDER_QUERY, OWNER_FIELDS, OWNER_FIELDS_QUERY, SORT_QUERY,
+    conflict_error, pagination_error, parse_expand, parse_fields, project_filter_params
+)
+
+# Async versions of the routes in main.py, enabled with DATABASE_ASYNC.
+# They share paths and parameters with the sync routes, which document the API.
+router = APIRouter(include_in_schema=False)
+
+async def keyset_page(fetch, db: AsyncSession, cursor: str, sort: str, limit: int, **options):
+    try:
+        items, next_cursor = await fetch(db, cursor=cursor, sort=sort, limit=limit, **options)
+    except crud.PaginationError as e:
+        raise pagination_error(e)
+    return {"items": items, "next_cursor": next_cursor}
+
+async def rows_list(db: AsyncSession, model, fields, cursor: str, sort: str, skip: int, limit: int):
+    if cursor is not None:
+        rows = await keyset_page(crud_async.get_rows_page, db, cursor, sort, limit, model=model, fields=fields)
+    else:
+        rows = await crud_async.get_rows(db, model, fields, skip=skip, limit=limit)
+    return serialization.rows_response(rows)
+
+# Projects endpoints
+@router.get(
+    "/projects/",
+    response_model=schemas.list_response(schemas.ProjectFull, schemas.ProjectFields),
+    response_model_exclude_unset=True
+)
+async def read_projects(
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = CURSOR_QUERY,
+    sort: str = SORT_QUERY,
+    order: Literal["asc", "desc"] = ORDER_QUERY,
+    expand: Optional[str] = EXPAND_QUERY,
+    fields: Optional[str] = FIELDS_QUERY,
+    filters: schemas.ProjectFilter = Depends(project_filter_params),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: models.User = Depends(get_current_user_async)
+):
+    relationships = parse_expand(expand)
+    selected = parse_fields(fields, expand=relationships)
+    options = {"expand": relationships, "filters": filters, "descending": order == "desc", "fields": selected}
+    if cursor is not None:
+        page = await keyset_page(crud_async.get_projects_page, db, cursor, sort, limit, **options)
+        return serialization.rows_response(page) if selected else page
+    try:
+        # Plain project rows are cached; expanded and sparse reads go to the database
+        fetch = crud_async.get_projects if relationships or selected else response_cache.get_projects_async
+        projects = await fetch(db, skip=skip, limit=limit, sort=sort, **options)
+    except crud.PaginationError as e:
+        raise pagination_error(e)
+    return serialization.rows_response(projects) if selected else projects
+
+@router.post("/projects/", response_model=schemas.Project)
+async def create_project(
+    project: schemas.ProjectCreate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: models.User = Depends(get_current_user_async)
+):
+    try:
+        return await crud_async.create_project(db=db, project=project)
+    except crud.ConflictError as e:
+        raise conflict_error(e)
+
+@router.post("/projects/bulk", response_model=schemas.BulkResult)
+async def create_projects_bulk(
+    projects: List[schemas.ProjectCreate],
+    chunk_size: int = CHUNK_SIZE_QUERY,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: models.User = Depends(get_current_user_async)
+):
+    return await crud_async.bulk_create(db, models.Project, projects, chunk_size=chunk_size)
+
+@router.put("/projects/", response_model=schemas.Project)
+async def upsert_project(
+    project: schemas.ProjectCreate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: models.User = Depends(get_current_user_async)
+):
+    return (await crud_async.upsert(db, models.Project, [project]))[0]
+
+@router.put("/projects/bulk", response_model=List[schemas.Project])
+async def upsert_projects_bulk(
+    projects: List[schemas.ProjectCreate],
+    chunk_size: int = CHUNK_SIZE_QUERY,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: models.User = Depends(get_current_user_async)
+):
+    return await crud_async.upsert(db, models.Project, projects, chunk_size=chunk_size)
+
+@router.get("/projects/search", response_model=List[schemas.ProjectSearchResult])
+async def search_projects(
+    q: str = Query(..., min_length=1, description="Search terms, matched against title, description and notes"),
+    skip: int = 0,
+    limit: int = 100,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: models.User = Depends(get_current_user_async)
+):
+    return await crud_async.search_projects(db, q, skip=skip, limit=limit)
+
+@router.get("/projects/details", response_model=schemas.Page[schemas.ProjectDetails])
+async def read_project_details(
+    limit: int = 100,
+    cursor: Optional[str] = CURSOR_QUERY,
+    sort: str = SORT_QUERY,
+    order: Literal["asc", "desc"] = ORDER_QUERY,
+    filters: schemas.ProjectFilter = Depends(project_filter_params),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: models.User = Depends(get_current_user_async)
+):
+    options = {"filters": filters, "descending": order == "desc"}
+    return await keyset_page(crud_async.get_project_details_page, db, cursor, sort, limit, **options)
+
+@router.post("/projects/links/{relationship}", response_model=schemas.LinkResult)
+async def link_projects(
+    relationship: schemas.ProjectRelationship,
+    links: List[schemas.ProjectLink],
+    chunk_size: int = CHUNK_SIZE_QUERY,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: models.User = Depends(get_current_user_async)
+):
+    pairs = [(link.project_id, link.target_id) for link in links]
+    try:
+        return await crud_async.link_projects(db, relationship, pairs, chunk_size=chunk_size)
+    except crud.ConflictError as e:
+        raise conflict_error(e)
+
+@router.delete("/projects/links/{relationship}", response_model=schemas.LinkResult)
+async def unlink_projects(
+    relationship: schemas.ProjectRelationship,
+    links: List[schemas.ProjectLink],
+    chunk_size: int = CHUNK_SIZE_QUERY,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: models.User = Depends(get_current_user_async)
+):
+    pairs = [(link.project_id, link.target_id) for link in links]
+    return await crud_async.unlink_projects(db, relationship, pairs, chunk_size=chunk_size)
+
+@router.get("/projects/{project_id}", response_model=Union[schemas.Project, schemas.ProjectFields])
+async def read_project(
+    project_id: int,
+    fields: Optional[str] = FIELDS_QUERY,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: models.User = Depends(get_current_user_async)
+):
+    selected = parse_fields(fields)
+    if selected:
+        project = await crud_async.get_project_fields(db, project_id, selected)
+    else:
+        project = await response_cache.get_project_async(db, project_id=project_id)
+    if project is None:
+        raise HTTPException(status_code=404, detail="Project not found")
+    return serialization.rows_response(project) if selected else project
+
+@router.get("/projects/{project_id}/full", response_model=schemas.ProjectFull)
+async def read_project_full(
+    project_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: models.User = Depends(get_current_user_async)
+):
+    project = await crud_async.get_project_full(db, project_id=project_id)
+    if project is None:
+        raise HTTPException(status_code=404, detail="Project not found")
+    return project
+
+@router.put("/projects/{project_id}", response_model=schemas.Project)
+async def update_project(
+    project_id: int,
+    project: schemas.ProjectUpdate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: models.User = Depends(get_current_user_async)
+):
+    try:
+        updated_project = await crud_async.update_project(db, project_id=project_id, project=project)
+    except crud.ConflictError as e:
+        raise conflict_error(e)
+    if updated_project is None:
+        raise HTTPException(status_code=404, detail="Project not found")
+    return updated_project
+
+@router.put("/projects/{project_id}/links/{relationship}", response_model=schemas.LinkResult)
+async def set_project_links(
+    project_id: int,
+    relationship: schemas.ProjectRelationship,
+    target_ids: List[int],
+    chunk_size: int = CHUNK_SIZE_QUERY,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: models.User = Depends(get_current_user_async)
+):
+    if await crud_async.get_project(db, project_id=project_id) is None:
+        raise HTTPException(status_code=404, detail="Project not found")
+    try:
+        return await crud_async.set_project_links(db, project_id, relationship, target_ids, chunk_size=chunk_size)
+    except crud.ConflictError as e:
+        raise conflict_error(e)
+
+@router.delete("/projects/{project_id}")
+async def delete_project(
+    project_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: models.User = Depends(get_current_user_async)
+):
+    success = await crud_async.delete_project(db, project_id=project_id)
+    if not success:
+        raise HTTPException(status_code=404, detail="Project not found")
+    return {"message": "Project deleted successfully"}
+
+# Owners endpoints
+@router.get("/owners/", response_model=schemas.list_response(schemas.Owner, schemas.OwnerFields))
+async def read_owners(
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = CURSOR_QUERY,
+    sort: str = SORT_QUERY,
+    fields: Optional[str] = OWNER_FIELDS_QUERY,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: models.User = Depends(get_current_user_async)
+):
+    selected = parse_fields(fields, OWNER_FIELDS)
+    if selected:
+        return await rows_list(db, models.Owner, selected, cursor, sort, skip, limit)
+    if cursor is not None:
+        return await keyset_page(crud_async.get_owners_page, db, cursor, sort, limit)
+    return await response_cache.get_owners_async(db, skip=skip, limit=limit)
+
+@router.post("/owners/", response_model=schemas.Owner)
+async def create_owner(
+    owner: schemas.OwnerCreate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: models.User = Depends(get_current_user_async)
+):
+    try:
+        return await crud_async.create_owner(db=db, owner=owner)
+    except crud.ConflictError as e:
+        raise conflict_error(e)
+
+@router.post("/owners/bulk", response_model=schemas.BulkResult)
+async def create_owners_bulk(
+    owners: List[schemas.OwnerCreate],
+    chunk_size: int = CHUNK_SIZE_QUERY,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: models.User = Depends(get_current_user_async)
+):
+    return await crud_async.bulk_create(db, models.Owner, owners, chunk_size=chunk_size)
+
+@router.put("/owners/", response_model=schemas.Owner)
+async def upsert_owner(
+    owner: schemas.OwnerCreate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: models.User = Depends(get_current_user_async)
+):
+    return (await crud_async.upsert(db, models.Owner, [owner]))[0]
+
+@router.put("/owners/bulk", response_model=List[schemas.Owner])
+async def upsert_owners_bulk(
+    owners: List[schemas.OwnerCreate],
+    chunk_size: int = CHUNK_SIZE_QUERY,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: models.User = Depends(get_current_user_async)
+):
+    return await crud_async.upsert(db, models.Owner, owners, chunk_size=chunk_size)
+
+@router.get("/owners/{owner_id}", response_model=schemas.Owner)
+async def read_owner(
+    owner_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: models.User = Depends(get_current_user_async)
+):
+    owner = await response_cache.get_owner_async(db, owner_id=owner_id)
+    if owner is None:
+        raise HTTPException(status_code=404, detail="Owner not found")
+    return owner
+
+@router.put("/owners/{owner_id}", response_model=schemas.Owner)
+async def update_owner(
+    owner_id: int,
+    owner: schemas.OwnerCreate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: models.User = Depends(get_current_user_async)
+):
+    try:
+        updated_owner = await crud_async.update_owner(db, owner_id=owner_id, owner=owner)
+    except crud.ConflictError as e:
+        raise conflict_error(e)
+    if updated_owner is None:
+        raise HTTPException(status_code=404, detail="Owner not found")
+    return updated_owner
+
+@router.delete("/owners/{owner_id}")
+async def delete_owner(
+    owner_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: models.User = Depends(get_current_user_async)
+):
+    success = await crud_async.delete_owner(db, owner_id=owner_id)
+    if not success:
+        raise HTTPException(status_code=404, detail="Owner not found")
+    return {"message": "Owner deleted successfully"}
+
+# Cooperators endpoints
+@router.get("/cooperators/", response_model=schemas.list_response(schemas.Cooperator, schemas.CooperatorFields))
+async def read_cooperators(
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = CURSOR_QUERY,
+    sort: str = SORT_QUERY,
+    fields: Optional[str] = COOPERATOR_FIELDS_QUERY,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: models.User = Depends(get_current_user_async)
+):
+    selected = parse_fields(fields, COOPERATOR_FIELDS)
+    if selected:
+        return await rows_list(db, models.Cooperator, selected, cursor, sort, skip, limit)
+    if cursor is not None:
+        return await keyset_page(crud_async.get_cooperators_page, db, cursor, sort, limit)
+    return await response_cache.get_cooperators_async(db, skip=skip, limit=limit)
+
+@router.post("/cooperators/", response_model=schemas.Cooperator)
+async def create_cooperator(
+    cooperator: schemas.CooperatorCreate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: models.User = Depends(get_current_user_async)
+):
+    try:
+        return await crud_async.create_cooperator(db=db, cooperator=cooperator)
+    except crud.ConflictError as e:
+        raise conflict_error(e)
+
+@router.post("/cooperators/bulk", response_model=schemas.BulkResult)
+async def create_cooperators_bulk(
+    cooperators: List[schemas.CooperatorCreate],
+    chunk_size: int = CHUNK_SIZE_QUERY,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: models.User = Depends(get_current_user_async)
+):
+    return await crud_async.bulk_create(db, models.Cooperator, cooperators, chunk_size=chunk_size)
+
+@router.put("/cooperators/", response_model=schemas.Cooperator)
+async def upsert_cooperator(
+    cooperator: schemas.CooperatorCreate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: models.User = Depends(get_current_user_async)
+):
+    return (await crud_async.upsert(db, models.Cooperator, [cooperator]))[0]
+
+@router.put("/cooperators/bulk", response_model=List[schemas.Cooperator])
+async def upsert_cooperators_bulk(
+    cooperators: List[schemas.CooperatorCreate],
+    chunk_size: int = CHUNK_SIZE_QUERY,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: models.User = Depends(get_current_user_async)
+):
+    return await crud_async.upsert(db, models.Cooperator, cooperators, chunk_size=chunk_size)
+
+# Benefits endpoints
+@router.get("/benefits/", response_model=schemas.list_response(schemas.Benefit, schemas.BenefitFields))
+async def read_benefits(
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = CURSOR_QUERY,
+    sort: str = SORT_QUERY,
+    fields: Optional[str] = BENEFIT_FIELDS_QUERY,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: models.User = Depends(get_current_user_async)
+):
+    selected = parse_fields(fields, BENEFIT_FIELDS)
+    if selected:
+        return await rows_list(db, models.Benefit, selected, cursor, sort, skip, limit)
+    if cursor is not None:
+        return await keyset_page(crud_async.get_benefits_page, db, cursor, sort, limit)
+    return await response_cache.get_benefits_async(db, skip=skip, limit=limit)
+
+@router.post("/benefits/", response_model=schemas.Benefit)
+async def create_benefit(
+    benefit: schemas.BenefitCreate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: models.User = Depends(get_current_user_async)
+):
+    try:
+        return await crud_async.create_benefit(db=db, benefit=benefit)
+    except crud.ConflictError as e:
+        raise conflict_error(e)
+
+@router.post("/benefits/bulk", response_model=schemas.BulkResult)
+async def create_benefits_bulk(
+    benefits: List[schemas.BenefitCreate],
+    chunk_size: int = CHUNK_SIZE_QUERY,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: models.User = Depends(get_current_user_async)
+):
+    return await crud_async.bulk_create(db, models.Benefit, benefits, chunk_size=chunk_size)
+
+@router.put("/benefits/", response_model=schemas.Benefit)
+async def upsert_benefit(
+    benefit: schemas.BenefitCreate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: models.User = Depends(get_current_user_async)
+):
+    return (await crud_async.upsert(db, models.Benefit, [benefit]))[0]
+
+@router.put("/benefits/bulk", response_model=List[schemas.Benefit])
+async def upsert_benefits_bulk(
+    benefits: List[schemas.BenefitCreate],
+    chunk_size: int = CHUNK_SIZE_QUERY,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: models.User = Depends(get_current_user_async)
+):
+    return await crud_async.upsert(db, models.Benefit, benefits, chunk_size=chunk_size)
+
+# Addresses endpoints
+@router.get("/addresses/", response_model=schemas.list_response(schemas.Address, schemas.AddressFields))
+async def read_addresses(
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = CURSOR_QUERY,
+    sort: str = SORT_QUERY,
+    fields: Optional[str] = ADDRESS_FIELDS_QUERY,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: models.User = Depends(get_current_user_async)
+):
+    selected = parse_fields(fields, ADDRESS_FIELDS)
+    if selected:
+        return await rows_list(db, models.Address, selected, cursor, sort, skip, limit)
+    if cursor is not None:
+        return await keyset_page(crud_async.get_addresses_page, db, cursor, sort, limit)
+    return await response_cache.get_addresses_async(db, skip=skip, limit=limit)
+
+@router.post("/addresses/", response_model=schemas.Address)
+async def create_address(
+    address: schemas.AddressCreate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: models.User = Depends(get_current_user_async)
+):
+    return await crud_async.create_address(db=db, address=address)
+
+@router.post("/addresses/bulk", response_model=schemas.BulkResult)
+async def create_addresses_bulk(
+    addresses: List[schemas.AddressCreate],
+    chunk_size: int = CHUNK_SIZE_QUERY,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: models.User = Depends(get_current_user_async)
+):
+    return await crud_async.bulk_create(db, models.Address, addresses, chunk_size=chunk_size)
+
+# Contacts endpoints
+@router.get("/contacts/", response_model=schemas.list_response(schemas.Contact, schemas.ContactFields))
+async def read_contacts(
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = CURSOR_QUERY,
+    sort: str = SORT_QUERY,
+    fields: Optional[str] = CONTACT_FIELDS_QUERY,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: models.User = Depends(get_current_user_async)
+):
+    selected = parse_fields(fields, CONTACT_FIELDS)
+    if selected:
+        return await rows_list(db, models.Contact, selected, cursor, sort, skip, limit)
+    if cursor is not None:
+        return await keyset_page(crud_async.get_contacts_page, db, cursor, sort, limit)
+    return await response_cache.get_contacts_async(db, skip=skip, limit=limit)
+
+@router.post("/contacts/", response_model=schemas.Contact)
+async def create_contact(
+    contact: schemas.ContactCreate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: models.User = Depends(get_current_user_async)
+):
+    return await crud_async.create_contact(db=db, contact=contact)
+
+@router.post("/contacts/bulk", response_model=schemas.BulkResult)
+async def create_contacts_bulk(
+    contacts: List[schemas.ContactCreate],
+    chunk_size: int = CHUNK_SIZE_QUERY,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: models.User = Depends(get_current_user_async)
+):
+    return await crud_async.bulk_create(db, models.Contact, contacts, chunk_size=chunk_size)
+
+@router.put("/contacts/", response_model=schemas.Contact)
+async def upsert_contact(
+    contact: schemas.ContactCreate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: models.User = Depends(get_current_user_async)
+):
+    return (await crud_async.upsert(db, models.Contact, [contact]))[0]
+
+@router.put("/contacts/bulk", response_model=List[schemas.Contact])
+async def upsert_contacts_bulk(
+    contacts: List[schemas.ContactCreate],
+    chunk_size: int = CHUNK_SIZE_QUERY,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: models.User = Depends(get_current_user_async)
+):
+    return await crud_async.upsert(db, models.Contact, contacts, chunk_size=chunk_size)
+
+# Locations endpoints
+@router.get("/locations/", response_model=schemas.list_response(schemas.Location, schemas.LocationFields))
+async def read_locations(
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = CURSOR_QUERY,
+    sort: str = SORT_QUERY,
+    fields: Optional[str] = LOCATION_FIELDS_QUERY,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: models.User = Depends(get_current_user_async)
+):
+    selected = parse_fields(fields, LOCATION_FIELDS)
+    if selected:
+        return await rows_list(db, models.Location, selected, cursor, sort, skip, limit)
+    if cursor is not None:
+        return await keyset_page(crud_async.get_locations_page, db, cursor, sort, limit)
+    return await response_cache.get_locations_async(db, skip=skip, limit=limit)
+
+@router.post("/locations/", response_model=schemas.Location)
+async def create_location(
+    location: schemas.LocationCreate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: models.User = Depends(get_current_user_async)
+):
+    return await crud_async.create_location(db=db, location=location)
+
+@router.post("/locations/bulk", response_model=schemas.BulkResult)
+async def create_locations_bulk(
+    locations: List[schemas.LocationCreate],
+    chunk_size: int = CHUNK_SIZE_QUERY,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: models.User = Depends(get_current_user_async)
+):
+    return await crud_async.bulk_create(db, models.Location, locations, chunk_size=chunk_size)
@@ -1,14 +1,23 @@
 from datetime import datetime, timedelta
 from typing import Optional
 from jose import JWTError, jwt
-from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
+from sqlalchemy import event, inspect, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from . import crud, models
-from .database import SessionLocal
+from . import crud, crud_async, models
+from .cache import TTLCache
+from .database import SessionLocal, get_async_db, get_db
+from .metrics import Counter, Histogram, LATENCY_BUCKETS
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import contextvars
 import os
+import threading
+import time
 from dotenv import load_dotenv
+from starlette.concurrency import run_in_threadpool
 
 load_dotenv()
 
@@ -17,9 +26,137 @@ SECRET_KEY = os.getenv("SECRET_KEY", "your-secret-key-here")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Caches for authenticated requests
+AUTH_USER_CACHE_SIZE = int(os.getenv("AUTH_USER_CACHE_SIZE", "1024"))
+AUTH_USER_CACHE_TTL = float(os.getenv("AUTH_USER_CACHE_TTL", "60"))
+AUTH_TOKEN_CACHE_SIZE = int(os.getenv("AUTH_TOKEN_CACHE_SIZE", "4096"))
+AUTH_TOKEN_CACHE_TTL = float(os.getenv("AUTH_TOKEN_CACHE_TTL", "30"))
+
+user_cache = TTLCache(maxsize=AUTH_USER_CACHE_SIZE, ttl=AUTH_USER_CACHE_TTL)
+token_cache = TTLCache(maxsize=AUTH_TOKEN_CACHE_SIZE, ttl=AUTH_TOKEN_CACHE_TTL)
+
+# "database" loads the user behind each token (cached per worker). "stateless" trusts
+# the uid and role claims and only compares the token version against an in-process
+# map of all users' versions, reloaded every AUTH_VERSION_REFRESH seconds.
+AUTH_MODES = ("database", "stateless")
+AUTH_MODE = os.getenv("AUTH_MODE", "database")
+AUTH_VERSION_REFRESH = float(os.getenv("AUTH_VERSION_REFRESH", "30"))
+if AUTH_MODE not in AUTH_MODES:
+    raise ValueError(f"Unknown AUTH_MODE '{AUTH_MODE}', expected one of {', '.join(AUTH_MODES)}")
+
+class TokenVersions:
+    def __init__(self, refresh_interval: float):
+        self.refresh_interval = refresh_interval
+        self.versions = {}
+        self.loaded_at = None
+        self.refreshes = Counter()
+        self._lock = threading.Lock()
+
+    def stale(self):
+        return self.loaded_at is None or time.monotonic() - self.loaded_at >= self.refresh_interval
+
+    def refresh(self, db: Optional[Session] = None):
+        # One query for every user; the table is small and tokens for unknown ids are rejected
+        query = select(models.User.id, models.User.token_version)
+        if db is None:
+            with SessionLocal() as session:
+                versions = dict(session.execute(query).all())
+        else:
+            versions = dict(db.execute(query).all())
+        self.versions, self.loaded_at = versions, time.monotonic()
+        self.refreshes.inc()
+
+    def ensure_fresh(self):
+        if not self.stale():
+            return
+        with self._lock:
+            if self.stale():
+                self.refresh()
+
+    def get(self, user_id: int):
+        return self.versions.get(user_id)
+
+    def set(self, user_id: int, version: int):
+        self.versions = {**self.versions, user_id: version}
+
+    def clear(self):
+        self.versions, self.loaded_at = {}, None
+
+    def stats(self):
+        age = None if self.loaded_at is None else time.monotonic() - self.loaded_at
+        return {"users": len(self.versions), "age_seconds": age, "refreshes": self.refreshes.value}
+
+token_versions = TokenVersions(AUTH_VERSION_REFRESH)
+
+pwd_context = crud.pwd_context
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
+# Login verification pool
+LOGIN_WORKERS = int(os.getenv("LOGIN_WORKERS", "4"))
+LOGIN_MAX_PENDING = int(os.getenv("LOGIN_MAX_PENDING", "64"))
+
+class LoginPoolFull(Exception):
+    pass
+
+# Runs blocking login checks (bcrypt releases the GIL) on a few worker threads
+# and rejects new ones once `max_pending` are queued or running.
+class LoginPool:
+    def __init__(self, workers: int, max_pending: int):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="login")
+        self.pending = 0
+        self.in_flight = 0
+        self.completed = Counter()
+        self.rejected = Counter()
+        self.queue_wait_seconds = Histogram(LATENCY_BUCKETS)
+        self.run_seconds = Histogram(LATENCY_BUCKETS)
+        self._lock = threading.Lock()
+
+    async def run(self, func, *args):
+        with self._lock:
+            if self.pending >= self.max_pending:
+                self.rejected.inc()
+                raise LoginPoolFull()
+            self.pending += 1
+        queued_at = time.perf_counter()
+
+        def task():
+            started_at = time.perf_counter()
+            self.queue_wait_seconds.observe(started_at - queued_at)
+            with self._lock:
+                self.in_flight += 1
+            try:
+                return func(*args)
+            finally:
+                with self._lock:
+                    self.in_flight -= 1
+                self.run_seconds.observe(time.perf_counter() - started_at)
+
+        # Like run_in_threadpool, the worker runs in a copy of the request's context,
+        # so its SQL counts toward the request's timings
+        context = contextvars.copy_context()
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self.executor, context.run, task)
+        finally:
+            with self._lock:
+                self.pending -= 1
+            self.completed.inc()
+
+    def stats(self):
+        return {
+            "workers": self.workers,
+            "max_pending": self.max_pending,
+            "pending": self.pending,
+            "in_flight": self.in_flight,
+            "completed": self.completed.value,
+            "rejected": self.rejected.value,
+            "queue_wait_seconds": self.queue_wait_seconds.snapshot(),
+            "run_seconds": self.run_seconds.snapshot(),
+        }
+
+login_pool = LoginPool(LOGIN_WORKERS, LOGIN_MAX_PENDING)
+
 def verify_password(plain_password, hashed_password):
     return pwd_context.verify(plain_password, hashed_password)
 
@@ -36,44 +173,146 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, ALGORITHM)
     return encoded_jwt
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+def decode_token(token: str):
+    cached = token_cache.get(token)
+    if cached is not None:
+        if cached["exp"] > time.time():
+            return cached
+        token_cache.pop(token)
 
-async def get_current_user(
-    token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db)
-):
-    credentials_exception = HTTPException(
+    claims = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    if claims.get("exp") is not None:
+        token_cache.set(token, claims, ttl=min(AUTH_TOKEN_CACHE_TTL, claims["exp"] - time.time()))
+    return claims
+
+def snapshot_user(user: models.User):
+    # Detached copy that is safe to share between sessions and threads
+    return models.User(
+        id=user.id, username=user.username, email=user.email, role=user.role, token_version=user.token_version
+    )
+
+@event.listens_for(models.User, "before_update")
+def bump_token_version(mapper, connection, target):
+    # Tokens carry the role, so a role or password change revokes the tokens issued before
+    attrs = inspect(target).attrs
+    if attrs.role.history.has_changes() or attrs.hashed_password.history.has_changes():
+        target.token_version = (target.token_version or 0) + 1
+
+# User changes are noted on the session and applied to the caches once committed,
+# so a concurrent request cannot re-cache the old row or see a version that a
+# rollback undoes. A rollback of the whole transaction discards the notes.
+USERS_CHANGED = "auth_users_changed"
+
+def note_changed_user(target, version: Optional[int]):
+    state = inspect(target)
+    changes = state.session.info.setdefault(USERS_CHANGED, {})
+    usernames = changes.get(target.id, (set(), None))[0]
+    usernames.update([target.username, *state.attrs.username.history.deleted])
+    changes[target.id] = (usernames, version)
+
+@event.listens_for(models.User, "after_update")
+def note_updated_user(mapper, connection, target):
+    note_changed_user(target, target.token_version)
+
+@event.listens_for(models.User, "after_delete")
+def note_deleted_user(mapper, connection, target):
+    note_changed_user(target, None)
+
+@event.listens_for(Session, "after_commit")
+def invalidate_cached_users(session):
+    for user_id, (usernames, version) in session.info.pop(USERS_CHANGED, {}).items():
+        for username in usernames:
+            user_cache.pop(username)
+        if token_versions.loaded_at is not None:
+            token_versions.set(user_id, version)
+
+@event.listens_for(Session, "after_soft_rollback")
+def discard_changed_users(session, previous_transaction):
+    if not previous_transaction.nested:
+        session.info.pop(USERS_CHANGED, None)
+
+def get_cache_stats():
+    return {"users": user_cache.stats(), "tokens": token_cache.stats(), "token_versions": token_versions.stats()}
+
+def credentials_exception():
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
+
+def token_claims(token: str):
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        username: str = payload.get("sub")
-        if username is None:
-            raise credentials_exception
+        claims = decode_token(token)
     except JWTError:
-        raise credentials_exception
-    
-    user = crud.get_user_by_username(db, username=username)
-    if user is None:
-        raise credentials_exception
+        raise credentials_exception()
+    if claims.get("sub") is None:
+        raise credentials_exception()
+    return claims
+
+def check_token_version(claims: dict, user: models.User):
+    # Tokens issued before token_version existed carry no "ver" claim
+    if "ver" in claims and claims["ver"] != user.token_version:
+        raise credentials_exception()
     return user
 
+async def stateless_user(claims: dict):
+    if any(claims.get(name) is None for name in ("uid", "role", "ver")):
+        raise credentials_exception()
+    if token_versions.stale():
+        await run_in_threadpool(token_versions.ensure_fresh)
+    if token_versions.get(claims["uid"]) != claims["ver"]:
+        raise credentials_exception()
+    try:
+        role = models.UserRole(claims["role"])
+    except ValueError:
+        raise credentials_exception()
+    return models.User(id=claims["uid"], username=claims["sub"], role=role, token_version=claims["ver"])
+
+async def get_current_user(
+    token: str = Depends(oauth2_scheme),
+    db: Session = Depends(get_db)
+):
+    claims = token_claims(token)
+    if AUTH_MODE == "stateless":
+        return await stateless_user(claims)
+    username = claims["sub"]
+    user = user_cache.get(username)
+    if user is None:
+        db_user = crud.get_user_by_username(db, username=username)
+        if db_user is None:
+            raise credentials_exception()
+        user = snapshot_user(db_user)
+        user_cache.set(username, user)
+    return check_token_version(claims, user)
+
+async def get_current_user_async(
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_async_db)
+):
+    claims = token_claims(token)
+    if AUTH_MODE == "stateless":
+        return await stateless_user(claims)
+    username = claims["sub"]
+    user = user_cache.get(username)
+    if user is None:
+        db_user = await crud_async.get_user_by_username(db, username=username)
+        if db_user is None:
+            raise credentials_exception()
+        user = snapshot_user(db_user)
+        user_cache.set(username, user)
+    return check_token_version(claims, user)
+
 async def get_current_active_user(
     current_user: models.User = Depends(get_current_user)
 ):
-    if not current_user.is_active:
+    # Users have no is_active column yet; treat them as active unless one is set
+    if not getattr(current_user, "is_active", True):
         raise HTTPException(status_code=400, detail="Inactive user")
     return current_user
 
 def check_admin_access(current_user: models.User = Depends(get_current_active_user)):
-    if current_user.role != "kart_admin":
+    if current_user.role != models.UserRole.ADMIN:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Not enough permissions"
@@ -1,9 +1,15 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import DateTime, String, case, cast, column, delete, distinct, func, insert, literal_column, select, table, text, tuple_, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, selectinload
 from . import models, schemas
 from datetime import datetime, timedelta, UTC
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from typing import Optional
+import base64
+import binascii
+import json
 import os
 from dotenv import load_dotenv
 
@@ -14,7 +20,13 @@ SECRET_KEY = os.getenv("SECRET_KEY", "your-secret-key-here")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Rows per multi-row INSERT in bulk operations
+BULK_CHUNK_SIZE = int(os.getenv("BULK_CHUNK_SIZE", "500"))
+
+# bcrypt cost factor; each extra round doubles hashing and verification time
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=BCRYPT_ROUNDS)
 
 def verify_password(plain_password, hashed_password):
     return pwd_context.verify(plain_password, hashed_password)
@@ -32,6 +44,233 @@ def create_access_token(data: dict, expires_delta: timedelta | None = None):
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
+def access_token_claims(user: models.User):
+    # uid, role and ver let AUTH_MODE=stateless authenticate without loading the user
+    return {"sub": user.username, "uid": user.id, "role": models.UserRole(user.role).value, "ver": user.token_version}
+
+# Keyset pagination
+# Sort columns must be NOT NULL in the schema; the primary key breaks ties.
+KEYSET_SORT_COLUMNS = {
+    models.Project: ("id", "title", "start_year"),
+    models.Owner: ("id", "name"),
+    models.Cooperator: ("id", "name"),
+    models.Benefit: ("id", "name"),
+    models.Address: ("id", "city", "county"),
+    models.Contact: ("id", "name", "email"),
+    models.Location: ("id", "name"),
+    models.AuditLog: ("id", "changed_at"),
+}
+
+class PaginationError(ValueError):
+    pass
+
+class ConflictError(ValueError):
+    pass
+
+PROJECT_TITLE_CONFLICT = "A project with this title already exists in the sector"
+NAME_CONFLICT = "{entity} with this name already exists"
+LINK_CONFLICT = "Links must reference existing projects and {relationship}"
+
+def encode_cursor(sort: str, descending: bool, value, last_id: int):
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    payload = json.dumps({"s": sort, "d": descending, "v": value, "id": last_id}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str):
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return payload["s"], payload["d"], payload["v"], int(payload["id"])
+    except (binascii.Error, ValueError, KeyError, TypeError):
+        raise PaginationError("Invalid cursor")
+
+def keyset_query(query, model, cursor: Optional[str] = None, sort: str = "id",
+                 descending: bool = False, limit: int = 100):
+    if sort not in KEYSET_SORT_COLUMNS[model]:
+        raise PaginationError(f"Cannot sort by '{sort}'")
+    sort_column = getattr(model, sort)
+    if sort == "id":
+        key, order_by = model.id, [model.id]
+    else:
+        key, order_by = tuple_(sort_column, model.id), [sort_column, model.id]
+
+    if cursor:
+        cursor_sort, cursor_descending, value, last_id = decode_cursor(cursor)
+        if (cursor_sort, cursor_descending) != (sort, descending):
+            raise PaginationError("Cursor does not match the requested sort order")
+        if isinstance(sort_column.type, DateTime):
+            value = decode_cursor_datetime(value)
+        bound = last_id if sort == "id" else tuple_(value, last_id)
+        query = query.where(key < bound if descending else key > bound)
+
+    if descending:
+        order_by = [column.desc() for column in order_by]
+    # One extra row tells whether there is a next page
+    return query.order_by(*order_by).limit(limit + 1)
+
+def keyset_result(items, sort: str = "id", descending: bool = False, limit: int = 100):
+    next_cursor = None
+    if len(items) > limit:
+        items = items[:limit]
+        last = items[-1]
+        next_cursor = encode_cursor(sort, descending, getattr(last, sort), last.id)
+    return items, next_cursor
+
+def paginate(db: Session, query, model, cursor: Optional[str] = None, sort: str = "id",
+             descending: bool = False, limit: int = 100):
+    statement = keyset_query(query, model, cursor=cursor, sort=sort, descending=descending, limit=limit)
+    return keyset_result(db.scalars(statement).all(), sort=sort, descending=descending, limit=limit)
+
+def decode_cursor_datetime(value):
+    try:
+        return datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        raise PaginationError("Invalid cursor")
+
+# Bulk operations
+def insert_rows_statement(model):
+    return insert(model).returning(model.id, sort_by_parameter_order=True)
+
+def _insert_rows(db: Session, model, rows):
+    with db.begin_nested():
+        return db.scalars(insert_rows_statement(model), rows).all()
+
+def bulk_result(results):
+    created = sum(1 for result in results if "id" in result)
+    return {"created": created, "failed": len(results) - created, "items": results}
+
+def bulk_create(db: Session, model, items, chunk_size: int = BULK_CHUNK_SIZE):
+    results = []
+    for start in range(0, len(items), chunk_size):
+        rows = [item.model_dump() for item in items[start:start + chunk_size]]
+        try:
+            ids = _insert_rows(db, model, rows)
+            results.extend({"index": start + offset, "id": row_id} for offset, row_id in enumerate(ids))
+        except IntegrityError:
+            # Retry the rejected chunk row by row to report which items failed
+            for offset, row in enumerate(rows):
+                try:
+                    row_id = _insert_rows(db, model, [row])[0]
+                    results.append({"index": start + offset, "id": row_id})
+                except IntegrityError as e:
+                    results.append({"index": start + offset, "error": str(e.orig)})
+    db.commit()
+    return bulk_result(results)
+
+# Upserts keyed on natural keys, each backed by a unique index
+UPSERT_KEYS = {
+    models.Project: ("sector", "title"),
+    models.Owner: ("name",),
+    models.Contact: ("email",),
+    models.Cooperator: ("name",),
+    models.Benefit: ("name",),
+}
+
+def natural_key(model, values: dict):
+    return tuple(values[key] for key in UPSERT_KEYS[model])
+
+def upsert_rows(model, items):
+    # ON CONFLICT cannot touch a row twice in one statement, so the last item per key wins
+    rows = {}
+    for item in items:
+        row = item.model_dump()
+        rows[natural_key(model, row)] = row
+    return list(rows.values())
+
+def upsert_statement(dialect: str, model, rows):
+    keys = UPSERT_KEYS[model]
+    statement = (postgresql.insert if dialect == "postgresql" else sqlite.insert)(model).values(rows)
+    updates = {name: statement.excluded[name] for name in rows[0] if name not in keys}
+    if hasattr(model, "updated_at"):
+        updates["updated_at"] = datetime.utcnow()
+    if not updates:
+        # A no-op update still makes RETURNING report rows that already existed
+        updates = {keys[0]: statement.excluded[keys[0]]}
+    statement = statement.on_conflict_do_update(index_elements=keys, set_=updates)
+    return statement.returning(model.id, *(getattr(model, key) for key in keys))
+
+def upserted_ids(model, rows):
+    return {natural_key(model, row._asdict()): row.id for row in rows}
+
+def upsert_results(model, items, ids, db_objects):
+    return [db_objects[ids[natural_key(model, item.model_dump())]] for item in items]
+
+def upsert(db: Session, model, items, chunk_size: int = BULK_CHUNK_SIZE):
+    rows = upsert_rows(model, items)
+    ids = {}
+    for start in range(0, len(rows), chunk_size):
+        statement = upsert_statement(dialect_name(db), model, rows[start:start + chunk_size])
+        ids.update(upserted_ids(model, db.execute(statement)))
+    db.commit()
+    # Reload the committed rows in chunks rather than refreshing them one by one
+    id_list = list(ids.values())
+    db_objects = {}
+    for start in range(0, len(id_list), chunk_size):
+        query = select(model).where(model.id.in_(id_list[start:start + chunk_size]))
+        db_objects.update((db_object.id, db_object) for db_object in db.scalars(query))
+    return upsert_results(model, items, ids, db_objects)
+
+# Project relationship links, written set-based on the junction tables
+PROJECT_LINK_TABLES = {
+    "owners": (models.projects_owners, "owner_id"),
+    "contacts": (models.projects_contacts, "contact_id"),
+    "locations": (models.projects_locations, "location_id"),
+    "cooperators": (models.projects_cooperators, "cooperator_id"),
+    "benefits": (models.projects_benefits, "benefit_id"),
+}
+
+def link_statements(dialect: str, relationship: str, pairs, chunk_size: int = BULK_CHUNK_SIZE):
+    # Existing links are skipped by the primary key, so adding is idempotent
+    link_table, target = PROJECT_LINK_TABLES[relationship]
+    insert_for = postgresql.insert if dialect == "postgresql" else sqlite.insert
+    pairs = list(dict.fromkeys(pairs))
+    for start in range(0, len(pairs), chunk_size):
+        rows = [{"project_id": project_id, target: target_id} for project_id, target_id in pairs[start:start + chunk_size]]
+        yield insert_for(link_table).values(rows).on_conflict_do_nothing()
+
+def unlink_statements(relationship: str, pairs, chunk_size: int = BULK_CHUNK_SIZE):
+    link_table, target = PROJECT_LINK_TABLES[relationship]
+    pairs = list(dict.fromkeys(pairs))
+    key = tuple_(link_table.c.project_id, link_table.c[target])
+    for start in range(0, len(pairs), chunk_size):
+        yield delete(link_table).where(key.in_(pairs[start:start + chunk_size]))
+
+def project_links_query(relationship: str, project_id: int):
+    link_table, target = PROJECT_LINK_TABLES[relationship]
+    return select(link_table.c[target]).where(link_table.c.project_id == project_id)
+
+def link_changes(project_id: int, current, target_ids):
+    wanted = dict.fromkeys(target_ids)
+    added = [(project_id, target_id) for target_id in wanted if target_id not in current]
+    removed = [(project_id, target_id) for target_id in current if target_id not in wanted]
+    return added, removed
+
+def execute_links(db: Session, statements):
+    return sum(db.execute(statement).rowcount for statement in statements)
+
+def apply_links(db: Session, relationship: str, added=(), removed=(), chunk_size: int = BULK_CHUNK_SIZE):
+    try:
+        unlinked = execute_links(db, unlink_statements(relationship, removed, chunk_size))
+        linked = execute_links(db, link_statements(dialect_name(db), relationship, added, chunk_size))
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        raise ConflictError(LINK_CONFLICT.format(relationship=relationship))
+    return {"linked": linked, "unlinked": unlinked}
+
+def link_projects(db: Session, relationship: str, pairs, chunk_size: int = BULK_CHUNK_SIZE):
+    return apply_links(db, relationship, added=pairs, chunk_size=chunk_size)
+
+def unlink_projects(db: Session, relationship: str, pairs, chunk_size: int = BULK_CHUNK_SIZE):
+    return apply_links(db, relationship, removed=pairs, chunk_size=chunk_size)
+
+def set_project_links(db: Session, project_id: int, relationship: str, target_ids, chunk_size: int = BULK_CHUNK_SIZE):
+    # Only the difference against the current links is written
+    current = set(db.scalars(project_links_query(relationship, project_id)))
+    added, removed = link_changes(project_id, current, target_ids)
+    return apply_links(db, relationship, added=added, removed=removed, chunk_size=chunk_size)
+
 # User operations
 def get_user(db: Session, user_id: int):
     return db.query(models.User).filter(models.User.id == user_id).first()
@@ -58,6 +297,15 @@ def create_user(db: Session, user: schemas.UserCreate):
     db.refresh(db_user)
     return db_user
 
+def revoke_tokens(db: Session, user_id: int):
+    statement = (
+        update(models.User).where(models.User.id == user_id)
+        .values(token_version=models.User.token_version + 1).returning(models.User.token_version)
+    )
+    version = db.scalar(statement)
+    db.commit()
+    return version
+
 def authenticate_user(db: Session, username: str, password: str):
     user = get_user_by_username(db, username)
     if not user:
@@ -70,13 +318,317 @@ def authenticate_user(db: Session, username: str, password: str):
 def get_project(db: Session, project_id: int):
     return db.query(models.Project).filter(models.Project.id == project_id).first()
 
-def get_projects(db: Session, skip: int = 0, limit: int = 100):
-    return db.query(models.Project).offset(skip).limit(limit).all()
+def project_loader_options(expand=()):
+    # One SELECT ... WHERE id IN (...) per relationship, independent of page size
+    return [selectinload(getattr(models.Project, relationship)) for relationship in expand]
+
+def get_project_full(db: Session, project_id: int):
+    query = select(models.Project).where(models.Project.id == project_id)
+    return db.scalars(query.options(*project_loader_options(schemas.PROJECT_RELATIONSHIPS))).first()
+
+def filter_projects(query, filters: Optional[schemas.ProjectFilter] = None):
+    # Plain equality/IN and range predicates on bare columns, so the composite
+    # indexes on (sector, status, start_year), (managment_level, status) etc. apply
+    if filters is None:
+        return query
+    project = models.Project
+    for column, values in (
+        (project.status, filters.status),
+        (project.sector, filters.sector),
+        (project.managment_level, filters.managment_level),
+    ):
+        if values:
+            query = query.where(column.in_(values))
+    for column, lower, upper in (
+        (project.start_year, filters.start_year_min, filters.start_year_max),
+        (project.end_year, filters.end_year_min, filters.end_year_max),
+    ):
+        if lower is not None:
+            query = query.where(column >= lower)
+        if upper is not None:
+            query = query.where(column <= upper)
+    return query
+
+# Sparse fieldsets: a Core select of the requested columns instead of whole entities
+def columns_query(model, fields):
+    return select(*(getattr(model, name) for name in fields))
+
+def field_rows(rows, fields):
+    return [{name: row._mapping[name] for name in fields} for row in rows]
+
+def keyset_columns_query(model, fields, sort: Optional[str] = None):
+    # Keyset cursors are built from the sort column, so it is selected even if not requested
+    if sort in KEYSET_SORT_COLUMNS[model]:
+        fields = tuple(dict.fromkeys((*fields, sort)))
+    return columns_query(model, fields)
+
+def rows_query(model, fields, skip: int = 0, limit: int = 100):
+    return columns_query(model, fields).offset(skip).limit(limit)
+
+def rows_page_query(model, fields, cursor: Optional[str] = None, sort: str = "id", limit: int = 100,
+                    descending: bool = False):
+    query = keyset_columns_query(model, fields, sort)
+    return keyset_query(query, model, cursor=cursor, sort=sort, descending=descending, limit=limit)
+
+def get_rows(db: Session, model, fields, skip: int = 0, limit: int = 100):
+    return field_rows(db.execute(rows_query(model, fields, skip=skip, limit=limit)), fields)
+
+def get_rows_page(db: Session, model, fields, cursor: Optional[str] = None, sort: str = "id", limit: int = 100,
+                  descending: bool = False):
+    statement = rows_page_query(model, fields, cursor=cursor, sort=sort, limit=limit, descending=descending)
+    items, next_cursor = keyset_result(db.execute(statement).all(), sort=sort, descending=descending, limit=limit)
+    return field_rows(items, fields), next_cursor
+
+def project_select(expand=(), fields=(), sort: Optional[str] = None):
+    if not fields:
+        return select(models.Project).options(*project_loader_options(expand))
+    return keyset_columns_query(models.Project, fields, sort)
+
+def projects_query(skip: int = 0, limit: int = 100, expand=(), filters: Optional[schemas.ProjectFilter] = None,
+                   sort: str = "id", descending: bool = False, fields=()):
+    if sort not in KEYSET_SORT_COLUMNS[models.Project]:
+        raise PaginationError(f"Cannot sort by '{sort}'")
+    order_by = [getattr(models.Project, sort), models.Project.id]
+    if descending:
+        order_by = [column.desc() for column in order_by]
+    query = filter_projects(project_select(expand, fields), filters)
+    return query.order_by(*order_by).offset(skip).limit(limit)
+
+def projects_page_query(cursor: Optional[str] = None, sort: str = "id", limit: int = 100, expand=(),
+                        filters: Optional[schemas.ProjectFilter] = None, descending: bool = False, fields=()):
+    query = filter_projects(project_select(expand, fields, sort), filters)
+    return keyset_query(query, models.Project, cursor=cursor, sort=sort, descending=descending, limit=limit)
+
+def project_fields_query(project_id: int, fields):
+    return columns_query(models.Project, fields).where(models.Project.id == project_id)
+
+def get_projects(db: Session, skip: int = 0, limit: int = 100, expand=(),
+                 filters: Optional[schemas.ProjectFilter] = None, sort: str = "id", descending: bool = False, fields=()):
+    query = projects_query(skip=skip, limit=limit, expand=expand, filters=filters, sort=sort, descending=descending,
+                           fields=fields)
+    if fields:
+        return field_rows(db.execute(query), fields)
+    return db.scalars(query).all()
+
+def get_projects_page(db: Session, cursor: Optional[str] = None, sort: str = "id", limit: int = 100, expand=(),
+                      filters: Optional[schemas.ProjectFilter] = None, descending: bool = False, fields=()):
+    statement = projects_page_query(cursor=cursor, sort=sort, limit=limit, expand=expand, filters=filters,
+                                    descending=descending, fields=fields)
+    if not fields:
+        return keyset_result(db.scalars(statement).all(), sort=sort, descending=descending, limit=limit)
+    items, next_cursor = keyset_result(db.execute(statement).all(), sort=sort, descending=descending, limit=limit)
+    return field_rows(items, fields), next_cursor
+
+def get_project_fields(db: Session, project_id: int, fields):
+    rows = field_rows(db.execute(project_fields_query(project_id, fields)), fields)
+    return rows[0] if rows else None
+
+def dialect_name(db):
+    return db.get_bind().dialect.name
+
+def fts5_query(query_text: str):
+    # Quote every term so user input is matched literally, all terms required
+    return " ".join('"' + term.replace('"', '""') + '"' for term in query_text.split())
+
+def search_projects_query(dialect: str, query_text: str, skip: int = 0, limit: int = 100):
+    if dialect == "postgresql":
+        ts_query = func.plainto_tsquery("english", query_text)
+        search_vector = literal_column("projects.search_vector")
+        rank = func.ts_rank(search_vector, ts_query)
+        query = select(models.Project, rank.label("rank")).where(search_vector.op("@@")(ts_query))
+    else:
+        # bm25() is lower for better matches
+        projects_fts = table("projects_fts", column("rowid"))
+        rank = -func.bm25(literal_column("projects_fts"))
+        query = (
+            select(models.Project, rank.label("rank"))
+            .join(projects_fts, projects_fts.c.rowid == models.Project.id)
+            .where(text("projects_fts MATCH :match").bindparams(match=fts5_query(query_text)))
+        )
+    return query.order_by(rank.desc(), models.Project.id).offset(skip).limit(limit)
+
+def search_results(rows):
+    return [
+        schemas.ProjectSearchResult(**schemas.Project.model_validate(project).model_dump(), rank=rank)
+        for project, rank in rows
+    ]
+
+def search_projects(db: Session, query_text: str, skip: int = 0, limit: int = 100):
+    if not query_text.split():
+        return []
+    query = search_projects_query(dialect_name(db), query_text, skip=skip, limit=limit)
+    return search_results(db.execute(query).all())
+
+# Same columns as the project_details view, reading the trigger-maintained summary
+def project_details_query(filters: Optional[schemas.ProjectFilter] = None):
+    summary = models.ProjectDetailsSummary
+    query = select(
+        models.Project.id, models.Project.title, models.Project.description, models.Project.status,
+        models.Project.start_year, models.Project.end_year, models.Project.sector, models.Project.project_link,
+        models.Project.notes, models.Project.managment_level,
+        summary.owners, summary.contacts, summary.locations, summary.cooperators, summary.benefits,
+    ).outerjoin(summary, summary.project_id == models.Project.id)
+    return filter_projects(query, filters)
+
+def get_project_details_page(db: Session, cursor: Optional[str] = None, sort: str = "id", limit: int = 100,
+                             filters: Optional[schemas.ProjectFilter] = None, descending: bool = False):
+    statement = keyset_query(project_details_query(filters), models.Project, cursor=cursor, sort=sort,
+                             descending=descending, limit=limit)
+    return keyset_result(db.execute(statement).all(), sort=sort, descending=descending, limit=limit)
+
+# Set-based equivalent of get_sector_statistics(): one aggregate over projects
+def sector_statistics_query():
+    current_year = datetime.now(UTC).year
+    duration = func.coalesce(models.Project.end_year, current_year) - models.Project.start_year
+    return (
+        select(
+            models.Project.sector,
+            func.count().label("total_projects"),
+            func.count(case((models.Project.status == models.ProjectStatus.IN_PROGRESS, 1))).label("active_projects"),
+            func.count(case((models.Project.status == models.ProjectStatus.COMPLETED, 1))).label("completed_projects"),
+            func.avg(duration).label("avg_duration_years"),
+        )
+        .group_by(models.Project.sector)
+        .order_by(models.Project.sector)
+    )
+
+def sector_statistics(rows):
+    statistics = []
+    for row in rows:
+        values = row._asdict()
+        if values["avg_duration_years"] is not None:
+            values["avg_duration_years"] = round(float(values["avg_duration_years"]), 1)
+        statistics.append(schemas.SectorStatistics(**values))
+    return statistics
+
+def get_sector_statistics(db: Session):
+    return sector_statistics(db.execute(sector_statistics_query()).all())
+
+# Statistics views; DISTINCT aggregates are collected as comma separated enum names
+def distinct_names(dialect: str, expression):
+    if dialect == "postgresql":
+        return func.string_agg(distinct(cast(expression, String)), ",")
+    return func.group_concat(distinct(expression))
+
+def split_names(value):
+    return sorted(value.split(",")) if value else []
+
+def get_project_statistics(db: Session):
+    query = (
+        select(
+            models.Project.sector,
+            models.Project.status,
+            func.count().label("total_projects"),
+            func.count(case((models.Project.end_year.is_(None), 1))).label("active_projects"),
+            func.count(case((models.Project.end_year.is_not(None), 1))).label("completed_projects"),
+            func.min(models.Project.start_year).label("earliest_start"),
+            func.max(models.Project.start_year).label("latest_start"),
+        )
+        .group_by(models.Project.sector, models.Project.status)
+        .order_by(models.Project.sector, models.Project.status)
+    )
+    return [schemas.ProjectStatistics(**row._asdict()) for row in db.execute(query)]
+
+def get_management_level_statistics(db: Session):
+    query = (
+        select(
+            models.Project.managment_level,
+            func.count().label("project_count"),
+            func.count(distinct(models.Project.sector)).label("sectors_covered"),
+            distinct_names(dialect_name(db), models.Project.sector).label("sectors"),
+        )
+        .group_by(models.Project.managment_level)
+        .order_by(models.Project.managment_level)
+    )
+    return [
+        schemas.ManagementLevelStatistics(**row._asdict() | {"sectors": split_names(row.sectors)})
+        for row in db.execute(query)
+    ]
+
+def get_location_statistics(db: Session):
+    dialect = dialect_name(db)
+    query = (
+        select(
+            models.Address.city,
+            models.Address.county,
+            func.count(distinct(models.Project.id)).label("project_count"),
+            distinct_names(dialect, models.Project.sector).label("sectors"),
+            distinct_names(dialect, models.Project.status).label("statuses"),
+        )
+        .select_from(models.Location)
+        .join(models.Address, models.Location.address_id == models.Address.id)
+        .join(models.projects_locations, models.projects_locations.c.location_id == models.Location.id)
+        .join(models.Project, models.projects_locations.c.project_id == models.Project.id)
+        .group_by(models.Address.city, models.Address.county)
+        .order_by(models.Address.city, models.Address.county)
+    )
+    return [
+        schemas.LocationStatistics(
+            **row._asdict() | {"sectors": split_names(row.sectors), "statuses": split_names(row.statuses)}
+        )
+        for row in db.execute(query)
+    ]
+
+def get_owner_statistics(db: Session):
+    dialect = dialect_name(db)
+    query = (
+        select(
+            models.Owner.id.label("owner_id"),
+            models.Owner.name.label("owner_name"),
+            func.count(distinct(models.Project.id)).label("project_count"),
+            func.count(distinct(models.Project.sector)).label("sectors_involved"),
+            distinct_names(dialect, models.Project.sector).label("sectors"),
+            distinct_names(dialect, models.Project.status).label("statuses"),
+        )
+        .select_from(models.Owner)
+        .join(models.projects_owners, models.projects_owners.c.owner_id == models.Owner.id)
+        .join(models.Project, models.projects_owners.c.project_id == models.Project.id)
+        .group_by(models.Owner.id, models.Owner.name)
+        .order_by(models.Owner.name, models.Owner.id)
+    )
+    return [
+        schemas.OwnerStatistics(
+            **row._asdict() | {"sectors": split_names(row.sectors), "statuses": split_names(row.statuses)}
+        )
+        for row in db.execute(query)
+    ]
+
+# Unique keys, as named by create_all and by sql/, and the columns SQLite reports instead
+PROJECT_TITLE_CONSTRAINT = (("uq_projects_sector_title",), ("projects.sector", "projects.title"))
+NAME_CONSTRAINTS = {
+    models.Owner: (("ix_owners_name", "owners_name_key"), ("owners.name",)),
+    models.Cooperator: (("ix_cooperators_name", "cooperators_name_key"), ("cooperators.name",)),
+    models.Benefit: (("ix_benefits_name", "benefits_name_key"), ("benefits.name",)),
+}
+
+def unique_violation(error: IntegrityError, constraints, columns):
+    orig = error.orig
+    # psycopg2 reports the constraint through diag, asyncpg on the wrapped exception
+    name = getattr(getattr(orig, "diag", None), "constraint_name", None) or getattr(orig.__cause__, "constraint_name", None)
+    if name is not None:
+        return name in constraints
+    return str(orig) == "UNIQUE constraint failed: " + ", ".join(columns)
+
+def commit_unique(db: Session, constraint, message: str):
+    try:
+        db.commit()
+    except IntegrityError as e:
+        db.rollback()
+        if unique_violation(e, *constraint):
+            raise ConflictError(message)
+        raise
+
+def commit_named(db: Session, model):
+    commit_unique(db, NAME_CONSTRAINTS[model], NAME_CONFLICT.format(entity=model.__name__))
+
+def commit_project(db: Session):
+    # (sector, title) is enforced by a unique index, so concurrent writers cannot race past it
+    commit_unique(db, PROJECT_TITLE_CONSTRAINT, PROJECT_TITLE_CONFLICT)
 
 def create_project(db: Session, project: schemas.ProjectCreate):
     db_project = models.Project(**project.model_dump())
     db.add(db_project)
-    db.commit()
+    commit_project(db)
     db.refresh(db_project)
     return db_project
 
@@ -87,7 +639,7 @@ def update_project(db: Session, project_id: int, project: schemas.ProjectUpdate)
     update_data = project.model_dump(exclude_unset=True)
     for field, value in update_data.items():
         setattr(db_project, field, value)
-    db.commit()
+    commit_project(db)
     db.refresh(db_project)
     return db_project
 
@@ -107,10 +659,13 @@ def get_owner(db: Session, owner_id: int):
 def get_owners(db: Session, skip: int = 0, limit: int = 100):
     return db.query(models.Owner).offset(skip).limit(limit).all()
 
+def get_owners_page(db: Session, cursor: Optional[str] = None, sort: str = "id", limit: int = 100):
+    return paginate(db, select(models.Owner), models.Owner, cursor=cursor, sort=sort, limit=limit)
+
 def create_owner(db: Session, owner: schemas.OwnerCreate):
     db_owner = models.Owner(**owner.model_dump())
     db.add(db_owner)
-    db.commit()
+    commit_named(db, models.Owner)
     db.refresh(db_owner)
     return db_owner
 
@@ -122,7 +677,7 @@ def update_owner(db: Session, owner_id: int, owner: schemas.OwnerCreate):
     for field, value in owner.dict().items():
         setattr(db_owner, field, value)
     
-    db.commit()
+    commit_named(db, models.Owner)
     db.refresh(db_owner)
     return db_owner
 
@@ -142,10 +697,13 @@ def get_cooperator(db: Session, cooperator_id: int):
 def get_cooperators(db: Session, skip: int = 0, limit: int = 100):
     return db.query(models.Cooperator).offset(skip).limit(limit).all()
 
+def get_cooperators_page(db: Session, cursor: Optional[str] = None, sort: str = "id", limit: int = 100):
+    return paginate(db, select(models.Cooperator), models.Cooperator, cursor=cursor, sort=sort, limit=limit)
+
 def create_cooperator(db: Session, cooperator: schemas.CooperatorCreate):
     db_cooperator = models.Cooperator(**cooperator.dict())
     db.add(db_cooperator)
-    db.commit()
+    commit_named(db, models.Cooperator)
     db.refresh(db_cooperator)
     return db_cooperator
 
@@ -156,10 +714,13 @@ def get_benefit(db: Session, benefit_id: int):
 def get_benefits(db: Session, skip: int = 0, limit: int = 100):
     return db.query(models.Benefit).offset(skip).limit(limit).all()
 
+def get_benefits_page(db: Session, cursor: Optional[str] = None, sort: str = "id", limit: int = 100):
+    return paginate(db, select(models.Benefit), models.Benefit, cursor=cursor, sort=sort, limit=limit)
+
 def create_benefit(db: Session, benefit: schemas.BenefitCreate):
     db_benefit = models.Benefit(**benefit.dict())
     db.add(db_benefit)
-    db.commit()
+    commit_named(db, models.Benefit)
     db.refresh(db_benefit)
     return db_benefit
 
@@ -170,6 +731,9 @@ def get_address(db: Session, address_id: int):
 def get_addresses(db: Session, skip: int = 0, limit: int = 100):
     return db.query(models.Address).offset(skip).limit(limit).all()
 
+def get_addresses_page(db: Session, cursor: Optional[str] = None, sort: str = "id", limit: int = 100):
+    return paginate(db, select(models.Address), models.Address, cursor=cursor, sort=sort, limit=limit)
+
 def create_address(db: Session, address: schemas.AddressCreate):
     db_address = models.Address(**address.dict())
     db.add(db_address)
@@ -184,6 +748,9 @@ def get_contact(db: Session, contact_id: int):
 def get_contacts(db: Session, skip: int = 0, limit: int = 100):
     return db.query(models.Contact).offset(skip).limit(limit).all()
 
+def get_contacts_page(db: Session, cursor: Optional[str] = None, sort: str = "id", limit: int = 100):
+    return paginate(db, select(models.Contact), models.Contact, cursor=cursor, sort=sort, limit=limit)
+
 def create_contact(db: Session, contact: schemas.ContactCreate):
     db_contact = models.Contact(**contact.dict())
     db.add(db_contact)
@@ -198,9 +765,31 @@ def get_location(db: Session, location_id: int):
 def get_locations(db: Session, skip: int = 0, limit: int = 100):
     return db.query(models.Location).offset(skip).limit(limit).all()
 
+def get_locations_page(db: Session, cursor: Optional[str] = None, sort: str = "id", limit: int = 100):
+    return paginate(db, select(models.Location), models.Location, cursor=cursor, sort=sort, limit=limit)
+
 def create_location(db: Session, location: schemas.LocationCreate):
     db_location = models.Location(**location.dict())
     db.add(db_location)
     db.commit()
     db.refresh(db_location)
-    return db_location 
\ No newline at end of file
+    return db_location 
+
+# Audit log operations
+def get_audit_log_page(db: Session, cursor: Optional[str] = None, sort: str = "changed_at", limit: int = 100,
+                       descending: bool = True, table_name: Optional[str] = None, record_id: Optional[int] = None,
+                       action_type: Optional[models.AuditAction] = None, since: Optional[datetime] = None,
+                       until: Optional[datetime] = None):
+    # Bounds on changed_at let PostgreSQL skip whole partitions
+    query = select(models.AuditLog)
+    if since is not None:
+        query = query.where(models.AuditLog.changed_at >= since)
+    if until is not None:
+        query = query.where(models.AuditLog.changed_at < until)
+    if table_name is not None:
+        query = query.where(models.AuditLog.table_name == table_name)
+    if record_id is not None:
+        query = query.where(models.AuditLog.record_id == record_id)
+    if action_type is not None:
+        query = query.where(models.AuditLog.action_type == action_type)
+    return paginate(db, query, models.AuditLog, cursor=cursor, sort=sort, descending=descending, limit=limit)
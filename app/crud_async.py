@@ -0,0 +1,272 @@
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
+from . import crud, models, schemas
+
+# Async counterparts of the crud functions; query construction is shared with crud
+
+async def paginate(db: AsyncSession, query, model, cursor: Optional[str] = None, sort: str = "id",
+                   descending: bool = False, limit: int = 100):
+    statement = crud.keyset_query(query, model, cursor=cursor, sort=sort, descending=descending, limit=limit)
+    items = (await db.scalars(statement)).all()
+    return crud.keyset_result(items, sort=sort, descending=descending, limit=limit)
+
+async def _get(db: AsyncSession, model, object_id: int):
+    return await db.scalar(select(model).where(model.id == object_id))
+
+async def _list(db: AsyncSession, model, skip: int = 0, limit: int = 100):
+    return (await db.scalars(select(model).offset(skip).limit(limit))).all()
+
+async def commit_unique(db: AsyncSession, constraint, message: str):
+    try:
+        await db.commit()
+    except IntegrityError as e:
+        await db.rollback()
+        if crud.unique_violation(e, *constraint):
+            raise crud.ConflictError(message)
+        raise
+
+async def _commit(db: AsyncSession, model):
+    if model in crud.NAME_CONSTRAINTS:
+        await commit_unique(db, crud.NAME_CONSTRAINTS[model], crud.NAME_CONFLICT.format(entity=model.__name__))
+    else:
+        await db.commit()
+
+async def _create(db: AsyncSession, model, values: dict):
+    db_object = model(**values)
+    db.add(db_object)
+    await _commit(db, model)
+    await db.refresh(db_object)
+    return db_object
+
+async def _update(db: AsyncSession, db_object, values: dict):
+    for field, value in values.items():
+        setattr(db_object, field, value)
+    await _commit(db, type(db_object))
+    await db.refresh(db_object)
+    return db_object
+
+async def _delete(db: AsyncSession, model, object_id: int):
+    db_object = await _get(db, model, object_id)
+    if not db_object:
+        return False
+    await db.delete(db_object)
+    await db.commit()
+    return True
+
+async def get_rows(db: AsyncSession, model, fields, skip: int = 0, limit: int = 100):
+    return crud.field_rows(await db.execute(crud.rows_query(model, fields, skip=skip, limit=limit)), fields)
+
+async def get_rows_page(db: AsyncSession, model, fields, cursor: Optional[str] = None, sort: str = "id",
+                        limit: int = 100, descending: bool = False):
+    statement = crud.rows_page_query(model, fields, cursor=cursor, sort=sort, limit=limit, descending=descending)
+    rows = (await db.execute(statement)).all()
+    items, next_cursor = crud.keyset_result(rows, sort=sort, descending=descending, limit=limit)
+    return crud.field_rows(items, fields), next_cursor
+
+# Bulk operations
+async def _insert_rows(db: AsyncSession, model, rows):
+    async with db.begin_nested():
+        return (await db.scalars(crud.insert_rows_statement(model), rows)).all()
+
+async def bulk_create(db: AsyncSession, model, items, chunk_size: int = crud.BULK_CHUNK_SIZE):
+    results = []
+    for start in range(0, len(items), chunk_size):
+        rows = [item.model_dump() for item in items[start:start + chunk_size]]
+        try:
+            ids = await _insert_rows(db, model, rows)
+            results.extend({"index": start + offset, "id": row_id} for offset, row_id in enumerate(ids))
+        except IntegrityError:
+            # Retry the rejected chunk row by row to report which items failed
+            for offset, row in enumerate(rows):
+                try:
+                    row_id = (await _insert_rows(db, model, [row]))[0]
+                    results.append({"index": start + offset, "id": row_id})
+                except IntegrityError as e:
+                    results.append({"index": start + offset, "error": str(e.orig)})
+    await db.commit()
+    return crud.bulk_result(results)
+
+async def upsert(db: AsyncSession, model, items, chunk_size: int = crud.BULK_CHUNK_SIZE):
+    rows = crud.upsert_rows(model, items)
+    ids = {}
+    for start in range(0, len(rows), chunk_size):
+        statement = crud.upsert_statement(crud.dialect_name(db), model, rows[start:start + chunk_size])
+        ids.update(crud.upserted_ids(model, await db.execute(statement)))
+    await db.commit()
+    id_list = list(ids.values())
+    db_objects = {}
+    for start in range(0, len(id_list), chunk_size):
+        query = select(model).where(model.id.in_(id_list[start:start + chunk_size]))
+        db_objects.update((db_object.id, db_object) for db_object in await db.scalars(query))
+    return crud.upsert_results(model, items, ids, db_objects)
+
+# Project relationship links
+async def execute_links(db: AsyncSession, statements):
+    return sum([(await db.execute(statement)).rowcount for statement in statements])
+
+async def apply_links(db: AsyncSession, relationship: str, added=(), removed=(), chunk_size: int = crud.BULK_CHUNK_SIZE):
+    try:
+        unlinked = await execute_links(db, crud.unlink_statements(relationship, removed, chunk_size))
+        linked = await execute_links(db, crud.link_statements(crud.dialect_name(db), relationship, added, chunk_size))
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        raise crud.ConflictError(crud.LINK_CONFLICT.format(relationship=relationship))
+    return {"linked": linked, "unlinked": unlinked}
+
+async def link_projects(db: AsyncSession, relationship: str, pairs, chunk_size: int = crud.BULK_CHUNK_SIZE):
+    return await apply_links(db, relationship, added=pairs, chunk_size=chunk_size)
+
+async def unlink_projects(db: AsyncSession, relationship: str, pairs, chunk_size: int = crud.BULK_CHUNK_SIZE):
+    return await apply_links(db, relationship, removed=pairs, chunk_size=chunk_size)
+
+async def set_project_links(db: AsyncSession, project_id: int, relationship: str, target_ids,
+                            chunk_size: int = crud.BULK_CHUNK_SIZE):
+    current = set(await db.scalars(crud.project_links_query(relationship, project_id)))
+    added, removed = crud.link_changes(project_id, current, target_ids)
+    return await apply_links(db, relationship, added=added, removed=removed, chunk_size=chunk_size)
+
+# User operations
+async def get_user_by_username(db: AsyncSession, username: str):
+    return await db.scalar(select(models.User).where(models.User.username == username))
+
+# Project operations
+async def get_project(db: AsyncSession, project_id: int):
+    return await _get(db, models.Project, project_id)
+
+async def get_project_full(db: AsyncSession, project_id: int):
+    query = select(models.Project).where(models.Project.id == project_id)
+    return await db.scalar(query.options(*crud.project_loader_options(schemas.PROJECT_RELATIONSHIPS)))
+
+async def get_projects(db: AsyncSession, skip: int = 0, limit: int = 100, expand=(),
+                       filters: Optional[schemas.ProjectFilter] = None, sort: str = "id", descending: bool = False,
+                       fields=()):
+    query = crud.projects_query(skip=skip, limit=limit, expand=expand, filters=filters, sort=sort, descending=descending,
+                                fields=fields)
+    if fields:
+        return crud.field_rows(await db.execute(query), fields)
+    return (await db.scalars(query)).all()
+
+async def get_projects_page(db: AsyncSession, cursor: Optional[str] = None, sort: str = "id", limit: int = 100, expand=(),
+                            filters: Optional[schemas.ProjectFilter] = None, descending: bool = False, fields=()):
+    statement = crud.projects_page_query(cursor=cursor, sort=sort, limit=limit, expand=expand, filters=filters,
+                                         descending=descending, fields=fields)
+    if not fields:
+        return crud.keyset_result((await db.scalars(statement)).all(), sort=sort, descending=descending, limit=limit)
+    rows = (await db.execute(statement)).all()
+    items, next_cursor = crud.keyset_result(rows, sort=sort, descending=descending, limit=limit)
+    return crud.field_rows(items, fields), next_cursor
+
+async def get_project_fields(db: AsyncSession, project_id: int, fields):
+    rows = crud.field_rows(await db.execute(crud.project_fields_query(project_id, fields)), fields)
+    return rows[0] if rows else None
+
+async def search_projects(db: AsyncSession, query_text: str, skip: int = 0, limit: int = 100):
+    if not query_text.split():
+        return []
+    query = crud.search_projects_query(crud.dialect_name(db), query_text, skip=skip, limit=limit)
+    return crud.search_results((await db.execute(query)).all())
+
+async def get_project_details_page(db: AsyncSession, cursor: Optional[str] = None, sort: str = "id", limit: int = 100,
+                                   filters: Optional[schemas.ProjectFilter] = None, descending: bool = False):
+    statement = crud.keyset_query(crud.project_details_query(filters), models.Project, cursor=cursor, sort=sort,
+                                  descending=descending, limit=limit)
+    items = (await db.execute(statement)).all()
+    return crud.keyset_result(items, sort=sort, descending=descending, limit=limit)
+
+async def commit_project(db: AsyncSession):
+    await commit_unique(db, crud.PROJECT_TITLE_CONSTRAINT, crud.PROJECT_TITLE_CONFLICT)
+
+async def create_project(db: AsyncSession, project: schemas.ProjectCreate):
+    db_project = models.Project(**project.model_dump())
+    db.add(db_project)
+    await commit_project(db)
+    await db.refresh(db_project)
+    return db_project
+
+async def update_project(db: AsyncSession, project_id: int, project: schemas.ProjectUpdate):
+    db_project = await get_project(db, project_id)
+    if db_project is None:
+        return None
+    for field, value in project.model_dump(exclude_unset=True).items():
+        setattr(db_project, field, value)
+    await commit_project(db)
+    await db.refresh(db_project)
+    return db_project
+
+async def delete_project(db: AsyncSession, project_id: int):
+    return await _delete(db, models.Project, project_id)
+
+# Owner operations
+async def get_owner(db: AsyncSession, owner_id: int):
+    return await _get(db, models.Owner, owner_id)
+
+async def get_owners(db: AsyncSession, skip: int = 0, limit: int = 100):
+    return await _list(db, models.Owner, skip=skip, limit=limit)
+
+async def get_owners_page(db: AsyncSession, cursor: Optional[str] = None, sort: str = "id", limit: int = 100):
+    return await paginate(db, select(models.Owner), models.Owner, cursor=cursor, sort=sort, limit=limit)
+
+async def create_owner(db: AsyncSession, owner: schemas.OwnerCreate):
+    return await _create(db, models.Owner, owner.model_dump())
+
+async def update_owner(db: AsyncSession, owner_id: int, owner: schemas.OwnerCreate):
+    db_owner = await get_owner(db, owner_id)
+    if not db_owner:
+        return None
+    return await _update(db, db_owner, owner.model_dump())
+
+async def delete_owner(db: AsyncSession, owner_id: int):
+    return await _delete(db, models.Owner, owner_id)
+
+# Cooperator operations
+async def get_cooperators(db: AsyncSession, skip: int = 0, limit: int = 100):
+    return await _list(db, models.Cooperator, skip=skip, limit=limit)
+
+async def get_cooperators_page(db: AsyncSession, cursor: Optional[str] = None, sort: str = "id", limit: int = 100):
+    return await paginate(db, select(models.Cooperator), models.Cooperator, cursor=cursor, sort=sort, limit=limit)
+
+async def create_cooperator(db: AsyncSession, cooperator: schemas.CooperatorCreate):
+    return await _create(db, models.Cooperator, cooperator.model_dump())
+
+# Benefit operations
+async def get_benefits(db: AsyncSession, skip: int = 0, limit: int = 100):
+    return await _list(db, models.Benefit, skip=skip, limit=limit)
+
+async def get_benefits_page(db: AsyncSession, cursor: Optional[str] = None, sort: str = "id", limit: int = 100):
+    return await paginate(db, select(models.Benefit), models.Benefit, cursor=cursor, sort=sort, limit=limit)
+
+async def create_benefit(db: AsyncSession, benefit: schemas.BenefitCreate):
+    return await _create(db, models.Benefit, benefit.model_dump())
+
+# Address operations
+async def get_addresses(db: AsyncSession, skip: int = 0, limit: int = 100):
+    return await _list(db, models.Address, skip=skip, limit=limit)
+
+async def get_addresses_page(db: AsyncSession, cursor: Optional[str] = None, sort: str = "id", limit: int = 100):
+    return await paginate(db, select(models.Address), models.Address, cursor=cursor, sort=sort, limit=limit)
+
+async def create_address(db: AsyncSession, address: schemas.AddressCreate):
+    return await _create(db, models.Address, address.model_dump())
+
+# Contact operations
+async def get_contacts(db: AsyncSession, skip: int = 0, limit: int = 100):
+    return await _list(db, models.Contact, skip=skip, limit=limit)
+
+async def get_contacts_page(db: AsyncSession, cursor: Optional[str] = None, sort: str = "id", limit: int = 100):
+    return await paginate(db, select(models.Contact), models.Contact, cursor=cursor, sort=sort, limit=limit)
+
+async def create_contact(db: AsyncSession, contact: schemas.ContactCreate):
+    return await _create(db, models.Contact, contact.model_dump())
+
+# Location operations
+async def get_locations(db: AsyncSession, skip: int = 0, limit: int = 100):
+    return await _list(db, models.Location, skip=skip, limit=limit)
+
+async def get_locations_page(db: AsyncSession, cursor: Optional[str] = None, sort: str = "id", limit: int = 100):
+    return await paginate(db, select(models.Location), models.Location, cursor=cursor, sort=sort, limit=limit)
+
+async def create_location(db: AsyncSession, location: schemas.LocationCreate):
+    return await _create(db, models.Location, location.model_dump())
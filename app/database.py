@@ -1,6 +1,11 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, exc
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import declarative_base, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from .metrics import Counter, Histogram, LATENCY_BUCKETS
+from concurrent.futures import ThreadPoolExecutor
 import os
+import time
 from dotenv import load_dotenv
 from fastapi import Depends
 from sqlalchemy.orm import Session
@@ -16,9 +21,106 @@ SQLALCHEMY_DATABASE_URL = os.getenv(
     )
 )
 
-engine = create_engine(SQLALCHEMY_DATABASE_URL)
+# Serve the API through async routes backed by an async engine
+DATABASE_ASYNC = os.getenv("DATABASE_ASYNC", "false").lower() in ("1", "true", "yes")
+
+def async_database_url(url: str):
+    scheme, rest = url.split("://", 1)
+    drivers = {
+        "postgresql": "postgresql+asyncpg",
+        "postgresql+psycopg2": "postgresql+asyncpg",
+        "sqlite": "sqlite+aiosqlite",
+    }
+    return f"{drivers.get(scheme, scheme)}://{rest}"
+
+ASYNC_SQLALCHEMY_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL", async_database_url(SQLALCHEMY_DATABASE_URL))
+
+# Threads hashing the default users' passwords when seeding an empty database
+SEED_HASH_WORKERS = int(os.getenv("SEED_HASH_WORKERS", "8"))
+
+# Connection pool settings; SQLite keeps SQLAlchemy's default pools
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes")
+DB_STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "0"))
+
+# Pool checkout metrics, shared by the sync and async engines
+pool_wait_seconds = Histogram(LATENCY_BUCKETS)
+pool_timeouts = Counter()
+
+class InstrumentedPoolMixin:
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            pool_timeouts.inc()
+            raise
+        finally:
+            pool_wait_seconds.observe(time.perf_counter() - start)
+
+class InstrumentedQueuePool(InstrumentedPoolMixin, QueuePool):
+    pass
+
+class InstrumentedAsyncQueuePool(InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+def engine_options(url: str, is_async: bool = False):
+    if url.startswith("sqlite"):
+        return {}
+    options = {
+        "poolclass": InstrumentedAsyncQueuePool if is_async else InstrumentedQueuePool,
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": DB_POOL_RECYCLE,
+        "pool_pre_ping": DB_POOL_PRE_PING,
+    }
+    if DB_STATEMENT_TIMEOUT_MS and url.startswith("postgresql"):
+        if is_async:
+            options["connect_args"] = {"server_settings": {"statement_timeout": str(DB_STATEMENT_TIMEOUT_MS)}}
+        else:
+            options["connect_args"] = {"options": f"-c statement_timeout={DB_STATEMENT_TIMEOUT_MS}"}
+    return options
+
+def pool_status(engine):
+    pool = engine.pool
+    status = {"pool": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        status.update({
+            "size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "checked_in": pool.checkedin(),
+            "overflow": pool.overflow(),
+            "max_overflow": pool._max_overflow,
+            "timeout": pool.timeout(),
+        })
+    return status
+
+def pool_metrics():
+    metrics = {
+        "sync": pool_status(engine),
+        "wait_seconds": pool_wait_seconds.snapshot(),
+        "timeouts": pool_timeouts.value,
+    }
+    if async_engine is not None:
+        metrics["async"] = pool_status(async_engine.sync_engine)
+    return metrics
+
+engine = create_engine(SQLALCHEMY_DATABASE_URL, **engine_options(SQLALCHEMY_DATABASE_URL))
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# The async driver is only imported when async mode is enabled
+async_engine = None
+AsyncSessionLocal = None
+if DATABASE_ASYNC:
+    async_engine = create_async_engine(
+        ASYNC_SQLALCHEMY_DATABASE_URL, **engine_options(ASYNC_SQLALCHEMY_DATABASE_URL, is_async=True)
+    )
+    AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
 Base = declarative_base()
 
 # Dependency
@@ -29,14 +131,20 @@ def get_db():
     finally:
         db.close()
 
-def init_db():
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+def create_schema():
     # Import here to avoid circular imports
     from . import models
-    from .auth import get_password_hash
-    
-    # Create all tables
+
     Base.metadata.create_all(bind=engine)
-    
+
+def seed_default_users():
+    from . import models
+    from .auth import get_password_hash
+
     # Initialize default users if they don't exist
     db = SessionLocal()
     try:
@@ -87,19 +195,25 @@ def init_db():
                     "role": models.UserRole.USER
                 }
             ]
-            
-            for user_data in default_users:
-                user = models.User(
-                    email=user_data["email"],
-                    username=user_data["username"],
-                    hashed_password=get_password_hash(user_data["password"]),
-                    role=user_data["role"]
-                )
-                db.add(user)
-            
+
+            # bcrypt releases the GIL, so the hashes are computed in parallel
+            with ThreadPoolExecutor(max_workers=SEED_HASH_WORKERS) as pool:
+                hashes = pool.map(get_password_hash, [user_data["password"] for user_data in default_users])
+                for user_data, hashed_password in zip(default_users, hashes):
+                    db.add(models.User(
+                        email=user_data["email"],
+                        username=user_data["username"],
+                        hashed_password=hashed_password,
+                        role=user_data["role"]
+                    ))
+
             db.commit()
     except Exception as e:
         print(f"Error initializing database: {e}")
         db.rollback()
     finally:
-        db.close() 
\ No newline at end of file
+        db.close()
+
+def init_db():
+    create_schema()
+    seed_default_users()
@@ -0,0 +1,90 @@
+import csv
+import io
+import json
+import os
+from sqlalchemy import select
+from sqlalchemy.orm import Session, selectinload
+from typing import Optional
+from . import crud, models, schemas
+
+# Rows fetched per round trip while streaming; related rows are loaded once per batch
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "1000"))
+
+EXPORT_FIELDS = (
+    "id", "title", "description", "status", "start_year", "end_year", "sector", "project_link", "notes",
+    "managment_level", "owners", "contacts", "locations", "cooperators", "benefits",
+)
+
+def export_projects_query(filters: Optional[schemas.ProjectFilter] = None):
+    return crud.filter_projects(select(models.Project.id), filters).order_by(models.Project.id)
+
+def export_batch_query(project_ids):
+    return (
+        select(models.Project)
+        .where(models.Project.id.in_(project_ids))
+        .order_by(models.Project.id)
+        .options(
+            selectinload(models.Project.owners),
+            selectinload(models.Project.contacts),
+            selectinload(models.Project.locations).selectinload(models.Location.address),
+            selectinload(models.Project.cooperators),
+            selectinload(models.Project.benefits),
+        )
+    )
+
+def _joined(values, separator=", "):
+    values = sorted(set(value for value in values if value))
+    return separator.join(values) if values else None
+
+# Same aggregation as the project_details view
+def project_export_row(project: models.Project):
+    return {
+        "id": project.id,
+        "title": project.title,
+        "description": project.description,
+        "status": project.status.value if project.status else None,
+        "start_year": project.start_year,
+        "end_year": project.end_year,
+        "sector": project.sector.value if project.sector else None,
+        "project_link": project.project_link,
+        "notes": project.notes,
+        "managment_level": project.managment_level.value if project.managment_level else None,
+        "owners": _joined(owner.name for owner in project.owners),
+        "contacts": _joined(contact.name for contact in project.contacts),
+        "locations": _joined(
+            (f"{location.address.city}, {location.address.county}" for location in project.locations if location.address),
+            separator="; "
+        ),
+        "cooperators": _joined(cooperator.name for cooperator in project.cooperators),
+        "benefits": _joined(benefit.name for benefit in project.benefits),
+    }
+
+def iter_project_rows(db: Session, filters: Optional[schemas.ProjectFilter] = None,
+                      batch_size: int = EXPORT_BATCH_SIZE):
+    # Matching ids stream from a server-side cursor; each batch of projects is then
+    # loaded with its relationships. The session only holds weak references, so a
+    # batch is released once its rows are written.
+    ids = db.execute(export_projects_query(filters).execution_options(yield_per=batch_size))
+    for partition in ids.partitions():
+        for project in db.scalars(export_batch_query([row.id for row in partition])):
+            yield project_export_row(project)
+
+def ndjson_lines(rows):
+    for row in rows:
+        yield json.dumps(row, ensure_ascii=False) + "\n"
+
+def csv_lines(rows):
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=EXPORT_FIELDS)
+    writer.writeheader()
+    for row in rows:
+        writer.writerow(row)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    yield buffer.getvalue()
+
+EXPORT_FORMATS = {
+    "ndjson": (ndjson_lines, "application/x-ndjson"),
+    "csv": (csv_lines, "text/csv"),
+}
@@ -0,0 +1,166 @@
+from contextvars import ContextVar
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from typing import Optional
+import threading
+import time
+from .database import pool_timeouts, pool_wait_seconds
+from .metrics import Counter, Histogram, LATENCY_BUCKETS
+
+QUERY_COUNT_BUCKETS = (1, 2, 3, 5, 10, 20, 50, 100, 250)
+
+# Per-request SQL accounting, filled in by the engine hooks below. Sync routes run
+# in a worker thread and async ones in SQLAlchemy's greenlets; both see a copy of
+# the request's context, so they update the same object.
+class RequestTimings:
+    __slots__ = ("queries", "db_seconds")
+
+    def __init__(self):
+        self.queries = 0
+        self.db_seconds = 0.0
+
+current_request: ContextVar[Optional[RequestTimings]] = ContextVar("current_request", default=None)
+
+# Every statement is timed once here; other modules that need the duration, like
+# the slow query log, register an observer instead of timing it again
+query_observers = []
+
+def observe_queries(observer):
+    query_observers.append(observer)
+    return observer
+
+@event.listens_for(Engine, "before_cursor_execute")
+def start_query_timer(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+@event.listens_for(Engine, "after_cursor_execute")
+def stop_query_timer(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_started"].pop()
+    timings = current_request.get()
+    if timings is not None:
+        timings.queries += 1
+        timings.db_seconds += elapsed
+    for observer in query_observers:
+        observer(conn, statement, parameters, executemany, elapsed)
+
+@event.listens_for(Engine, "handle_error")
+def drop_query_timer(exception_context):
+    # after_cursor_execute does not run for failed statements
+    connection = exception_context.connection
+    if connection is not None and connection.info.get("query_started"):
+        connection.info["query_started"].pop()
+
+# Per-route metrics, labelled with the route template rather than the raw path
+class RouteMetrics:
+    def __init__(self):
+        self.latency = Histogram(LATENCY_BUCKETS)
+        self.queries = Histogram(QUERY_COUNT_BUCKETS)
+        self.db_seconds = Histogram(LATENCY_BUCKETS)
+        self.responses = {}
+
+    def observe(self, status: int, seconds: float, timings: RequestTimings):
+        self.latency.observe(seconds)
+        self.queries.observe(timings.queries)
+        self.db_seconds.observe(timings.db_seconds)
+        self.responses.setdefault(status, Counter()).inc()
+
+route_metrics = {}
+_route_metrics_lock = threading.Lock()
+
+def get_route_metrics(method: str, route: str):
+    key = (method, route)
+    metrics = route_metrics.get(key)
+    if metrics is None:
+        with _route_metrics_lock:
+            metrics = route_metrics.setdefault(key, RouteMetrics())
+    return metrics
+
+route_paths = {}
+
+def route_template(scope):
+    # The router stores the matched endpoint in the scope; unmatched paths share
+    # one label so probing random URLs cannot grow the metrics without bound
+    endpoint = scope.get("endpoint")
+    if endpoint is None:
+        return "unmatched"
+    if endpoint not in route_paths:
+        paths = {route.endpoint: route.path for route in scope["app"].routes if hasattr(route, "endpoint")}
+        route_paths[endpoint] = paths.get(endpoint, "unmatched")
+    return route_paths[endpoint]
+
+def server_timing(total: float, timings: RequestTimings):
+    return (
+        f'app;dur={total * 1000:.1f}, '
+        f'db;dur={timings.db_seconds * 1000:.1f};desc="{timings.queries} queries"'
+    ).encode("latin-1")
+
+# Plain ASGI middleware, so streaming responses and background tasks are not buffered
+class MetricsMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timings = RequestTimings()
+        token = current_request.set(timings)
+        started = time.perf_counter()
+        status = 500
+
+        async def send_with_timing(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", server_timing(time.perf_counter() - started, timings)))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            current_request.reset(token)
+            metrics = get_route_metrics(scope["method"], route_template(scope))
+            metrics.observe(status, time.perf_counter() - started, timings)
+
+# Prometheus text exposition format
+def series(name: str, labels):
+    if not labels:
+        return name
+    return name + "{" + ",".join(f'{label}="{value}"' for label, value in labels.items()) + "}"
+
+def histogram_lines(name: str, labels, snapshot):
+    for bound, count in snapshot["buckets"].items():
+        yield f"{series(name + '_bucket', {**labels, 'le': bound})} {count}"
+    yield f"{series(name + '_sum', labels)} {snapshot['sum']}"
+    yield f"{series(name + '_count', labels)} {snapshot['count']}"
+
+def render_metrics():
+    histograms = (
+        ("kart_http_request_duration_seconds", "Request latency", "latency"),
+        ("kart_http_request_db_queries", "SQL statements executed per request", "queries"),
+        ("kart_http_request_db_seconds", "Time spent in SQL statements per request", "db_seconds"),
+    )
+    routes = sorted(route_metrics.items())
+    lines = []
+    for name, help_text, attribute in histograms:
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+        for (method, route), metrics in routes:
+            labels = {"method": method, "route": route}
+            lines.extend(histogram_lines(name, labels, getattr(metrics, attribute).snapshot()))
+
+    lines += ["# HELP kart_http_responses_total Responses by status", "# TYPE kart_http_responses_total counter"]
+    for (method, route), metrics in routes:
+        for status, counter in sorted(metrics.responses.items()):
+            labels = {"method": method, "route": route, "status": status}
+            lines.append(f"{series('kart_http_responses_total', labels)} {counter.value}")
+
+    name = "kart_db_pool_wait_seconds"
+    lines += [f"# HELP {name} Connection pool checkout wait", f"# TYPE {name} histogram"]
+    lines.extend(histogram_lines(name, {}, pool_wait_seconds.snapshot()))
+    name = "kart_db_pool_timeouts_total"
+    lines += [f"# HELP {name} Connection pool checkout timeouts", f"# TYPE {name} counter"]
+    lines.append(f"{name} {pool_timeouts.value}")
+    return "\n".join(lines) + "\n"
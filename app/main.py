@@ -1,19 +1,37 @@
-from fastapi import FastAPI, Depends, HTTPException, status, Form
+import time
+
+# Module import time is reported as the first startup phase
+IMPORTS_STARTED = time.perf_counter()
+
+from fastapi import FastAPI, Depends, HTTPException, Query, Request, Response, status, Form
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session
-from typing import List
-import uvicorn
+from typing import List, Literal, Optional, Union
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from contextlib import asynccontextmanager
+from datetime import datetime
 
-from .database import SessionLocal, engine, get_db, init_db
-from . import models, schemas, crud
-from .auth import get_current_user
+from .database import DATABASE_ASYNC, get_db, pool_metrics
+from . import models, schemas, crud, export, instrumentation, response_cache, serialization, slow_queries, startup, stats
+from .auth import LoginPoolFull, check_admin_access, get_cache_stats, get_current_user, login_pool, token_versions, user_cache
+from .params import (
+    ADDRESS_FIELDS, ADDRESS_FIELDS_QUERY, BENEFIT_FIELDS, BENEFIT_FIELDS_QUERY, CHUNK_SIZE_QUERY, CONTACT_FIELDS,
+    CONTACT_FIELDS_QUERY, COOPERATOR_FIELDS, COOPERATOR_FIELDS_QUERY, CURSOR_QUERY, EXPAND_QUERY, FIELDS_QUERY,
+    LOCATION_FIELDS, LOCATION_FIELDS_QUERY, ORDER_QUERY, OWNER_FIELDS, OWNER_FIELDS_QUERY, SORT_QUERY,
+    conflict_error, pagination_error, parse_expand, parse_fields, project_filter_params
+)
+
+IMPORTS_FINISHED = time.perf_counter()
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
-    init_db()
+    startup.record_phase("imports", IMPORTS_FINISHED - IMPORTS_STARTED)
+    startup.prepare_database()
+    startup.record_phase("ready", time.perf_counter() - IMPORTS_STARTED)
     yield
     # Shutdown
     pass
@@ -34,20 +52,80 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Outermost, so latency and the Server-Timing header cover the whole stack
+app.add_middleware(instrumentation.MetricsMiddleware)
+
+# In async mode the async router is registered first, so its routes take
+# precedence over the sync routes below for the same paths.
+if DATABASE_ASYNC:
+    from .async_api import router as async_router
+    app.include_router(async_router)
+
 @app.get("/")
 async def root():
     return {"message": "Welcome to KART Database API"}
 
+# Readiness check: one round trip to the database, no authentication
+@app.get("/health")
+def health(response: Response, db: Session = Depends(get_db)):
+    result = {"startup_mode": startup.STARTUP_MODE, "startup_phases": startup.startup_phases}
+    try:
+        db.execute(text("SELECT 1"))
+    except SQLAlchemyError:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+        return {"status": "unavailable", **result}
+    return {"status": "ok", **result}
+
+# Prometheus scrape target, unauthenticated like /health
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    return PlainTextResponse(instrumentation.render_metrics(), media_type="text/plain; version=0.0.4")
+
+def keyset_page(fetch, db: Session, cursor: str, sort: str, limit: int, **options):
+    try:
+        items, next_cursor = fetch(db, cursor=cursor, sort=sort, limit=limit, **options)
+    except crud.PaginationError as e:
+        raise pagination_error(e)
+    return {"items": items, "next_cursor": next_cursor}
+
+def rows_list(db: Session, model, fields, cursor: str, sort: str, skip: int, limit: int):
+    if cursor is not None:
+        rows = keyset_page(crud.get_rows_page, db, cursor, sort, limit, model=model, fields=fields)
+    else:
+        rows = crud.get_rows(db, model, fields, skip=skip, limit=limit)
+    return serialization.rows_response(rows)
+
 # Projects endpoints
-@app.get("/projects/", response_model=List[schemas.Project])
+@app.get(
+    "/projects/",
+    response_model=schemas.list_response(schemas.ProjectFull, schemas.ProjectFields),
+    response_model_exclude_unset=True
+)
 def read_projects(
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = CURSOR_QUERY,
+    sort: str = SORT_QUERY,
+    order: Literal["asc", "desc"] = ORDER_QUERY,
+    expand: Optional[str] = EXPAND_QUERY,
+    fields: Optional[str] = FIELDS_QUERY,
+    filters: schemas.ProjectFilter = Depends(project_filter_params),
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user)
 ):
-    projects = crud.get_projects(db, skip=skip, limit=limit)
-    return projects
+    relationships = parse_expand(expand)
+    selected = parse_fields(fields, expand=relationships)
+    options = {"expand": relationships, "filters": filters, "descending": order == "desc", "fields": selected}
+    if cursor is not None:
+        page = keyset_page(crud.get_projects_page, db, cursor, sort, limit, **options)
+        return serialization.rows_response(page) if selected else page
+    try:
+        # Plain project rows are cached; expanded and sparse reads go to the database
+        fetch = crud.get_projects if relationships or selected else response_cache.get_projects
+        projects = fetch(db, skip=skip, limit=limit, sort=sort, **options)
+    except crud.PaginationError as e:
+        raise pagination_error(e)
+    return serialization.rows_response(projects) if selected else projects
 
 @app.post("/projects/", response_model=schemas.Project)
 def create_project(
@@ -55,15 +133,108 @@ def create_project(
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user)
 ):
-    return crud.create_project(db=db, project=project)
+    try:
+        return crud.create_project(db=db, project=project)
+    except crud.ConflictError as e:
+        raise conflict_error(e)
+
+@app.post("/projects/bulk", response_model=schemas.BulkResult)
+def create_projects_bulk(
+    projects: List[schemas.ProjectCreate],
+    chunk_size: int = CHUNK_SIZE_QUERY,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_user)
+):
+    return crud.bulk_create(db, models.Project, projects, chunk_size=chunk_size)
+
+@app.put("/projects/", response_model=schemas.Project)
+def upsert_project(
+    project: schemas.ProjectCreate,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_user)
+):
+    return crud.upsert(db, models.Project, [project])[0]
+
+@app.put("/projects/bulk", response_model=List[schemas.Project])
+def upsert_projects_bulk(
+    projects: List[schemas.ProjectCreate],
+    chunk_size: int = CHUNK_SIZE_QUERY,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_user)
+):
+    return crud.upsert(db, models.Project, projects, chunk_size=chunk_size)
+
+@app.get("/projects/search", response_model=List[schemas.ProjectSearchResult])
+def search_projects(
+    q: str = Query(..., min_length=1, description="Search terms, matched against title, description and notes"),
+    skip: int = 0,
+    limit: int = 100,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_user)
+):
+    return crud.search_projects(db, q, skip=skip, limit=limit)
+
+@app.get("/projects/details", response_model=schemas.Page[schemas.ProjectDetails])
+def read_project_details(
+    limit: int = 100,
+    cursor: Optional[str] = CURSOR_QUERY,
+    sort: str = SORT_QUERY,
+    order: Literal["asc", "desc"] = ORDER_QUERY,
+    filters: schemas.ProjectFilter = Depends(project_filter_params),
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_user)
+):
+    options = {"filters": filters, "descending": order == "desc"}
+    return keyset_page(crud.get_project_details_page, db, cursor, sort, limit, **options)
+
+@app.post("/projects/links/{relationship}", response_model=schemas.LinkResult)
+def link_projects(
+    relationship: schemas.ProjectRelationship,
+    links: List[schemas.ProjectLink],
+    chunk_size: int = CHUNK_SIZE_QUERY,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_user)
+):
+    pairs = [(link.project_id, link.target_id) for link in links]
+    try:
+        return crud.link_projects(db, relationship, pairs, chunk_size=chunk_size)
+    except crud.ConflictError as e:
+        raise conflict_error(e)
+
+@app.delete("/projects/links/{relationship}", response_model=schemas.LinkResult)
+def unlink_projects(
+    relationship: schemas.ProjectRelationship,
+    links: List[schemas.ProjectLink],
+    chunk_size: int = CHUNK_SIZE_QUERY,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_user)
+):
+    pairs = [(link.project_id, link.target_id) for link in links]
+    return crud.unlink_projects(db, relationship, pairs, chunk_size=chunk_size)
 
-@app.get("/projects/{project_id}", response_model=schemas.Project)
+@app.get("/projects/{project_id}", response_model=Union[schemas.Project, schemas.ProjectFields])
 def read_project(
+    project_id: int,
+    fields: Optional[str] = FIELDS_QUERY,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_user)
+):
+    selected = parse_fields(fields)
+    if selected:
+        project = crud.get_project_fields(db, project_id, selected)
+    else:
+        project = response_cache.get_project(db, project_id=project_id)
+    if project is None:
+        raise HTTPException(status_code=404, detail="Project not found")
+    return serialization.rows_response(project) if selected else project
+
+@app.get("/projects/{project_id}/full", response_model=schemas.ProjectFull)
+def read_project_full(
     project_id: int,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user)
 ):
-    project = crud.get_project(db, project_id=project_id)
+    project = crud.get_project_full(db, project_id=project_id)
     if project is None:
         raise HTTPException(status_code=404, detail="Project not found")
     return project
@@ -75,11 +246,30 @@ def update_project(
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user)
 ):
-    updated_project = crud.update_project(db, project_id=project_id, project=project)
+    try:
+        updated_project = crud.update_project(db, project_id=project_id, project=project)
+    except crud.ConflictError as e:
+        raise conflict_error(e)
     if updated_project is None:
         raise HTTPException(status_code=404, detail="Project not found")
     return updated_project
 
+@app.put("/projects/{project_id}/links/{relationship}", response_model=schemas.LinkResult)
+def set_project_links(
+    project_id: int,
+    relationship: schemas.ProjectRelationship,
+    target_ids: List[int],
+    chunk_size: int = CHUNK_SIZE_QUERY,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_user)
+):
+    if crud.get_project(db, project_id=project_id) is None:
+        raise HTTPException(status_code=404, detail="Project not found")
+    try:
+        return crud.set_project_links(db, project_id, relationship, target_ids, chunk_size=chunk_size)
+    except crud.ConflictError as e:
+        raise conflict_error(e)
+
 @app.delete("/projects/{project_id}")
 def delete_project(
     project_id: int,
@@ -92,14 +282,22 @@ def delete_project(
     return {"message": "Project deleted successfully"}
 
 # Owners endpoints
-@app.get("/owners/", response_model=List[schemas.Owner])
+@app.get("/owners/", response_model=schemas.list_response(schemas.Owner, schemas.OwnerFields))
 def read_owners(
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = CURSOR_QUERY,
+    sort: str = SORT_QUERY,
+    fields: Optional[str] = OWNER_FIELDS_QUERY,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user)
 ):
-    owners = crud.get_owners(db, skip=skip, limit=limit)
+    selected = parse_fields(fields, OWNER_FIELDS)
+    if selected:
+        return rows_list(db, models.Owner, selected, cursor, sort, skip, limit)
+    if cursor is not None:
+        return keyset_page(crud.get_owners_page, db, cursor, sort, limit)
+    owners = response_cache.get_owners(db, skip=skip, limit=limit)
     return owners
 
 @app.post("/owners/", response_model=schemas.Owner)
@@ -108,7 +306,36 @@ def create_owner(
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user)
 ):
-    return crud.create_owner(db=db, owner=owner)
+    try:
+        return crud.create_owner(db=db, owner=owner)
+    except crud.ConflictError as e:
+        raise conflict_error(e)
+
+@app.post("/owners/bulk", response_model=schemas.BulkResult)
+def create_owners_bulk(
+    owners: List[schemas.OwnerCreate],
+    chunk_size: int = CHUNK_SIZE_QUERY,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_user)
+):
+    return crud.bulk_create(db, models.Owner, owners, chunk_size=chunk_size)
+
+@app.put("/owners/", response_model=schemas.Owner)
+def upsert_owner(
+    owner: schemas.OwnerCreate,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_user)
+):
+    return crud.upsert(db, models.Owner, [owner])[0]
+
+@app.put("/owners/bulk", response_model=List[schemas.Owner])
+def upsert_owners_bulk(
+    owners: List[schemas.OwnerCreate],
+    chunk_size: int = CHUNK_SIZE_QUERY,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_user)
+):
+    return crud.upsert(db, models.Owner, owners, chunk_size=chunk_size)
 
 @app.get("/owners/{owner_id}", response_model=schemas.Owner)
 def read_owner(
@@ -116,7 +343,7 @@ def read_owner(
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user)
 ):
-    owner = crud.get_owner(db, owner_id=owner_id)
+    owner = response_cache.get_owner(db, owner_id=owner_id)
     if owner is None:
         raise HTTPException(status_code=404, detail="Owner not found")
     return owner
@@ -128,7 +355,10 @@ def update_owner(
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user)
 ):
-    updated_owner = crud.update_owner(db, owner_id=owner_id, owner=owner)
+    try:
+        updated_owner = crud.update_owner(db, owner_id=owner_id, owner=owner)
+    except crud.ConflictError as e:
+        raise conflict_error(e)
     if updated_owner is None:
         raise HTTPException(status_code=404, detail="Owner not found")
     return updated_owner
@@ -145,14 +375,22 @@ def delete_owner(
     return {"message": "Owner deleted successfully"}
 
 # Cooperators endpoints
-@app.get("/cooperators/", response_model=List[schemas.Cooperator])
+@app.get("/cooperators/", response_model=schemas.list_response(schemas.Cooperator, schemas.CooperatorFields))
 def read_cooperators(
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = CURSOR_QUERY,
+    sort: str = SORT_QUERY,
+    fields: Optional[str] = COOPERATOR_FIELDS_QUERY,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user)
 ):
-    cooperators = crud.get_cooperators(db, skip=skip, limit=limit)
+    selected = parse_fields(fields, COOPERATOR_FIELDS)
+    if selected:
+        return rows_list(db, models.Cooperator, selected, cursor, sort, skip, limit)
+    if cursor is not None:
+        return keyset_page(crud.get_cooperators_page, db, cursor, sort, limit)
+    cooperators = response_cache.get_cooperators(db, skip=skip, limit=limit)
     return cooperators
 
 @app.post("/cooperators/", response_model=schemas.Cooperator)
@@ -161,17 +399,54 @@ def create_cooperator(
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user)
 ):
-    return crud.create_cooperator(db=db, cooperator=cooperator)
+    try:
+        return crud.create_cooperator(db=db, cooperator=cooperator)
+    except crud.ConflictError as e:
+        raise conflict_error(e)
+
+@app.post("/cooperators/bulk", response_model=schemas.BulkResult)
+def create_cooperators_bulk(
+    cooperators: List[schemas.CooperatorCreate],
+    chunk_size: int = CHUNK_SIZE_QUERY,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_user)
+):
+    return crud.bulk_create(db, models.Cooperator, cooperators, chunk_size=chunk_size)
+
+@app.put("/cooperators/", response_model=schemas.Cooperator)
+def upsert_cooperator(
+    cooperator: schemas.CooperatorCreate,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_user)
+):
+    return crud.upsert(db, models.Cooperator, [cooperator])[0]
+
+@app.put("/cooperators/bulk", response_model=List[schemas.Cooperator])
+def upsert_cooperators_bulk(
+    cooperators: List[schemas.CooperatorCreate],
+    chunk_size: int = CHUNK_SIZE_QUERY,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_user)
+):
+    return crud.upsert(db, models.Cooperator, cooperators, chunk_size=chunk_size)
 
 # Benefits endpoints
-@app.get("/benefits/", response_model=List[schemas.Benefit])
+@app.get("/benefits/", response_model=schemas.list_response(schemas.Benefit, schemas.BenefitFields))
 def read_benefits(
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = CURSOR_QUERY,
+    sort: str = SORT_QUERY,
+    fields: Optional[str] = BENEFIT_FIELDS_QUERY,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user)
 ):
-    benefits = crud.get_benefits(db, skip=skip, limit=limit)
+    selected = parse_fields(fields, BENEFIT_FIELDS)
+    if selected:
+        return rows_list(db, models.Benefit, selected, cursor, sort, skip, limit)
+    if cursor is not None:
+        return keyset_page(crud.get_benefits_page, db, cursor, sort, limit)
+    benefits = response_cache.get_benefits(db, skip=skip, limit=limit)
     return benefits
 
 @app.post("/benefits/", response_model=schemas.Benefit)
@@ -180,17 +455,54 @@ def create_benefit(
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user)
 ):
-    return crud.create_benefit(db=db, benefit=benefit)
+    try:
+        return crud.create_benefit(db=db, benefit=benefit)
+    except crud.ConflictError as e:
+        raise conflict_error(e)
+
+@app.post("/benefits/bulk", response_model=schemas.BulkResult)
+def create_benefits_bulk(
+    benefits: List[schemas.BenefitCreate],
+    chunk_size: int = CHUNK_SIZE_QUERY,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_user)
+):
+    return crud.bulk_create(db, models.Benefit, benefits, chunk_size=chunk_size)
+
+@app.put("/benefits/", response_model=schemas.Benefit)
+def upsert_benefit(
+    benefit: schemas.BenefitCreate,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_user)
+):
+    return crud.upsert(db, models.Benefit, [benefit])[0]
+
+@app.put("/benefits/bulk", response_model=List[schemas.Benefit])
+def upsert_benefits_bulk(
+    benefits: List[schemas.BenefitCreate],
+    chunk_size: int = CHUNK_SIZE_QUERY,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_user)
+):
+    return crud.upsert(db, models.Benefit, benefits, chunk_size=chunk_size)
 
 # Addresses endpoints
-@app.get("/addresses/", response_model=List[schemas.Address])
+@app.get("/addresses/", response_model=schemas.list_response(schemas.Address, schemas.AddressFields))
 def read_addresses(
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = CURSOR_QUERY,
+    sort: str = SORT_QUERY,
+    fields: Optional[str] = ADDRESS_FIELDS_QUERY,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user)
 ):
-    addresses = crud.get_addresses(db, skip=skip, limit=limit)
+    selected = parse_fields(fields, ADDRESS_FIELDS)
+    if selected:
+        return rows_list(db, models.Address, selected, cursor, sort, skip, limit)
+    if cursor is not None:
+        return keyset_page(crud.get_addresses_page, db, cursor, sort, limit)
+    addresses = response_cache.get_addresses(db, skip=skip, limit=limit)
     return addresses
 
 @app.post("/addresses/", response_model=schemas.Address)
@@ -201,15 +513,32 @@ def create_address(
 ):
     return crud.create_address(db=db, address=address)
 
+@app.post("/addresses/bulk", response_model=schemas.BulkResult)
+def create_addresses_bulk(
+    addresses: List[schemas.AddressCreate],
+    chunk_size: int = CHUNK_SIZE_QUERY,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_user)
+):
+    return crud.bulk_create(db, models.Address, addresses, chunk_size=chunk_size)
+
 # Contacts endpoints
-@app.get("/contacts/", response_model=List[schemas.Contact])
+@app.get("/contacts/", response_model=schemas.list_response(schemas.Contact, schemas.ContactFields))
 def read_contacts(
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = CURSOR_QUERY,
+    sort: str = SORT_QUERY,
+    fields: Optional[str] = CONTACT_FIELDS_QUERY,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user)
 ):
-    contacts = crud.get_contacts(db, skip=skip, limit=limit)
+    selected = parse_fields(fields, CONTACT_FIELDS)
+    if selected:
+        return rows_list(db, models.Contact, selected, cursor, sort, skip, limit)
+    if cursor is not None:
+        return keyset_page(crud.get_contacts_page, db, cursor, sort, limit)
+    contacts = response_cache.get_contacts(db, skip=skip, limit=limit)
     return contacts
 
 @app.post("/contacts/", response_model=schemas.Contact)
@@ -220,15 +549,49 @@ def create_contact(
 ):
     return crud.create_contact(db=db, contact=contact)
 
+@app.post("/contacts/bulk", response_model=schemas.BulkResult)
+def create_contacts_bulk(
+    contacts: List[schemas.ContactCreate],
+    chunk_size: int = CHUNK_SIZE_QUERY,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_user)
+):
+    return crud.bulk_create(db, models.Contact, contacts, chunk_size=chunk_size)
+
+@app.put("/contacts/", response_model=schemas.Contact)
+def upsert_contact(
+    contact: schemas.ContactCreate,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_user)
+):
+    return crud.upsert(db, models.Contact, [contact])[0]
+
+@app.put("/contacts/bulk", response_model=List[schemas.Contact])
+def upsert_contacts_bulk(
+    contacts: List[schemas.ContactCreate],
+    chunk_size: int = CHUNK_SIZE_QUERY,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_user)
+):
+    return crud.upsert(db, models.Contact, contacts, chunk_size=chunk_size)
+
 # Locations endpoints
-@app.get("/locations/", response_model=List[schemas.Location])
+@app.get("/locations/", response_model=schemas.list_response(schemas.Location, schemas.LocationFields))
 def read_locations(
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = CURSOR_QUERY,
+    sort: str = SORT_QUERY,
+    fields: Optional[str] = LOCATION_FIELDS_QUERY,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user)
 ):
-    locations = crud.get_locations(db, skip=skip, limit=limit)
+    selected = parse_fields(fields, LOCATION_FIELDS)
+    if selected:
+        return rows_list(db, models.Location, selected, cursor, sort, skip, limit)
+    if cursor is not None:
+        return keyset_page(crud.get_locations_page, db, cursor, sort, limit)
+    locations = response_cache.get_locations(db, skip=skip, limit=limit)
     return locations
 
 @app.post("/locations/", response_model=schemas.Location)
@@ -239,6 +602,134 @@ def create_location(
 ):
     return crud.create_location(db=db, location=location)
 
+@app.post("/locations/bulk", response_model=schemas.BulkResult)
+def create_locations_bulk(
+    locations: List[schemas.LocationCreate],
+    chunk_size: int = CHUNK_SIZE_QUERY,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_user)
+):
+    return crud.bulk_create(db, models.Location, locations, chunk_size=chunk_size)
+
+# Statistics endpoints
+@app.get("/stats/sectors", response_model=List[schemas.SectorStatistics])
+def read_sector_statistics(
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_user)
+):
+    return stats.get_sector_statistics(db)
+
+# Answers polling clients with 304 while the fingerprint of the view's tables is unchanged
+def conditional_statistics(request: Request, response: Response, db: Session, view: str, fetch):
+    etag = stats.view_etag(db, view)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if stats.etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    response.headers.update(headers)
+    return stats.get_view_statistics(db, view, etag, fetch)
+
+@app.get("/stats/projects", response_model=List[schemas.ProjectStatistics])
+def read_project_statistics(
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_user)
+):
+    return conditional_statistics(request, response, db, "project_statistics", crud.get_project_statistics)
+
+@app.get("/stats/management-levels", response_model=List[schemas.ManagementLevelStatistics])
+def read_management_level_statistics(
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_user)
+):
+    return conditional_statistics(request, response, db, "management_level_projects", crud.get_management_level_statistics)
+
+@app.get("/stats/locations", response_model=List[schemas.LocationStatistics])
+def read_location_statistics(
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_user)
+):
+    return conditional_statistics(request, response, db, "location_projects", crud.get_location_statistics)
+
+@app.get("/stats/owners", response_model=List[schemas.OwnerStatistics])
+def read_owner_statistics(
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_user)
+):
+    return conditional_statistics(request, response, db, "owner_projects", crud.get_owner_statistics)
+
+# Audit endpoints
+@app.get("/audit", response_model=schemas.Page[schemas.AuditLogEntry])
+def read_audit_log(
+    limit: int = 100,
+    cursor: Optional[str] = CURSOR_QUERY,
+    sort: str = Query("changed_at", description="Sort column used for keyset pagination"),
+    order: Literal["asc", "desc"] = Query("desc", description="Sort direction"),
+    table_name: Optional[str] = None,
+    record_id: Optional[int] = None,
+    action_type: Optional[models.AuditAction] = None,
+    since: Optional[datetime] = Query(None, description="Only changes at or after this time"),
+    until: Optional[datetime] = Query(None, description="Only changes before this time"),
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_user)
+):
+    options = {
+        "descending": order == "desc", "table_name": table_name, "record_id": record_id, "action_type": action_type,
+        "since": since, "until": until,
+    }
+    return keyset_page(crud.get_audit_log_page, db, cursor, sort, limit, **options)
+
+# Export endpoints
+@app.get("/export/projects")
+def export_projects(
+    format: Literal["ndjson", "csv"] = "ndjson",
+    filters: schemas.ProjectFilter = Depends(project_filter_params),
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_user)
+):
+    # The session stays open until the response has been streamed
+    serialize, media_type = export.EXPORT_FORMATS[format]
+    return StreamingResponse(
+        serialize(export.iter_project_rows(db, filters=filters)),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="projects.{format}"'},
+    )
+
+# Internal endpoints
+@app.get("/internal/auth/cache")
+def read_auth_cache_stats(current_user: models.User = Depends(check_admin_access)):
+    return get_cache_stats()
+
+@app.get("/internal/auth/login-pool")
+def read_login_pool_stats(current_user: models.User = Depends(check_admin_access)):
+    return login_pool.stats()
+
+@app.get("/internal/stats/cache")
+def read_stats_cache(current_user: models.User = Depends(check_admin_access)):
+    return stats.stats_cache.stats()
+
+@app.get("/internal/response-cache")
+def read_response_cache_stats(current_user: models.User = Depends(check_admin_access)):
+    return response_cache.get_stats()
+
+@app.get("/internal/pool")
+def read_pool_metrics(current_user: models.User = Depends(check_admin_access)):
+    return pool_metrics()
+
+@app.get("/internal/slow-queries")
+def read_slow_queries(limit: int = Query(50, ge=1, le=1000), current_user: models.User = Depends(check_admin_access)):
+    return {
+        "threshold_ms": slow_queries.SLOW_QUERY_MS,
+        "explain_rate": slow_queries.SLOW_QUERY_EXPLAIN_RATE,
+        "queries": slow_queries.get_recent(limit),
+    }
+
 # Authentication endpoints
 @app.post("/token", response_model=schemas.Token)
 async def login_for_access_token(
@@ -246,17 +737,39 @@ async def login_for_access_token(
     password: str = Form(...),
     db: Session = Depends(get_db)
 ):
-    user = crud.authenticate_user(db, username, password)
+    try:
+        user = await login_pool.run(crud.authenticate_user, db, username, password)
+    except LoginPoolFull:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many concurrent login attempts",
+            headers={"Retry-After": "1"},
+        )
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    access_token = crud.create_access_token(data={"sub": user.username})
+    access_token = crud.create_access_token(data=crud.access_token_claims(user))
     return {"access_token": access_token, "token_type": "bearer"}
 
+# Revokes every token issued to the current user, including the one making the request
+@app.post("/token/revoke")
+def revoke_tokens(
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_user)
+):
+    version = crud.revoke_tokens(db, current_user.id)
+    if version is None:
+        raise HTTPException(status_code=404, detail="User not found")
+    user_cache.pop(current_user.username)
+    token_versions.set(current_user.id, version)
+    return {"message": "Tokens revoked"}
+
 if __name__ == "__main__":
-    # Create database tables
-    models.Base.metadata.create_all(bind=engine)
+    # Only needed when running the module directly; workers are started by the uvicorn CLI
+    import uvicorn
+
+    # The schema is prepared by the lifespan handler according to STARTUP_MODE
     uvicorn.run("app.main:app", host="0.0.0.0", port=8000, reload=True) 
\ No newline at end of file
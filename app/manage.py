@@ -0,0 +1,73 @@
+from pathlib import Path
+import argparse
+
+# One-off database commands, run once per deploy instead of on every worker start:
+#   python -m app.manage migrate [revision]   apply Alembic migrations (default: head)
+#   python -m app.manage stamp [revision]     mark a schema created from sql/ as migrated
+#   python -m app.manage check                list differences between app.models and the database
+#   python -m app.manage seed                 create the default users in an empty database
+#
+# Migrations manage the schema of app.models. A database built from sql/ has the
+# same tables and enum types, plus PostgreSQL objects the models do not describe and
+# migrations leave alone: the partitioned audit_log and its partitions, the audit,
+# validation and status triggers, the views, roles and backup functions. sql/ also
+# declares some columns NOT NULL that the models leave nullable. Run `check` before
+# stamping such a database; changes to the sql/-only objects go into sql/ and, for
+# existing databases, a hand-written revision.
+MIGRATIONS_DIR = Path(__file__).resolve().parent / "migrations"
+
+def alembic_config(connection=None):
+    from alembic.config import Config
+
+    config = Config()
+    config.set_main_option("script_location", str(MIGRATIONS_DIR))
+    # env.py runs on this connection instead of opening one from the app engine
+    config.attributes["connection"] = connection
+    return config
+
+def migrate(revision: str = "head", connection=None):
+    from alembic import command
+
+    command.upgrade(alembic_config(connection), revision)
+
+def stamp(revision: str = "head", connection=None):
+    from alembic import command
+
+    command.stamp(alembic_config(connection), revision)
+
+def check(connection=None):
+    from alembic import command
+
+    # Raises alembic.util.AutogenerateDiffsDetected listing the differences
+    command.check(alembic_config(connection))
+
+def seed():
+    from .database import seed_default_users
+
+    seed_default_users()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m app.manage", description="KART database management")
+    commands = parser.add_subparsers(dest="command", required=True)
+    for name in ("migrate", "stamp"):
+        command_parser = commands.add_parser(name)
+        command_parser.add_argument("revision", nargs="?", default="head")
+    commands.add_parser("check")
+    commands.add_parser("seed")
+    args = parser.parse_args(argv)
+
+    if args.command == "migrate":
+        migrate(args.revision)
+    elif args.command == "stamp":
+        stamp(args.revision)
+    elif args.command == "check":
+        from alembic.util import AutogenerateDiffsDetected
+        try:
+            check()
+        except AutogenerateDiffsDetected as e:
+            raise SystemExit(str(e))
+    else:
+        seed()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+from alembic import context
+
+from app import models
+from app.database import SQLALCHEMY_DATABASE_URL, Base, engine
+
+config = context.config
+target_metadata = Base.metadata
+
+def include_object(object, name, type_, reflected, compare_to):
+    # Tables that only exist in the database are managed outside app.models: the
+    # audit_log partitions from sql/ and the SQLite FTS5 shadow tables
+    return not (type_ == "table" and reflected and compare_to is None)
+
+def run_migrations_offline():
+    context.configure(
+        url=SQLALCHEMY_DATABASE_URL,
+        target_metadata=target_metadata,
+        include_object=include_object,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+def run_migrations(connection):
+    context.configure(
+        connection=connection,
+        target_metadata=target_metadata,
+        include_object=include_object,
+        render_as_batch=connection.dialect.name == "sqlite",
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+def run_migrations_online():
+    # app.manage can pass in an open connection, e.g. from tests
+    connection = config.attributes.get("connection")
+    if connection is not None:
+        run_migrations(connection)
+        return
+    with engine.connect() as connection:
+        run_migrations(connection)
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
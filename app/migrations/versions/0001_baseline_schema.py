@@ -0,0 +1,431 @@
+"""baseline schema
+
+The schema of app.models at the time migrations were introduced, including the
+search and project_details triggers that create_all installs.
+
+Revision ID: 0001
+Revises: 
+Create Date: 2026-10-18 14:16:58.704418
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '0001'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# The triggers as they were when this revision was written. They are copied here
+# rather than imported from app.models so that this revision never changes; later
+# changes to them get their own revision.
+SEARCH_DDL = {
+    "postgresql": [
+        """ALTER TABLE projects ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS (
+            setweight(to_tsvector('english', COALESCE(title, '')), 'A') ||
+            setweight(to_tsvector('english', COALESCE(description, '')), 'B') ||
+            setweight(to_tsvector('english', COALESCE(notes, '')), 'C')
+        ) STORED""",
+        "CREATE INDEX IF NOT EXISTS idx_projects_search_vector ON projects USING gin(search_vector)",
+    ],
+    "sqlite": [
+        """CREATE VIRTUAL TABLE IF NOT EXISTS projects_fts USING fts5(
+            title, description, notes, content='projects', content_rowid='id', tokenize='porter'
+        )""",
+        """CREATE TRIGGER IF NOT EXISTS projects_fts_insert AFTER INSERT ON projects BEGIN
+            INSERT INTO projects_fts(rowid, title, description, notes)
+            VALUES (new.id, new.title, new.description, new.notes);
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS projects_fts_delete AFTER DELETE ON projects BEGIN
+            INSERT INTO projects_fts(projects_fts, rowid, title, description, notes)
+            VALUES ('delete', old.id, old.title, old.description, old.notes);
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS projects_fts_update AFTER UPDATE ON projects BEGIN
+            INSERT INTO projects_fts(projects_fts, rowid, title, description, notes)
+            VALUES ('delete', old.id, old.title, old.description, old.notes);
+            INSERT INTO projects_fts(rowid, title, description, notes)
+            VALUES (new.id, new.title, new.description, new.notes);
+        END""",
+    ],
+}
+
+PG_PROJECT_DETAILS_FUNCTIONS = [
+    """CREATE OR REPLACE FUNCTION refresh_project_details_summary(project_ids INTEGER[])
+    RETURNS VOID AS $$
+    BEGIN
+        IF cardinality(project_ids) > 0 THEN
+            INSERT INTO project_details_summary (
+                project_id, owners, contacts, locations, cooperators, benefits, refreshed_at
+            )
+            SELECT
+                p.id,
+                (SELECT string_agg(DISTINCT o.name, ', ')
+                    FROM projects_owners po JOIN owners o ON po.owner_id = o.id
+                    WHERE po.project_id = p.id),
+                (SELECT string_agg(DISTINCT c.name, ', ')
+                    FROM projects_contacts pc JOIN contacts c ON pc.contact_id = c.id
+                    WHERE pc.project_id = p.id),
+                (SELECT string_agg(DISTINCT a.city || ', ' || a.county, '; ')
+                    FROM projects_locations pl
+                    JOIN locations l ON pl.location_id = l.id
+                    JOIN addresses a ON l.address_id = a.id
+                    WHERE pl.project_id = p.id),
+                (SELECT string_agg(DISTINCT co.name, ', ')
+                    FROM projects_cooperators pco JOIN cooperators co ON pco.cooperator_id = co.id
+                    WHERE pco.project_id = p.id),
+                (SELECT string_agg(DISTINCT b.name, ', ')
+                    FROM projects_benefits pb JOIN benefits b ON pb.benefit_id = b.id
+                    WHERE pb.project_id = p.id),
+                CURRENT_TIMESTAMP
+            FROM projects p
+            WHERE p.id = ANY(project_ids)
+            ON CONFLICT (project_id) DO UPDATE SET
+                owners = EXCLUDED.owners,
+                contacts = EXCLUDED.contacts,
+                locations = EXCLUDED.locations,
+                cooperators = EXCLUDED.cooperators,
+                benefits = EXCLUDED.benefits,
+                refreshed_at = EXCLUDED.refreshed_at;
+        END IF;
+    END;
+    $$ LANGUAGE plpgsql""",
+    """CREATE OR REPLACE FUNCTION refresh_project_details_from_links()
+    RETURNS TRIGGER AS $$
+    BEGIN
+        IF TG_OP = 'INSERT' THEN
+            PERFORM refresh_project_details_summary(ARRAY(SELECT DISTINCT project_id FROM new_rows));
+        ELSE
+            PERFORM refresh_project_details_summary(ARRAY(SELECT DISTINCT project_id FROM old_rows));
+        END IF;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql""",
+    """CREATE OR REPLACE FUNCTION refresh_project_details_from_entities()
+    RETURNS TRIGGER AS $$
+    DECLARE
+        project_ids INTEGER[];
+    BEGIN
+        CASE TG_TABLE_NAME
+        WHEN 'owners' THEN
+            project_ids := ARRAY(
+                SELECT po.project_id FROM projects_owners po
+                JOIN new_rows n ON po.owner_id = n.id JOIN old_rows o ON n.id = o.id
+                WHERE n.name IS DISTINCT FROM o.name
+            );
+        WHEN 'contacts' THEN
+            project_ids := ARRAY(
+                SELECT pc.project_id FROM projects_contacts pc
+                JOIN new_rows n ON pc.contact_id = n.id JOIN old_rows o ON n.id = o.id
+                WHERE n.name IS DISTINCT FROM o.name
+            );
+        WHEN 'cooperators' THEN
+            project_ids := ARRAY(
+                SELECT pco.project_id FROM projects_cooperators pco
+                JOIN new_rows n ON pco.cooperator_id = n.id JOIN old_rows o ON n.id = o.id
+                WHERE n.name IS DISTINCT FROM o.name
+            );
+        WHEN 'benefits' THEN
+            project_ids := ARRAY(
+                SELECT pb.project_id FROM projects_benefits pb
+                JOIN new_rows n ON pb.benefit_id = n.id JOIN old_rows o ON n.id = o.id
+                WHERE n.name IS DISTINCT FROM o.name
+            );
+        WHEN 'locations' THEN
+            project_ids := ARRAY(
+                SELECT pl.project_id FROM projects_locations pl
+                JOIN new_rows n ON pl.location_id = n.id JOIN old_rows o ON n.id = o.id
+                WHERE n.address_id IS DISTINCT FROM o.address_id
+            );
+        WHEN 'addresses' THEN
+            project_ids := ARRAY(
+                SELECT pl.project_id FROM projects_locations pl
+                JOIN locations l ON pl.location_id = l.id
+                JOIN new_rows n ON l.address_id = n.id JOIN old_rows o ON n.id = o.id
+                WHERE n.city IS DISTINCT FROM o.city OR n.county IS DISTINCT FROM o.county
+            );
+        END CASE;
+        PERFORM refresh_project_details_summary(ARRAY(SELECT DISTINCT unnest(project_ids)));
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql""",
+]
+
+PROJECT_DETAILS_LINKS = ("projects_owners", "projects_contacts", "projects_locations", "projects_cooperators", "projects_benefits")
+
+# Changed columns and the projects linked to the updated row, for the SQLite triggers
+PROJECT_DETAILS_SOURCES = {
+    "owners": ("name", "SELECT project_id FROM projects_owners WHERE owner_id = new.id"),
+    "contacts": ("name", "SELECT project_id FROM projects_contacts WHERE contact_id = new.id"),
+    "cooperators": ("name", "SELECT project_id FROM projects_cooperators WHERE cooperator_id = new.id"),
+    "benefits": ("name", "SELECT project_id FROM projects_benefits WHERE benefit_id = new.id"),
+    "locations": ("address_id", "SELECT project_id FROM projects_locations WHERE location_id = new.id"),
+    "addresses": (
+        "city, county",
+        "SELECT pl.project_id FROM projects_locations pl JOIN locations l ON pl.location_id = l.id "
+        "WHERE l.address_id = new.id"
+    ),
+}
+
+SQLITE_PROJECT_DETAILS_UPSERT = """INSERT OR REPLACE INTO project_details_summary (
+                project_id, owners, contacts, locations, cooperators, benefits, refreshed_at
+            )
+            SELECT
+                p.id,
+                (SELECT group_concat(value, ', ') FROM (SELECT DISTINCT o.name AS value
+                    FROM projects_owners po JOIN owners o ON po.owner_id = o.id
+                    WHERE po.project_id = p.id ORDER BY 1)),
+                (SELECT group_concat(value, ', ') FROM (SELECT DISTINCT c.name AS value
+                    FROM projects_contacts pc JOIN contacts c ON pc.contact_id = c.id
+                    WHERE pc.project_id = p.id ORDER BY 1)),
+                (SELECT group_concat(value, '; ') FROM (SELECT DISTINCT a.city || ', ' || a.county AS value
+                    FROM projects_locations pl
+                    JOIN locations l ON pl.location_id = l.id
+                    JOIN addresses a ON l.address_id = a.id
+                    WHERE pl.project_id = p.id ORDER BY 1)),
+                (SELECT group_concat(value, ', ') FROM (SELECT DISTINCT co.name AS value
+                    FROM projects_cooperators pco JOIN cooperators co ON pco.cooperator_id = co.id
+                    WHERE pco.project_id = p.id ORDER BY 1)),
+                (SELECT group_concat(value, ', ') FROM (SELECT DISTINCT b.name AS value
+                    FROM projects_benefits pb JOIN benefits b ON pb.benefit_id = b.id
+                    WHERE pb.project_id = p.id ORDER BY 1)),
+                strftime('%%Y-%%m-%%d %%H:%%M:%%f', 'now')
+            FROM projects p
+            WHERE {where};"""
+
+PROJECT_DETAILS_DDL = {
+    "postgresql": [
+        *PG_PROJECT_DETAILS_FUNCTIONS,
+        *(
+            f"""CREATE TRIGGER refresh_project_details_{table}_{event_name.lower()}
+            AFTER {event_name} ON {table}
+            REFERENCING {transition} TABLE AS {alias}
+            FOR EACH STATEMENT
+            EXECUTE FUNCTION refresh_project_details_from_links()"""
+            for table in PROJECT_DETAILS_LINKS
+            for event_name, transition, alias in (("INSERT", "NEW", "new_rows"), ("DELETE", "OLD", "old_rows"))
+        ),
+        *(
+            f"""CREATE TRIGGER refresh_project_details_{table}_update
+            AFTER UPDATE ON {table}
+            REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+            FOR EACH STATEMENT
+            EXECUTE FUNCTION refresh_project_details_from_entities()"""
+            for table in PROJECT_DETAILS_SOURCES
+        ),
+    ],
+    "sqlite": [
+        *(
+            f"""CREATE TRIGGER IF NOT EXISTS refresh_project_details_{table}_{event_name.lower()}
+            AFTER {event_name} ON {table} BEGIN
+            {SQLITE_PROJECT_DETAILS_UPSERT.format(where=f"p.id = {row}.project_id")}
+            END"""
+            for table in PROJECT_DETAILS_LINKS
+            for event_name, row in (("INSERT", "new"), ("DELETE", "old"))
+        ),
+        *(
+            f"""CREATE TRIGGER IF NOT EXISTS refresh_project_details_{table}_update
+            AFTER UPDATE OF {columns} ON {table} BEGIN
+            {SQLITE_PROJECT_DETAILS_UPSERT.format(where=f"p.id IN ({linked_projects})")}
+            END"""
+            for table, (columns, linked_projects) in PROJECT_DETAILS_SOURCES.items()
+        ),
+        """CREATE TRIGGER IF NOT EXISTS refresh_project_details_projects_delete AFTER DELETE ON projects BEGIN
+            DELETE FROM project_details_summary WHERE project_id = old.id;
+        END""",
+    ],
+}
+
+
+def upgrade() -> None:
+    op.create_table('addresses',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('city', sa.String(), nullable=True),
+    sa.Column('county', sa.String(), nullable=True),
+    sa.Column('postal_code', sa.String(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_addresses_id', 'addresses', ['id'], unique=False)
+
+    op.create_table('audit_log',
+    sa.Column('id', sa.BigInteger().with_variant(sa.Integer(), 'sqlite'), nullable=False),
+    sa.Column('table_name', sa.String(length=64), nullable=False),
+    sa.Column('record_id', sa.Integer(), nullable=False),
+    sa.Column('action_type', sa.Enum('INSERT', 'UPDATE', 'DELETE', name='audit_action'), nullable=False),
+    sa.Column('changed_by', sa.String(length=255), nullable=False),
+    sa.Column('changed_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('old_values', sa.JSON().with_variant(postgresql.JSONB(astext_type=sa.Text()), 'postgresql'), nullable=True),
+    sa.Column('new_values', sa.JSON().with_variant(postgresql.JSONB(astext_type=sa.Text()), 'postgresql'), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('idx_audit_log_changed_at', 'audit_log', ['changed_at'], unique=False, postgresql_using='brin')
+    op.create_index('idx_audit_log_record', 'audit_log', ['table_name', 'record_id'], unique=False)
+
+    op.create_table('benefits',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(), nullable=True),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_benefits_id', 'benefits', ['id'], unique=False)
+    op.create_index('ix_benefits_name', 'benefits', ['name'], unique=True)
+
+    op.create_table('contacts',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(), nullable=True),
+    sa.Column('email', sa.String(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('email')
+    )
+    op.create_index('ix_contacts_id', 'contacts', ['id'], unique=False)
+
+    op.create_table('cooperators',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_cooperators_id', 'cooperators', ['id'], unique=False)
+    op.create_index('ix_cooperators_name', 'cooperators', ['name'], unique=True)
+
+    op.create_table('owners',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(), nullable=True),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_owners_id', 'owners', ['id'], unique=False)
+    op.create_index('ix_owners_name', 'owners', ['name'], unique=True)
+
+    op.create_table('projects',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('title', sa.String(), nullable=True),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('status', sa.Enum('DRAFT', 'IN_PROGRESS', 'COMPLETED', 'ON_HOLD', 'CANCELLED', 'POSTPONED', name='project_status'), nullable=True),
+    sa.Column('start_year', sa.Integer(), nullable=True),
+    sa.Column('end_year', sa.Integer(), nullable=True),
+    sa.Column('sector', sa.Enum('IT', 'ECONOMY', 'ENVIRONMENT', 'SOCIETY', 'GOVERNMENT', 'HEALTH', 'EDUCATION', 'INNOVATION', 'OTHER', name='project_sector'), nullable=True),
+    sa.Column('project_link', sa.String(), nullable=True),
+    sa.Column('notes', sa.Text(), nullable=True),
+    sa.Column('managment_level', sa.Enum('NATIONAL', 'REGIONAL', 'LOCAL', name='project_management_level'), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('sector', 'title', name='uq_projects_sector_title')
+    )
+    op.create_index('ix_projects_id', 'projects', ['id'], unique=False)
+    op.create_index('ix_projects_title', 'projects', ['title'], unique=False)
+
+    op.create_table('users',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('username', sa.String(), nullable=True),
+    sa.Column('email', sa.String(), nullable=True),
+    sa.Column('hashed_password', sa.String(), nullable=True),
+    sa.Column('role', sa.Enum('USER', 'ADMIN', name='role'), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_users_email', 'users', ['email'], unique=True)
+    op.create_index('ix_users_id', 'users', ['id'], unique=False)
+    op.create_index('ix_users_username', 'users', ['username'], unique=True)
+
+    op.create_table('locations',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('address_id', sa.Integer(), nullable=True),
+    sa.Column('name', sa.String(), nullable=True),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.ForeignKeyConstraint(['address_id'], ['addresses.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_locations_id', 'locations', ['id'], unique=False)
+
+    op.create_table('project_details_summary',
+    sa.Column('project_id', sa.Integer(), nullable=False),
+    sa.Column('owners', sa.Text(), nullable=True),
+    sa.Column('contacts', sa.Text(), nullable=True),
+    sa.Column('locations', sa.Text(), nullable=True),
+    sa.Column('cooperators', sa.Text(), nullable=True),
+    sa.Column('benefits', sa.Text(), nullable=True),
+    sa.Column('refreshed_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('project_id')
+    )
+    op.create_table('projects_benefits',
+    sa.Column('project_id', sa.Integer(), nullable=False),
+    sa.Column('benefit_id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['benefit_id'], ['benefits.id'], ),
+    sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ),
+    sa.PrimaryKeyConstraint('project_id', 'benefit_id')
+    )
+    op.create_table('projects_contacts',
+    sa.Column('project_id', sa.Integer(), nullable=False),
+    sa.Column('contact_id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['contact_id'], ['contacts.id'], ),
+    sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ),
+    sa.PrimaryKeyConstraint('project_id', 'contact_id')
+    )
+    op.create_table('projects_cooperators',
+    sa.Column('project_id', sa.Integer(), nullable=False),
+    sa.Column('cooperator_id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['cooperator_id'], ['cooperators.id'], ),
+    sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ),
+    sa.PrimaryKeyConstraint('project_id', 'cooperator_id')
+    )
+    op.create_table('projects_owners',
+    sa.Column('project_id', sa.Integer(), nullable=False),
+    sa.Column('owner_id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['owner_id'], ['owners.id'], ),
+    sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ),
+    sa.PrimaryKeyConstraint('project_id', 'owner_id')
+    )
+    op.create_table('projects_locations',
+    sa.Column('project_id', sa.Integer(), nullable=False),
+    sa.Column('location_id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['location_id'], ['locations.id'], ),
+    sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ),
+    sa.PrimaryKeyConstraint('project_id', 'location_id')
+    )
+
+    # Full text search and project_details summary triggers; DDL() applies %-formatting,
+    # hence the doubled percent signs
+    dialect = op.get_bind().dialect.name
+    for statement in SEARCH_DDL.get(dialect, []) + PROJECT_DETAILS_DDL.get(dialect, []):
+        op.execute(sa.DDL(statement))
+
+
+def downgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == "sqlite":
+        op.execute("DROP TABLE IF EXISTS projects_fts")
+    op.drop_table('projects_locations')
+    op.drop_table('projects_owners')
+    op.drop_table('projects_cooperators')
+    op.drop_table('projects_contacts')
+    op.drop_table('projects_benefits')
+    op.drop_table('project_details_summary')
+    op.drop_table('locations')
+    op.drop_table('users')
+    op.drop_table('projects')
+    op.drop_table('owners')
+    op.drop_table('cooperators')
+    op.drop_table('contacts')
+    op.drop_table('benefits')
+    op.drop_table('audit_log')
+    op.drop_table('addresses')
+    if dialect == "postgresql":
+        for function in (
+            "refresh_project_details_from_entities()",
+            "refresh_project_details_from_links()",
+            "refresh_project_details_summary(INTEGER[])",
+        ):
+            op.execute(f"DROP FUNCTION IF EXISTS {function}")
+        for enum_type in ("role", "project_status", "project_sector", "project_management_level", "audit_action"):
+            op.execute(f"DROP TYPE IF EXISTS {enum_type}")
@@ -0,0 +1,43 @@
+"""slow query log
+
+Adds slow_queries, where the API records statements slower than
+SLOW_QUERY_MS when SLOW_QUERY_TABLE is enabled.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 14:35:40.931321
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '0003'
+down_revision: Union[str, None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('slow_queries',
+    sa.Column('id', sa.BigInteger().with_variant(sa.Integer(), 'sqlite'), nullable=False),
+    sa.Column('recorded_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('duration_ms', sa.Float(), nullable=False),
+    sa.Column('statement', sa.Text(), nullable=False),
+    sa.Column('parameters', sa.JSON().with_variant(postgresql.JSONB(astext_type=sa.Text()), 'postgresql'), nullable=True),
+    sa.Column('source', sa.String(length=255), nullable=True),
+    sa.Column('plan', sa.JSON().with_variant(postgresql.JSONB(astext_type=sa.Text()), 'postgresql'), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('slow_queries', schema=None) as batch_op:
+        batch_op.create_index('idx_slow_queries_recorded_at', ['recorded_at'], unique=False, postgresql_using='brin')
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('slow_queries', schema=None) as batch_op:
+        batch_op.drop_index('idx_slow_queries_recorded_at', postgresql_using='brin')
+
+    op.drop_table('slow_queries')
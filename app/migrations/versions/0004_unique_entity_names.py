@@ -0,0 +1,53 @@
+"""unique entity names
+
+Owner, cooperator and benefit names became unique, but databases created
+before that (by create_all or sql/) and stamped at the baseline may hold
+duplicates and only a plain name index. Later duplicates are renamed to
+"<name> (<id>)" and the unique index is created where it is missing.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 14:59:57.898064
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0004'
+down_revision: Union[str, None] = '0003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+TABLES = ("owners", "cooperators", "benefits")
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    for table in TABLES:
+        # Keeps the oldest row of each name
+        op.execute(sa.text(
+            f"UPDATE {table} SET name = name || ' (' || id || ')' "
+            f"WHERE id NOT IN (SELECT min(id) FROM {table} GROUP BY name)"
+        ))
+        inspector = sa.inspect(bind)
+        indexes = {index["name"]: index for index in inspector.get_indexes(table)}
+        unique = any(
+            constraint["column_names"] == ["name"] for constraint in inspector.get_unique_constraints(table)
+        )
+        # Plain name indexes from create_all and sql/ are redundant next to the unique one
+        for name in (f"ix_{table}_name", f"idx_{table}_name"):
+            if name in indexes and not indexes[name]["unique"]:
+                op.drop_index(name, table_name=table)
+                del indexes[name]
+        if not unique and f"ix_{table}_name" not in indexes:
+            op.create_index(f"ix_{table}_name", table, ["name"], unique=True)
+
+
+def downgrade() -> None:
+    # The baseline already declares the names unique and renamed rows cannot be told apart
+    pass
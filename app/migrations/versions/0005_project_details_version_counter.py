@@ -0,0 +1,76 @@
+"""project details version counter
+
+Adds table_versions and the triggers that count changes to
+project_details_summary, which the statistics ETags read instead of
+max(refreshed_at).
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18 15:07:44.469645
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0005'
+down_revision: Union[str, None] = '0004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+EVENTS = ("insert", "update", "delete")
+
+VERSION_DDL = {
+    "postgresql": [
+        """CREATE OR REPLACE FUNCTION bump_table_version()
+        RETURNS TRIGGER AS $$
+        BEGIN
+            INSERT INTO table_versions (table_name, version) VALUES (TG_TABLE_NAME, 1)
+            ON CONFLICT (table_name) DO UPDATE SET version = table_versions.version + 1;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql""",
+        *(
+            f"""CREATE TRIGGER bump_project_details_summary_version_{event}
+            AFTER {event.upper()} ON project_details_summary
+            FOR EACH STATEMENT
+            EXECUTE FUNCTION bump_table_version()"""
+            for event in EVENTS
+        ),
+    ],
+    "sqlite": [
+        f"""CREATE TRIGGER IF NOT EXISTS bump_project_details_summary_version_{event}
+        AFTER {event.upper()} ON project_details_summary BEGIN
+            INSERT INTO table_versions (table_name, version) VALUES ('project_details_summary', 1)
+            ON CONFLICT (table_name) DO UPDATE SET version = version + 1;
+        END"""
+        for event in EVENTS
+    ],
+}
+
+
+def upgrade() -> None:
+    op.create_table('table_versions',
+    sa.Column('table_name', sa.String(length=63), nullable=False),
+    sa.Column('version', sa.BigInteger(), nullable=False),
+    sa.PrimaryKeyConstraint('table_name')
+    )
+
+    for statement in VERSION_DDL.get(op.get_bind().dialect.name, []):
+        op.execute(sa.DDL(statement))
+
+
+def downgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    for event in EVENTS:
+        if dialect == "postgresql":
+            op.execute(f"DROP TRIGGER IF EXISTS bump_project_details_summary_version_{event} ON project_details_summary")
+        else:
+            op.execute(f"DROP TRIGGER IF EXISTS bump_project_details_summary_version_{event}")
+    if dialect == "postgresql":
+        op.execute("DROP FUNCTION IF EXISTS bump_table_version()")
+    op.drop_table('table_versions')
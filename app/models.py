@@ -1,6 +1,8 @@
-from sqlalchemy import Boolean, Column, ForeignKey, Integer, String, DateTime, Enum, Text, Table
+from sqlalchemy import JSON, BigInteger, Boolean, Column, DDL, Float, ForeignKey, Index, Integer, String, DateTime, Enum, Text, Table, UniqueConstraint, event
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
 from datetime import datetime
+from pathlib import Path
 from .database import Base
 import enum
 
@@ -16,6 +18,46 @@ class User(Base):
     email = Column(String, unique=True, index=True)
     hashed_password = Column(String)
     role = Column(Enum(UserRole, name="role"))
+    # Embedded in access tokens; bumping it revokes every token issued before
+    token_version = Column(Integer, nullable=False, default=0, server_default="0")
+
+class AuditAction(str, enum.Enum):
+    INSERT = "INSERT"
+    UPDATE = "UPDATE"
+    DELETE = "DELETE"
+
+# Written by the statement-level audit triggers in sql/triggers. sql/tables partitions
+# audit_log by month with (id, changed_at) as primary key; id alone is still unique.
+class AuditLog(Base):
+    __tablename__ = "audit_log"
+    __table_args__ = (
+        Index("idx_audit_log_record", "table_name", "record_id"),
+        Index("idx_audit_log_changed_at", "changed_at", postgresql_using="brin"),
+    )
+
+    id = Column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True)
+    table_name = Column(String(64), nullable=False)
+    record_id = Column(Integer, nullable=False)
+    action_type = Column(Enum(AuditAction, name="audit_action"), nullable=False)
+    changed_by = Column(String(255), nullable=False)
+    changed_at = Column(DateTime(timezone=True), default=datetime.utcnow, nullable=False)
+    old_values = Column(JSON().with_variant(JSONB, "postgresql"))
+    new_values = Column(JSON().with_variant(JSONB, "postgresql"))
+
+# Statements over SLOW_QUERY_MS, written by app.slow_queries when SLOW_QUERY_TABLE is set
+class SlowQuery(Base):
+    __tablename__ = "slow_queries"
+    __table_args__ = (
+        Index("idx_slow_queries_recorded_at", "recorded_at", postgresql_using="brin"),
+    )
+
+    id = Column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True)
+    recorded_at = Column(DateTime(timezone=True), default=datetime.utcnow, nullable=False)
+    duration_ms = Column(Float, nullable=False)
+    statement = Column(Text, nullable=False)
+    parameters = Column(JSON().with_variant(JSONB, "postgresql"))
+    source = Column(String(255))
+    plan = Column(JSON().with_variant(JSONB, "postgresql"))
 
 class ProjectStatus(str, enum.Enum):
     DRAFT = "DRAFT"
@@ -43,17 +85,19 @@ class ProjectManagementLevel(str, enum.Enum):
 
 class Project(Base):
     __tablename__ = "projects"
+    # Titles only have to be unique within a sector
+    __table_args__ = (UniqueConstraint("sector", "title", name="uq_projects_sector_title"),)
 
     id = Column(Integer, primary_key=True, index=True)
-    title = Column(String, unique=True, index=True)
+    title = Column(String, index=True)
     description = Column(Text)
-    status = Column(Enum(ProjectStatus), default=ProjectStatus.DRAFT)
+    status = Column(Enum(ProjectStatus, name="project_status"), default=ProjectStatus.DRAFT)
     start_year = Column(Integer)
     end_year = Column(Integer)
-    sector = Column(Enum(ProjectSector))
+    sector = Column(Enum(ProjectSector, name="project_sector"))
     project_link = Column(String)
     notes = Column(Text)
-    managment_level = Column(Enum(ProjectManagementLevel))
+    managment_level = Column(Enum(ProjectManagementLevel, name="project_management_level"))
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
@@ -67,7 +111,7 @@ class Owner(Base):
     __tablename__ = "owners"
 
     id = Column(Integer, primary_key=True, index=True)
-    name = Column(String, index=True)
+    name = Column(String, unique=True, index=True)
     description = Column(Text)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -78,7 +122,7 @@ class Cooperator(Base):
     __tablename__ = "cooperators"
 
     id = Column(Integer, primary_key=True, index=True)
-    name = Column(String, index=True)
+    name = Column(String, unique=True, index=True)
 
     projects = relationship("Project", secondary="projects_cooperators", back_populates="cooperators")
 
@@ -86,7 +130,7 @@ class Benefit(Base):
     __tablename__ = "benefits"
 
     id = Column(Integer, primary_key=True, index=True)
-    name = Column(String, index=True)
+    name = Column(String, unique=True, index=True)
     description = Column(Text)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -159,4 +203,154 @@ projects_benefits = Table(
     Base.metadata,
     Column("project_id", Integer, ForeignKey("projects.id"), primary_key=True),
     Column("benefit_id", Integer, ForeignKey("benefits.id"), primary_key=True)
-) 
\ No newline at end of file
+) 
+
+# Aggregated relationship names per project, the stored half of the project_details
+# view. Triggers on the junction and entity tables refresh only the affected projects.
+class ProjectDetailsSummary(Base):
+    __tablename__ = "project_details_summary"
+
+    project_id = Column(Integer, ForeignKey("projects.id", ondelete="CASCADE"), primary_key=True)
+    owners = Column(Text)
+    contacts = Column(Text)
+    locations = Column(Text)
+    cooperators = Column(Text)
+    benefits = Column(Text)
+    refreshed_at = Column(DateTime, default=datetime.utcnow)
+
+# Change counters, bumped by triggers on the counted table; see stats.view_etag
+class TableVersion(Base):
+    __tablename__ = "table_versions"
+
+    table_name = Column(String(63), primary_key=True)
+    version = Column(BigInteger, nullable=False)
+
+# Full text search on projects for schemas created with create_all; sql/ defines
+# the same generated column and index. SQLite gets an FTS5 index kept in sync
+# by triggers, so the search endpoint also works in tests.
+PROJECT_SEARCH_DDL = {
+    "postgresql": [
+        """ALTER TABLE projects ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS (
+            setweight(to_tsvector('english', COALESCE(title, '')), 'A') ||
+            setweight(to_tsvector('english', COALESCE(description, '')), 'B') ||
+            setweight(to_tsvector('english', COALESCE(notes, '')), 'C')
+        ) STORED""",
+        "CREATE INDEX IF NOT EXISTS idx_projects_search_vector ON projects USING gin(search_vector)",
+    ],
+    "sqlite": [
+        """CREATE VIRTUAL TABLE IF NOT EXISTS projects_fts USING fts5(
+            title, description, notes, content='projects', content_rowid='id', tokenize='porter'
+        )""",
+        """CREATE TRIGGER IF NOT EXISTS projects_fts_insert AFTER INSERT ON projects BEGIN
+            INSERT INTO projects_fts(rowid, title, description, notes)
+            VALUES (new.id, new.title, new.description, new.notes);
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS projects_fts_delete AFTER DELETE ON projects BEGIN
+            INSERT INTO projects_fts(projects_fts, rowid, title, description, notes)
+            VALUES ('delete', old.id, old.title, old.description, old.notes);
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS projects_fts_update AFTER UPDATE ON projects BEGIN
+            INSERT INTO projects_fts(projects_fts, rowid, title, description, notes)
+            VALUES ('delete', old.id, old.title, old.description, old.notes);
+            INSERT INTO projects_fts(rowid, title, description, notes)
+            VALUES (new.id, new.title, new.description, new.notes);
+        END""",
+    ],
+}
+
+for dialect, statements in PROJECT_SEARCH_DDL.items():
+    for statement in statements:
+        event.listen(Project.__table__, "after_create", DDL(statement).execute_if(dialect=dialect))
+event.listen(Project.__table__, "before_drop", DDL("DROP TABLE IF EXISTS projects_fts").execute_if(dialect="sqlite"))
+
+# PostgreSQL keeps project_details_summary up to date with the function and triggers
+# in sql/triggers/02_project_details.sql, the only copy of that DDL. create_all runs
+# the file once the whole schema exists, since the triggers span several tables, and
+# only when it created project_details_summary: create_all runs on every worker start
+# and replacing triggers locks the live tables. init-db.sh and migrations cover the rest.
+PROJECT_DETAILS_SQL = Path(__file__).resolve().parent.parent / "sql" / "triggers" / "02_project_details.sql"
+
+def create_project_details_triggers(target, connection, tables=(), **kw):
+    if connection.dialect.name == "postgresql" and ProjectDetailsSummary.__table__ in tables:
+        connection.exec_driver_sql(PROJECT_DETAILS_SQL.read_text(), execution_options={"no_parameters": True})
+
+event.listen(Base.metadata, "after_create", create_project_details_triggers)
+
+# SQLite stand-in for the PostgreSQL triggers, so tests see the same summary rows.
+# SQLite has no statement-level triggers, so each row change refreshes its projects.
+PROJECT_DETAILS_LINKS = ("projects_owners", "projects_contacts", "projects_locations", "projects_cooperators", "projects_benefits")
+
+# Entity columns that appear in the summary, and the projects linked to an updated row
+PROJECT_DETAILS_SOURCES = {
+    "owners": ("name", "SELECT project_id FROM projects_owners WHERE owner_id = new.id"),
+    "contacts": ("name", "SELECT project_id FROM projects_contacts WHERE contact_id = new.id"),
+    "cooperators": ("name", "SELECT project_id FROM projects_cooperators WHERE cooperator_id = new.id"),
+    "benefits": ("name", "SELECT project_id FROM projects_benefits WHERE benefit_id = new.id"),
+    "locations": ("address_id", "SELECT project_id FROM projects_locations WHERE location_id = new.id"),
+    "addresses": (
+        "city, county",
+        "SELECT pl.project_id FROM projects_locations pl JOIN locations l ON pl.location_id = l.id "
+        "WHERE l.address_id = new.id"
+    ),
+}
+
+# CURRENT_TIMESTAMP has one second resolution on SQLite. Percent signs are doubled
+# because DDL() applies %-formatting.
+SQLITE_PROJECT_DETAILS_UPSERT = """INSERT OR REPLACE INTO project_details_summary (
+                project_id, owners, contacts, locations, cooperators, benefits, refreshed_at
+            )
+            SELECT
+                p.id,
+                (SELECT group_concat(value, ', ') FROM (SELECT DISTINCT o.name AS value
+                    FROM projects_owners po JOIN owners o ON po.owner_id = o.id
+                    WHERE po.project_id = p.id ORDER BY 1)),
+                (SELECT group_concat(value, ', ') FROM (SELECT DISTINCT c.name AS value
+                    FROM projects_contacts pc JOIN contacts c ON pc.contact_id = c.id
+                    WHERE pc.project_id = p.id ORDER BY 1)),
+                (SELECT group_concat(value, '; ') FROM (SELECT DISTINCT a.city || ', ' || a.county AS value
+                    FROM projects_locations pl
+                    JOIN locations l ON pl.location_id = l.id
+                    JOIN addresses a ON l.address_id = a.id
+                    WHERE pl.project_id = p.id ORDER BY 1)),
+                (SELECT group_concat(value, ', ') FROM (SELECT DISTINCT co.name AS value
+                    FROM projects_cooperators pco JOIN cooperators co ON pco.cooperator_id = co.id
+                    WHERE pco.project_id = p.id ORDER BY 1)),
+                (SELECT group_concat(value, ', ') FROM (SELECT DISTINCT b.name AS value
+                    FROM projects_benefits pb JOIN benefits b ON pb.benefit_id = b.id
+                    WHERE pb.project_id = p.id ORDER BY 1)),
+                strftime('%%Y-%%m-%%d %%H:%%M:%%f', 'now')
+            FROM projects p
+            WHERE {where};"""
+
+SQLITE_PROJECT_DETAILS_DDL = [
+    *(
+        f"""CREATE TRIGGER IF NOT EXISTS refresh_project_details_{table}_{event_name.lower()}
+        AFTER {event_name} ON {table} BEGIN
+            {SQLITE_PROJECT_DETAILS_UPSERT.format(where=f"p.id = {row}.project_id")}
+        END"""
+        for table in PROJECT_DETAILS_LINKS
+        for event_name, row in (("INSERT", "new"), ("DELETE", "old"))
+    ),
+    *(
+        f"""CREATE TRIGGER IF NOT EXISTS refresh_project_details_{table}_update
+        AFTER UPDATE OF {columns} ON {table} BEGIN
+            {SQLITE_PROJECT_DETAILS_UPSERT.format(where=f"p.id IN ({linked_projects})")}
+        END"""
+        for table, (columns, linked_projects) in PROJECT_DETAILS_SOURCES.items()
+    ),
+    # SQLite does not enforce ON DELETE CASCADE unless foreign keys are switched on
+    """CREATE TRIGGER IF NOT EXISTS refresh_project_details_projects_delete AFTER DELETE ON projects BEGIN
+        DELETE FROM project_details_summary WHERE project_id = old.id;
+    END""",
+    *(
+        f"""CREATE TRIGGER IF NOT EXISTS bump_project_details_summary_version_{event_name.lower()}
+        AFTER {event_name} ON project_details_summary BEGIN
+            INSERT INTO table_versions (table_name, version) VALUES ('project_details_summary', 1)
+            ON CONFLICT (table_name) DO UPDATE SET version = version + 1;
+        END"""
+        for event_name in ("INSERT", "UPDATE", "DELETE")
+    ),
+]
+
+for statement in SQLITE_PROJECT_DETAILS_DDL:
+    event.listen(Base.metadata, "after_create", DDL(statement).execute_if(dialect="sqlite"))
@@ -0,0 +1,82 @@
+from fastapi import HTTPException, Query
+from typing import List, Optional
+from . import crud, schemas, serialization
+from .models import ProjectManagementLevel, ProjectSector, ProjectStatus
+
+# Query parameters shared by the sync and async routes
+
+# Keyset pagination: passing `cursor` (empty for the first page) switches a
+# list endpoint from skip/limit to a {"items", "next_cursor"} envelope.
+CURSOR_QUERY = Query(None, description="Opaque keyset cursor; send it empty to start from the first page")
+SORT_QUERY = Query("id", description="Sort column used for keyset pagination")
+ORDER_QUERY = Query("asc", description="Sort direction")
+
+EXPAND_QUERY = Query(None, description="Comma-separated relationships to include: " + ",".join(schemas.PROJECT_RELATIONSHIPS))
+
+# Sparse fieldsets: `fields` selects and returns only the listed columns
+def fields_query(allowed):
+    return Query(None, description="Comma-separated fields to return; id is always included: " + ",".join(allowed))
+
+PROJECT_FIELDS = tuple(schemas.Project.model_fields)
+OWNER_FIELDS = tuple(schemas.Owner.model_fields)
+COOPERATOR_FIELDS = tuple(schemas.Cooperator.model_fields)
+BENEFIT_FIELDS = tuple(schemas.Benefit.model_fields)
+ADDRESS_FIELDS = tuple(schemas.Address.model_fields)
+CONTACT_FIELDS = tuple(schemas.Contact.model_fields)
+LOCATION_FIELDS = tuple(schemas.Location.model_fields)
+
+FIELDS_QUERY = fields_query(PROJECT_FIELDS)
+OWNER_FIELDS_QUERY = fields_query(OWNER_FIELDS)
+COOPERATOR_FIELDS_QUERY = fields_query(COOPERATOR_FIELDS)
+BENEFIT_FIELDS_QUERY = fields_query(BENEFIT_FIELDS)
+ADDRESS_FIELDS_QUERY = fields_query(ADDRESS_FIELDS)
+CONTACT_FIELDS_QUERY = fields_query(CONTACT_FIELDS)
+LOCATION_FIELDS_QUERY = fields_query(LOCATION_FIELDS)
+
+CHUNK_SIZE_QUERY = Query(crud.BULK_CHUNK_SIZE, ge=1, le=10000, description="Rows per multi-row INSERT")
+
+def parse_expand(expand: Optional[str]):
+    if not expand:
+        return ()
+    relationships = tuple(dict.fromkeys(name.strip() for name in expand.split(",") if name.strip()))
+    unknown = [name for name in relationships if name not in schemas.PROJECT_RELATIONSHIPS]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Cannot expand: {', '.join(unknown)}")
+    return relationships
+
+def parse_fields(fields: Optional[str], allowed=PROJECT_FIELDS, expand=()):
+    if not fields:
+        # The fast serialization mode reads every column as plain rows
+        return allowed if serialization.FAST_SERIALIZATION and not expand else ()
+    names = tuple(dict.fromkeys(["id", *(name.strip() for name in fields.split(",") if name.strip())]))
+    unknown = [name for name in names if name not in allowed]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+    if expand:
+        raise HTTPException(status_code=400, detail="fields cannot be combined with expand")
+    return names
+
+def project_filter_params(
+    status: Optional[List[ProjectStatus]] = Query(None),
+    sector: Optional[List[ProjectSector]] = Query(None),
+    managment_level: Optional[List[ProjectManagementLevel]] = Query(None),
+    start_year_min: Optional[int] = None,
+    start_year_max: Optional[int] = None,
+    end_year_min: Optional[int] = None,
+    end_year_max: Optional[int] = None
+):
+    return schemas.ProjectFilter(
+        status=status,
+        sector=sector,
+        managment_level=managment_level,
+        start_year_min=start_year_min,
+        start_year_max=start_year_max,
+        end_year_min=end_year_min,
+        end_year_max=end_year_max,
+    )
+
+def pagination_error(e: crud.PaginationError):
+    return HTTPException(status_code=400, detail=str(e))
+
+def conflict_error(e: crud.ConflictError):
+    return HTTPException(status_code=409, detail=str(e))
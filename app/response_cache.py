@@ -0,0 +1,193 @@
+from itertools import chain
+from pydantic import TypeAdapter
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from typing import List, Optional
+import os
+import threading
+from . import crud, crud_async, models, schemas
+from .cache import MISSING, TTLCache
+from .metrics import Counter
+
+# Read-through cache for entity reads, keyed by a per-entity generation. Writes
+# through the ORM bump the generation once committed, which orphans every cached
+# read of that entity; the TTL bounds staleness after changes made elsewhere.
+#   RESPONSE_CACHE=none    no caching (the default)
+#   RESPONSE_CACHE=memory  per-worker LRU with TTL
+#   RESPONSE_CACHE=redis   shared Redis (or compatible) server at RESPONSE_CACHE_URL
+RESPONSE_CACHE = os.getenv("RESPONSE_CACHE", "none")
+RESPONSE_CACHE_URL = os.getenv("RESPONSE_CACHE_URL", "redis://localhost:6379/0")
+RESPONSE_CACHE_SIZE = int(os.getenv("RESPONSE_CACHE_SIZE", "4096"))
+RESPONSE_CACHE_TTL = float(os.getenv("RESPONSE_CACHE_TTL", "300"))
+
+# Backends store serialized schema instances, so nothing mutable is shared between requests
+class MemoryBackend:
+    def __init__(self, maxsize: int, ttl: float):
+        self.ttl = ttl
+        self.entries = TTLCache(maxsize=maxsize, ttl=ttl)
+        self.generations = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str):
+        return self.entries.get(key)
+
+    def set(self, key: str, value: bytes):
+        self.entries.set(key, value)
+
+    def generation(self, entity: str):
+        return self.generations.get(entity, 0)
+
+    def bump(self, entity: str):
+        with self._lock:
+            self.generations[entity] = self.generations.get(entity, 0) + 1
+
+class RedisBackend:
+    def __init__(self, client, ttl: float, prefix: str = "kart:cache:"):
+        self.client = client
+        self.ttl = ttl
+        self.prefix = prefix
+
+    def get(self, key: str):
+        return self.client.get(self.prefix + key)
+
+    def set(self, key: str, value: bytes):
+        self.client.set(self.prefix + key, value, ex=max(int(self.ttl), 1))
+
+    def generation(self, entity: str):
+        return int(self.client.get(f"{self.prefix}generation:{entity}") or 0)
+
+    def bump(self, entity: str):
+        self.client.incr(f"{self.prefix}generation:{entity}")
+
+def create_backend(kind: str = RESPONSE_CACHE):
+    if kind == "none":
+        return None
+    if kind == "memory":
+        return MemoryBackend(RESPONSE_CACHE_SIZE, RESPONSE_CACHE_TTL)
+    if kind == "redis":
+        # Optional dependency, only needed for the shared backend
+        import redis
+        return RedisBackend(redis.Redis.from_url(RESPONSE_CACHE_URL), RESPONSE_CACHE_TTL)
+    raise ValueError(f"Unknown RESPONSE_CACHE '{kind}', expected none, memory or redis")
+
+backend = create_backend()
+
+# Per-entity lookup counters
+ENTITIES = {
+    models.Project: "projects",
+    models.Owner: "owners",
+    models.Cooperator: "cooperators",
+    models.Benefit: "benefits",
+    models.Address: "addresses",
+    models.Contact: "contacts",
+    models.Location: "locations",
+}
+
+hits = {entity: Counter() for entity in ENTITIES.values()}
+misses = {entity: Counter() for entity in ENTITIES.values()}
+invalidations = {entity: Counter() for entity in ENTITIES.values()}
+
+def get_stats():
+    stats = {"backend": type(backend).__name__ if backend else None, "entities": {}}
+    for entity in ENTITIES.values():
+        lookups = hits[entity].value + misses[entity].value
+        stats["entities"][entity] = {
+            "hits": hits[entity].value,
+            "misses": misses[entity].value,
+            "invalidations": invalidations[entity].value,
+            "hit_rate": hits[entity].value / lookups if lookups else 0.0,
+        }
+    return stats
+
+def cache_key(entity: str, name: str, args, kwargs):
+    return f"{entity}:{backend.generation(entity)}:{name}:{args!r}:{sorted(kwargs.items())!r}"
+
+def lookup(entity: str, adapter: TypeAdapter, key: str):
+    cached = backend.get(key)
+    if cached is None:
+        misses[entity].inc()
+        return MISSING
+    hits[entity].inc()
+    return adapter.validate_json(cached)
+
+def store(adapter: TypeAdapter, key: str, result):
+    value = adapter.validate_python(result, from_attributes=True)
+    backend.set(key, adapter.dump_json(value))
+    return value
+
+def cached_read(entity: str, schema, fetch, many: bool = False):
+    adapter = TypeAdapter(List[schema] if many else Optional[schema])
+
+    def read(db: Session, *args, **kwargs):
+        if backend is None:
+            return fetch(db, *args, **kwargs)
+        key = cache_key(entity, fetch.__name__, args, kwargs)
+        value = lookup(entity, adapter, key)
+        if value is MISSING:
+            value = store(adapter, key, fetch(db, *args, **kwargs))
+        return value
+    return read
+
+def cached_read_async(entity: str, schema, fetch, many: bool = False):
+    adapter = TypeAdapter(List[schema] if many else Optional[schema])
+
+    async def read(db, *args, **kwargs):
+        if backend is None:
+            return await fetch(db, *args, **kwargs)
+        key = cache_key(entity, fetch.__name__, args, kwargs)
+        value = lookup(entity, adapter, key)
+        if value is MISSING:
+            value = store(adapter, key, await fetch(db, *args, **kwargs))
+        return value
+    return read
+
+# Cached variants of the crud reads; they return schema instances instead of ORM objects
+get_project = cached_read("projects", schemas.Project, crud.get_project)
+get_projects = cached_read("projects", schemas.Project, crud.get_projects, many=True)
+get_owner = cached_read("owners", schemas.Owner, crud.get_owner)
+get_owners = cached_read("owners", schemas.Owner, crud.get_owners, many=True)
+get_cooperators = cached_read("cooperators", schemas.Cooperator, crud.get_cooperators, many=True)
+get_benefits = cached_read("benefits", schemas.Benefit, crud.get_benefits, many=True)
+get_addresses = cached_read("addresses", schemas.Address, crud.get_addresses, many=True)
+get_contacts = cached_read("contacts", schemas.Contact, crud.get_contacts, many=True)
+get_locations = cached_read("locations", schemas.Location, crud.get_locations, many=True)
+
+get_project_async = cached_read_async("projects", schemas.Project, crud_async.get_project)
+get_projects_async = cached_read_async("projects", schemas.Project, crud_async.get_projects, many=True)
+get_owner_async = cached_read_async("owners", schemas.Owner, crud_async.get_owner)
+get_owners_async = cached_read_async("owners", schemas.Owner, crud_async.get_owners, many=True)
+get_cooperators_async = cached_read_async("cooperators", schemas.Cooperator, crud_async.get_cooperators, many=True)
+get_benefits_async = cached_read_async("benefits", schemas.Benefit, crud_async.get_benefits, many=True)
+get_addresses_async = cached_read_async("addresses", schemas.Address, crud_async.get_addresses, many=True)
+get_contacts_async = cached_read_async("contacts", schemas.Contact, crud_async.get_contacts, many=True)
+get_locations_async = cached_read_async("locations", schemas.Location, crud_async.get_locations, many=True)
+
+# Written entities are noted on the session and their generation is bumped once the
+# commit succeeded, so a concurrent read cannot cache rows from before the commit.
+CHANGED_ENTITIES = "response_cache_changed"
+
+def note_changed(session: Session, entities):
+    session.info.setdefault(CHANGED_ENTITIES, set()).update(entities)
+
+@event.listens_for(Session, "after_flush")
+def note_flushed_entities(session, flush_context):
+    changed = {ENTITIES.get(type(obj)) for obj in chain(session.new, session.dirty, session.deleted)}
+    note_changed(session, changed - {None})
+
+@event.listens_for(Session, "do_orm_execute")
+def note_entity_statements(orm_execute_state):
+    # Bulk inserts, upserts and ORM-enabled UPDATE/DELETE statements
+    if orm_execute_state.is_select or orm_execute_state.bind_mapper is None:
+        return
+    entity = ENTITIES.get(orm_execute_state.bind_mapper.class_)
+    if entity is not None:
+        note_changed(orm_execute_state.session, {entity})
+
+@event.listens_for(Session, "after_commit")
+def invalidate_entities(session):
+    changed = session.info.pop(CHANGED_ENTITIES, ())
+    if backend is None:
+        return
+    for entity in changed:
+        backend.bump(entity)
+        invalidations[entity].inc()
@@ -1,7 +1,27 @@
-from pydantic import BaseModel, EmailStr, ConfigDict
-from typing import Optional, List
+from pydantic import BaseModel, EmailStr, ConfigDict, create_model, model_validator
+from sqlalchemy import inspect
+from typing import Any, Dict, Generic, Literal, Optional, List, TypeVar, Union, get_args
 from datetime import datetime
-from .models import ProjectStatus, ProjectSector, ProjectManagementLevel, UserRole
+from . import models
+from .models import AuditAction, ProjectStatus, ProjectSector, ProjectManagementLevel, UserRole
+
+T = TypeVar("T")
+
+# Pagination schemas
+class Page(BaseModel, Generic[T]):
+    items: List[T]
+    next_cursor: Optional[str] = None
+
+# Bulk schemas
+class BulkItemResult(BaseModel):
+    index: int
+    id: Optional[int] = None
+    error: Optional[str] = None
+
+class BulkResult(BaseModel):
+    created: int
+    failed: int
+    items: List[BulkItemResult]
 
 # User schemas
 class UserBase(BaseModel):
@@ -50,12 +70,83 @@ class ProjectUpdate(BaseModel):
     notes: Optional[str] = None
     managment_level: Optional[ProjectManagementLevel] = None
 
+class ProjectFilter(BaseModel):
+    status: Optional[List[ProjectStatus]] = None
+    sector: Optional[List[ProjectSector]] = None
+    managment_level: Optional[List[ProjectManagementLevel]] = None
+    start_year_min: Optional[int] = None
+    start_year_max: Optional[int] = None
+    end_year_min: Optional[int] = None
+    end_year_max: Optional[int] = None
+
 class Project(ProjectBase):
     id: int
     created_at: datetime
     updated_at: datetime
     model_config = ConfigDict(from_attributes=True)
 
+class ProjectSearchResult(Project):
+    rank: float
+
+class ProjectDetails(ProjectBase):
+    id: int
+    owners: Optional[str] = None
+    contacts: Optional[str] = None
+    locations: Optional[str] = None
+    cooperators: Optional[str] = None
+    benefits: Optional[str] = None
+    model_config = ConfigDict(from_attributes=True)
+
+# Statistics schemas
+class SectorStatistics(BaseModel):
+    sector: Optional[ProjectSector] = None
+    total_projects: int
+    active_projects: int
+    completed_projects: int
+    avg_duration_years: Optional[float] = None
+
+class ProjectStatistics(BaseModel):
+    sector: Optional[ProjectSector] = None
+    status: Optional[ProjectStatus] = None
+    total_projects: int
+    active_projects: int
+    completed_projects: int
+    earliest_start: Optional[int] = None
+    latest_start: Optional[int] = None
+
+class ManagementLevelStatistics(BaseModel):
+    managment_level: Optional[ProjectManagementLevel] = None
+    project_count: int
+    sectors_covered: int
+    sectors: List[ProjectSector]
+
+class LocationStatistics(BaseModel):
+    city: Optional[str] = None
+    county: Optional[str] = None
+    project_count: int
+    sectors: List[ProjectSector]
+    statuses: List[ProjectStatus]
+
+class OwnerStatistics(BaseModel):
+    owner_id: int
+    owner_name: Optional[str] = None
+    project_count: int
+    sectors_involved: int
+    sectors: List[ProjectSector]
+    statuses: List[ProjectStatus]
+
+# Audit schemas
+class AuditLogEntry(BaseModel):
+    id: int
+    table_name: str
+    record_id: int
+    action_type: AuditAction
+    changed_by: str
+    changed_at: datetime
+    old_values: Optional[Dict[str, Any]] = None
+    new_values: Optional[Dict[str, Any]] = None
+    model_config = ConfigDict(from_attributes=True)
+
 # Owner schemas
 class OwnerBase(BaseModel):
     name: str
@@ -133,4 +224,55 @@ class LocationCreate(LocationBase):
 
 class Location(LocationBase):
     id: int
-    model_config = ConfigDict(from_attributes=True) 
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True) 
+
+# Project schemas with nested relationships
+ProjectRelationship = Literal["owners", "contacts", "locations", "cooperators", "benefits"]
+PROJECT_RELATIONSHIPS = get_args(ProjectRelationship)
+
+class ProjectFull(Project):
+    owners: Optional[List[Owner]] = None
+    contacts: Optional[List[Contact]] = None
+    locations: Optional[List[Location]] = None
+    cooperators: Optional[List[Cooperator]] = None
+    benefits: Optional[List[Benefit]] = None
+
+    @model_validator(mode="before")
+    @classmethod
+    def skip_unloaded_relationships(cls, data):
+        # Relationships that were not eager-loaded stay unset instead of lazy loading
+        if isinstance(data, models.Project):
+            unloaded = inspect(data).unloaded
+            return {
+                name: getattr(data, name) for name in cls.model_fields
+                if name not in PROJECT_RELATIONSHIPS or name not in unloaded
+            }
+        return data
+
+# Project relationship link schemas
+class ProjectLink(BaseModel):
+    project_id: int
+    target_id: int
+
+class LinkResult(BaseModel):
+    linked: int
+    unlinked: int
+
+# Sparse fieldset schemas: `fields` responses hold any subset of the columns. They
+# do not read attributes, so ORM objects always validate against the full schema.
+def fields_model(model):
+    fields = {name: (Optional[field.annotation], None) for name, field in model.model_fields.items()}
+    return create_model(f"{model.__name__}Fields", **fields)
+
+ProjectFields = fields_model(Project)
+OwnerFields = fields_model(Owner)
+CooperatorFields = fields_model(Cooperator)
+BenefitFields = fields_model(Benefit)
+AddressFields = fields_model(Address)
+ContactFields = fields_model(Contact)
+LocationFields = fields_model(Location)
+
+def list_response(model, sparse_model):
+    # Full or sparse rows, as a plain list or a keyset page
+    return Union[List[model], Page[model], List[sparse_model], Page[sparse_model]]
+
@@ -0,0 +1,26 @@
+from fastapi import Response
+from pydantic import TypeAdapter
+from typing import Any
+import os
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Opt-in fast path for list endpoints: rows are read as plain column tuples and
+# encoded in one call, instead of building ORM objects and validating each one
+# against the response model.
+FAST_SERIALIZATION = os.getenv("FAST_SERIALIZATION", "false").lower() in ("1", "true", "yes")
+
+# Without orjson, pydantic-core encodes the whole payload in a single batch dump
+_ROWS_ADAPTER = TypeAdapter(Any)
+
+def dump_rows(content) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(content)
+    return _ROWS_ADAPTER.dump_json(content)
+
+def rows_response(content):
+    # Plain rows do not match the response model, so they bypass its validation
+    return Response(dump_rows(content), media_type="application/json")
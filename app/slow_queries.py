@@ -0,0 +1,129 @@
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from sqlalchemy import insert
+import logging
+import os
+import random
+import sys
+import threading
+from . import instrumentation
+
+logger = logging.getLogger("app.slow_queries")
+
+# Statements slower than SLOW_QUERY_MS are kept in a ring of the last SLOW_QUERY_BUFFER
+# entries and, with SLOW_QUERY_TABLE, also written to the slow_queries table. On
+# PostgreSQL a share SLOW_QUERY_EXPLAIN_RATE of them also records the planner's plan.
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "200"))
+SLOW_QUERY_BUFFER = int(os.getenv("SLOW_QUERY_BUFFER", "100"))
+SLOW_QUERY_EXPLAIN_RATE = float(os.getenv("SLOW_QUERY_EXPLAIN_RATE", "0.1"))
+SLOW_QUERY_TABLE = os.getenv("SLOW_QUERY_TABLE", "false").lower() in ("1", "true", "yes")
+
+recent = deque(maxlen=SLOW_QUERY_BUFFER)
+_recent_lock = threading.Lock()
+
+# A single writer keeps table inserts off the request path and in order
+table_writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="slow-query")
+
+def redact(value):
+    # Ids, limits and flags help reproduce a query; strings may hold personal data
+    if value is None or isinstance(value, (bool, int, float)):
+        return value
+    if isinstance(value, dict):
+        return {key: redact(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [redact(item) for item in value]
+    return f"<{type(value).__name__}>"
+
+def redact_parameters(parameters, executemany: bool):
+    if executemany:
+        return {"rows": len(parameters), "first": redact(parameters[0]) if parameters else None}
+    return redact(parameters)
+
+def query_source():
+    # Name of the outermost crud function on the stack, the one the route called
+    # rather than a shared helper like commit_unique; async reads run the
+    # statement in a separate greenlet and are not attributed
+    source = None
+    frame = sys._getframe(2)
+    while frame is not None:
+        module = frame.f_globals.get("__name__")
+        if module in ("app.crud", "app.crud_async"):
+            source = f"{module.rsplit('.', 1)[1]}.{frame.f_code.co_name}"
+        frame = frame.f_back
+    return source
+
+def explain(conn, statement: str, parameters):
+    # Runs on a separate cursor inside a savepoint, so a failing EXPLAIN neither
+    # disturbs the original result nor aborts the caller's transaction
+    cursor = conn.connection.cursor()
+    try:
+        cursor.execute("SAVEPOINT slow_query_explain")
+        try:
+            cursor.execute(f"EXPLAIN (ANALYZE off, FORMAT JSON) {statement}", parameters)
+            plan = cursor.fetchone()[0]
+        except Exception:
+            cursor.execute("ROLLBACK TO SAVEPOINT slow_query_explain")
+            raise
+        finally:
+            cursor.execute("RELEASE SAVEPOINT slow_query_explain")
+        return plan
+    finally:
+        cursor.close()
+
+def should_explain(conn, statement: str, executemany: bool):
+    return (
+        conn.dialect.name == "postgresql"
+        and not executemany
+        and statement.lstrip()[:6].upper() in ("SELECT", "WITH")
+        and random.random() < SLOW_QUERY_EXPLAIN_RATE
+    )
+
+def write_entry(entry: dict):
+    from .database import engine
+    from .models import SlowQuery
+
+    try:
+        with engine.connect() as connection:
+            connection = connection.execution_options(slow_query_log=False)
+            connection.execute(insert(SlowQuery), entry)
+            connection.commit()
+    except Exception:
+        logger.exception("Could not store slow query")
+
+def record(entry: dict):
+    with _recent_lock:
+        recent.append(entry)
+    logger.warning("Slow query (%.1f ms, %s): %s", entry["duration_ms"], entry["source"], entry["statement"])
+    if SLOW_QUERY_TABLE:
+        try:
+            table_writer.submit(write_entry, entry)
+        except RuntimeError:
+            # The writer is shut down while the interpreter exits
+            logger.warning("Slow query not stored, writer is shut down")
+
+def get_recent(limit: int = None):
+    with _recent_lock:
+        entries = list(recent)
+    entries.reverse()
+    return entries[:limit] if limit else entries
+
+@instrumentation.observe_queries
+def check_slow_query(conn, statement, parameters, executemany, elapsed):
+    duration_ms = elapsed * 1000
+    if duration_ms < SLOW_QUERY_MS or not conn.get_execution_options().get("slow_query_log", True):
+        return
+    plan = None
+    if should_explain(conn, statement, executemany):
+        try:
+            plan = explain(conn, statement, parameters)
+        except Exception:
+            logger.exception("EXPLAIN failed for slow query")
+    record({
+        "recorded_at": datetime.utcnow(),
+        "duration_ms": round(duration_ms, 3),
+        "statement": statement,
+        "parameters": redact_parameters(parameters, executemany),
+        "source": query_source(),
+        "plan": plan,
+    })
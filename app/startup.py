@@ -0,0 +1,43 @@
+from contextlib import contextmanager
+import logging
+import os
+import time
+
+logger = logging.getLogger("app.startup")
+
+# What a worker does with the schema on startup:
+#   create_all  create missing tables and seed the default users (the default)
+#   migrate     apply pending Alembic migrations
+#   none        nothing; run `python -m app.manage migrate` and `seed` once per deploy
+STARTUP_MODES = ("create_all", "migrate", "none")
+STARTUP_MODE = os.getenv("STARTUP_MODE", "create_all")
+
+# Seconds spent in each startup phase, logged and reported by /health
+startup_phases = {}
+
+def record_phase(name: str, seconds: float):
+    startup_phases[name] = round(seconds, 4)
+    logger.info("Startup phase %s took %.1f ms", name, seconds * 1000)
+
+@contextmanager
+def phase(name: str):
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_phase(name, time.perf_counter() - started)
+
+def prepare_database(mode: str = STARTUP_MODE):
+    if mode not in STARTUP_MODES:
+        raise ValueError(f"Unknown STARTUP_MODE '{mode}', expected one of {', '.join(STARTUP_MODES)}")
+    if mode == "create_all":
+        from .database import create_schema, seed_default_users
+        with phase("create_schema"):
+            create_schema()
+        with phase("seed_default_users"):
+            seed_default_users()
+    elif mode == "migrate":
+        # Alembic is only imported when migrations run
+        from .manage import migrate
+        with phase("migrate"):
+            migrate()
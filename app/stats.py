@@ -0,0 +1,83 @@
+import hashlib
+import os
+from itertools import chain
+from sqlalchemy import event, func, select
+from sqlalchemy.orm import Session
+from . import crud, models
+from .cache import TTLCache
+
+# Statistics cache; writes through the ORM invalidate it, the TTL bounds staleness
+# after changes made outside the application
+STATS_CACHE_TTL = float(os.getenv("STATS_CACHE_TTL", "60"))
+
+stats_cache = TTLCache(maxsize=64, ttl=STATS_CACHE_TTL)
+
+PROJECTS_CHANGED = "stats_projects_changed"
+
+def get_sector_statistics(db: Session):
+    statistics = stats_cache.get("sectors")
+    if statistics is None:
+        statistics = crud.get_sector_statistics(db)
+        stats_cache.set("sectors", statistics)
+    return statistics
+
+# Statistics views are versioned by a cheap fingerprint of the tables they read.
+# It is a heuristic, not a hash of the rows: updated_at is set by the writer before
+# it commits, so a write that commits after a newer one can go unnoticed until the
+# next change. project_details_summary, refreshed whenever links or linked names
+# change, is counted by triggers in table_versions instead, which cannot miss one.
+TABLE_FINGERPRINTS = {
+    "projects": (
+        func.count(models.Project.id), func.max(models.Project.id), func.max(models.Project.updated_at)
+    ),
+    "project_details_summary": (
+        select(models.TableVersion.version)
+        .where(models.TableVersion.table_name == models.ProjectDetailsSummary.__tablename__)
+        .scalar_subquery(),
+    ),
+}
+
+VIEW_SOURCES = {
+    "project_statistics": ("projects",),
+    "management_level_projects": ("projects",),
+    "location_projects": ("projects", "project_details_summary"),
+    "owner_projects": ("projects", "project_details_summary"),
+}
+
+def view_etag(db: Session, view: str):
+    columns = [select(expression).scalar_subquery() for table in VIEW_SOURCES[view] for expression in TABLE_FINGERPRINTS[table]]
+    fingerprint = tuple(db.execute(select(*columns)).one())
+    return '"' + hashlib.sha1(repr((view, fingerprint)).encode()).hexdigest() + '"'
+
+def etag_matches(if_none_match: str, etag: str):
+    if not if_none_match:
+        return False
+    # If-None-Match uses the weak comparison
+    return any(tag.strip() in ("*", etag, "W/" + etag) for tag in if_none_match.split(","))
+
+def get_view_statistics(db: Session, view: str, etag: str, fetch):
+    statistics = stats_cache.get((view, etag))
+    if statistics is None:
+        statistics = fetch(db)
+        stats_cache.set((view, etag), statistics)
+    return statistics
+
+# Project writes are noted on the session and the cache is cleared once they are
+# committed, so a concurrent read cannot cache rows from before the commit. A flag
+# left behind by a rollback only costs one extra recomputation.
+@event.listens_for(Session, "after_flush")
+def note_flushed_projects(session, flush_context):
+    if any(isinstance(obj, models.Project) for obj in chain(session.new, session.dirty, session.deleted)):
+        session.info[PROJECTS_CHANGED] = True
+
+@event.listens_for(Session, "do_orm_execute")
+def note_project_statements(orm_execute_state):
+    if orm_execute_state.is_select:
+        return
+    if orm_execute_state.bind_mapper is models.Project.__mapper__:
+        orm_execute_state.session.info[PROJECTS_CHANGED] = True
+
+@event.listens_for(Session, "after_commit")
+def invalidate_statistics(session):
+    if session.info.pop(PROJECTS_CHANGED, False):
+        stats_cache.clear()
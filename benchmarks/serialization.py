@@ -0,0 +1,70 @@
+import argparse
+import os
+import time
+
+# Benchmark for the FAST_SERIALIZATION list path: rows/sec served by GET /projects/
+# and GET /owners/ with the response models, with orjson and with the pydantic fallback.
+# Run from the repository root: python -m benchmarks.serialization [--rows N]
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app import models, serialization
+from app.auth import get_current_user
+from app.database import Base, get_db
+from app.main import app
+
+engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+SessionLocal = sessionmaker(bind=engine)
+
+def seed(rows: int):
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as connection:
+        connection.execute(insert(models.Project), [
+            {"title": f"Project {i}", "description": "Description " * 20, "notes": "Notes " * 10,
+             "start_year": 2000 + i % 25, "sector": "IT", "managment_level": "LOCAL"}
+            for i in range(rows)
+        ])
+        connection.execute(insert(models.Owner), [
+            {"name": f"Owner {i}", "description": "Description " * 5} for i in range(rows)
+        ])
+
+def get_session():
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+def rows_per_second(client: TestClient, path: str, limit: int, repeat: int):
+    client.get(path, params={"limit": limit})
+    started = time.perf_counter()
+    for _ in range(repeat):
+        rows = len(client.get(path, params={"limit": limit}).json())
+    return rows * repeat / (time.perf_counter() - started)
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    seed(args.rows)
+    app.dependency_overrides[get_db] = get_session
+    app.dependency_overrides[get_current_user] = lambda: models.User(id=1, username="bench", role="ADMIN")
+    orjson = serialization.orjson
+    modes = [("response model", False, orjson), ("fast, pydantic", True, None)]
+    if orjson is not None:
+        modes.insert(1, ("fast, orjson", True, orjson))
+    client = TestClient(app)
+    for path in ("/projects/", "/owners/"):
+        for name, fast, encoder in modes:
+            serialization.FAST_SERIALIZATION, serialization.orjson = fast, encoder
+            rate = rows_per_second(client, path, args.rows, args.repeat)
+            print(f"{path:12} {name:16} {rate:12,.0f} rows/s")
+
+if __name__ == "__main__":
+    main()
@@ -15,6 +15,7 @@ psql -v ON_ERROR_STOP=1 -U kart_admin -d kart_database -f /sql/roles/01_roles.sq
 psql -v ON_ERROR_STOP=1 -U kart_admin -d kart_database -f /sql/indexes/01_indexes.sql
 psql -v ON_ERROR_STOP=1 -U kart_admin -d kart_database -f /sql/functions/01_functions.sql
 psql -v ON_ERROR_STOP=1 -U kart_admin -d kart_database -f /sql/triggers/01_triggers.sql
+psql -v ON_ERROR_STOP=1 -U kart_admin -d kart_database -f /sql/triggers/02_project_details.sql
 psql -v ON_ERROR_STOP=1 -U kart_admin -d kart_database -f /sql/views/01_views.sql
 psql -v ON_ERROR_STOP=1 -U kart_admin -d kart_database -f /sql/backup/01_backup.sql
 
@@ -46,7 +46,8 @@ BEGIN
 END;
 $$ LANGUAGE plpgsql;
 
--- Function to get project statistics by sector
+-- Function to get project statistics by sector. Duration is computed inline so
+-- the whole result is a single aggregate over projects.
 CREATE OR REPLACE FUNCTION get_sector_statistics()
 RETURNS TABLE (
     sector project_sector,
@@ -55,20 +56,17 @@ RETURNS TABLE (
     completed_projects INTEGER,
     avg_duration_years NUMERIC
 ) AS $$
-BEGIN
-    RETURN QUERY
     SELECT 
         p.sector,
-        COUNT(*) as total_projects,
-        COUNT(CASE WHEN p.status = 'IN_PROGRESS' THEN 1 END) as active_projects,
-        COUNT(CASE WHEN p.status = 'COMPLETED' THEN 1 END) as completed_projects,
-        ROUND(AVG(get_project_duration(p.id)), 1) as avg_duration_years
+        COUNT(*)::INTEGER as total_projects,
+        COUNT(*) FILTER (WHERE p.status = 'IN_PROGRESS')::INTEGER as active_projects,
+        COUNT(*) FILTER (WHERE p.status = 'COMPLETED')::INTEGER as completed_projects,
+        ROUND(AVG(COALESCE(p.end_year, EXTRACT(YEAR FROM CURRENT_DATE)::INTEGER) - p.start_year), 1) as avg_duration_years
     FROM projects p
     GROUP BY p.sector;
-END;
-$$ LANGUAGE plpgsql;
+$$ LANGUAGE sql STABLE;
 
--- Function to search projects by text
+-- Function to search projects by text, best matches first
 CREATE OR REPLACE FUNCTION search_projects(search_text TEXT)
 RETURNS TABLE (
     project_id INTEGER,
@@ -77,7 +75,8 @@ RETURNS TABLE (
     sector project_sector,
     start_year INTEGER,
     description TEXT,
-    notes TEXT
+    notes TEXT,
+    rank REAL
 ) AS $$
 BEGIN
     RETURN QUERY
@@ -88,12 +87,11 @@ BEGIN
         p.sector,
         p.start_year,
         p.description,
-        p.notes
-    FROM projects p
-    WHERE 
-        to_tsvector('english', COALESCE(p.title, '') || ' ' || 
-                             COALESCE(p.description, '') || ' ' || 
-                             COALESCE(p.notes, '')) @@ plainto_tsquery('english', search_text);
+        p.notes,
+        ts_rank(p.search_vector, query) as rank
+    FROM projects p, plainto_tsquery('english', search_text) query
+    WHERE p.search_vector @@ query
+    ORDER BY ts_rank(p.search_vector, query) DESC, p.id;
 END;
 $$ LANGUAGE plpgsql;
 
@@ -208,4 +206,70 @@ BEGIN
     FROM projects
     GROUP BY EXTRACT(YEAR FROM CURRENT_DATE);
 END;
-$$ LANGUAGE plpgsql; 
\ No newline at end of file
+$$ LANGUAGE plpgsql; 
+
+-- Function to create the audit_log partition for the month containing partition_month
+CREATE OR REPLACE FUNCTION create_audit_log_partition(partition_month DATE)
+RETURNS TEXT AS $$
+DECLARE
+    month_start DATE := date_trunc('month', partition_month)::DATE;
+    partition_name TEXT := 'audit_log_p' || to_char(partition_month, 'YYYYMM');
+BEGIN
+    IF to_regclass(partition_name) IS NULL THEN
+        EXECUTE format(
+            'CREATE TABLE %I PARTITION OF audit_log FOR VALUES FROM (%L) TO (%L)',
+            partition_name, month_start, (month_start + INTERVAL '1 month')::DATE
+        );
+    END IF;
+    RETURN partition_name;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Function to keep audit_log partitions ahead of time and enforce retention.
+-- Partitions that end before the retention window are detached, and dropped
+-- unless drop_expired is false (e.g. to archive them first). Meant to be run
+-- daily, for example with pg_cron:
+--   SELECT cron.schedule('audit-log-partitions', '0 3 * * *', 'SELECT maintain_audit_log_partitions()');
+CREATE OR REPLACE FUNCTION maintain_audit_log_partitions(
+    months_ahead INTEGER DEFAULT 3,
+    retention_months INTEGER DEFAULT 12,
+    drop_expired BOOLEAN DEFAULT TRUE
+)
+RETURNS TABLE (
+    partition_name TEXT,
+    action TEXT
+) AS $$
+DECLARE
+    current_month DATE := date_trunc('month', CURRENT_DATE)::DATE;
+    retention_start DATE := (date_trunc('month', CURRENT_DATE) - make_interval(months => retention_months))::DATE;
+    partition_record RECORD;
+BEGIN
+    FOR month_offset IN 0..months_ahead LOOP
+        partition_name := create_audit_log_partition((current_month + make_interval(months => month_offset))::DATE);
+        action := 'ensured';
+        RETURN NEXT;
+    END LOOP;
+
+    FOR partition_record IN
+        SELECT c.relname
+        FROM pg_inherits i
+        JOIN pg_class c ON c.oid = i.inhrelid
+        WHERE i.inhparent = 'audit_log'::regclass
+        AND c.relname ~ '^audit_log_p[0-9]{6}$'
+        AND to_date(right(c.relname, 6), 'YYYYMM') + INTERVAL '1 month' <= retention_start
+    LOOP
+        EXECUTE format('ALTER TABLE audit_log DETACH PARTITION %I', partition_record.relname);
+        partition_name := partition_record.relname;
+        IF drop_expired THEN
+            EXECUTE format('DROP TABLE %I', partition_record.relname);
+            action := 'dropped';
+        ELSE
+            action := 'detached';
+        END IF;
+        RETURN NEXT;
+    END LOOP;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Create the current and upcoming audit_log partitions
+SELECT * FROM maintain_audit_log_partitions();
@@ -26,29 +26,23 @@ CREATE INDEX idx_projects_cooperators_cooperator_id ON projects_cooperators(coop
 CREATE INDEX idx_projects_benefits_project_id ON projects_benefits(project_id);
 CREATE INDEX idx_projects_benefits_benefit_id ON projects_benefits(benefit_id);
 
--- Indexes for owners table
-CREATE INDEX idx_owners_name ON owners(name);
+-- owners.name, cooperators.name and benefits.name are indexed by their UNIQUE
+-- constraints, which upserts use as conflict targets
 
 -- Indexes for contacts table
 CREATE INDEX idx_contacts_name ON contacts(name);
 CREATE INDEX idx_contacts_email ON contacts(email);
 
--- Indexes for cooperators table
-CREATE INDEX idx_cooperators_name ON cooperators(name);
-
--- Indexes for benefits table
-CREATE INDEX idx_benefits_name ON benefits(name);
-
 -- Indexes for addresses table
 CREATE INDEX idx_addresses_city ON addresses(city);
 CREATE INDEX idx_addresses_county ON addresses(county);
 CREATE INDEX idx_addresses_postal_code ON addresses(postal_code);
 
--- Indexes for audit log
-CREATE INDEX idx_audit_log_table_name ON audit_log(table_name);
-CREATE INDEX idx_audit_log_record_id ON audit_log(record_id);
-CREATE INDEX idx_audit_log_action_type ON audit_log(action_type);
-CREATE INDEX idx_audit_log_changed_at ON audit_log(changed_at);
+-- Indexes for audit log, created on every partition. Rows arrive in changed_at
+-- order, so a BRIN index covers time ranges at a fraction of a B-tree's size.
+CREATE INDEX idx_audit_log_record ON audit_log(table_name, record_id);
+CREATE INDEX idx_audit_log_changed_at ON audit_log USING brin(changed_at);
+CREATE INDEX idx_slow_queries_recorded_at ON slow_queries USING brin(recorded_at);
 
 -- Composite indexes for common query patterns
 CREATE INDEX idx_projects_status_sector ON projects(status, sector);
@@ -57,6 +51,5 @@ CREATE INDEX idx_projects_management_status ON projects(managment_level, status)
 CREATE INDEX idx_projects_sector_status_year ON projects(sector, status, start_year);
 
 -- Full text search indexes
-CREATE INDEX idx_projects_description_fts ON projects USING gin(to_tsvector('english', description));
-CREATE INDEX idx_projects_notes_fts ON projects USING gin(to_tsvector('english', notes));
+CREATE INDEX idx_projects_search_vector ON projects USING gin(search_vector);
 CREATE INDEX idx_benefits_description_fts ON benefits USING gin(to_tsvector('english', description)); 
\ No newline at end of file
@@ -1,13 +1,32 @@
--- Create audit log table for tracking changes
+-- Create audit log table for tracking changes, range partitioned by month on
+-- changed_at. Partitions are created ahead of time and dropped after the
+-- retention period by maintain_audit_log_partitions(); the primary key has to
+-- include the partition key.
 CREATE TABLE audit_log (
-    id BIGSERIAL PRIMARY KEY,
+    id BIGSERIAL,
     table_name VARCHAR(64) NOT NULL,
     record_id INTEGER NOT NULL,
     action_type audit_action NOT NULL,
     changed_by VARCHAR(255) NOT NULL,
-    changed_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    changed_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP,
     old_values JSONB,
-    new_values JSONB
+    new_values JSONB,
+    PRIMARY KEY (id, changed_at)
+) PARTITION BY RANGE (changed_at);
+
+-- Catches rows outside the pre-created months so audited writes never fail. It
+-- should stay empty: a month cannot be partitioned once it has rows in here.
+CREATE TABLE audit_log_default PARTITION OF audit_log DEFAULT;
+
+-- Statements slower than SLOW_QUERY_MS, written by the API when SLOW_QUERY_TABLE is set
+CREATE TABLE slow_queries (
+    id BIGSERIAL PRIMARY KEY,
+    recorded_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    duration_ms DOUBLE PRECISION NOT NULL,
+    statement TEXT NOT NULL,
+    parameters JSONB,
+    source VARCHAR(255),
+    plan JSONB
 );
 
 CREATE TABLE users (
@@ -15,7 +34,8 @@ CREATE TABLE users (
     email VARCHAR(255) NOT NULL UNIQUE,
     username VARCHAR(255) NOT NULL UNIQUE,
     hashed_password VARCHAR(255) NOT NULL,
-    role role NOT NULL
+    role role NOT NULL,
+    token_version INTEGER NOT NULL DEFAULT 0
 );
 
 -- Table for Addresses
@@ -37,7 +57,7 @@ CREATE TABLE contacts (
 
 CREATE TABLE owners (
     id SERIAL PRIMARY KEY,
-    name VARCHAR(255) NOT NULL,
+    name VARCHAR(255) NOT NULL UNIQUE,
     description TEXT,
     created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
@@ -45,12 +65,12 @@ CREATE TABLE owners (
 
 CREATE TABLE cooperators (
     id SERIAL PRIMARY KEY,
-    name VARCHAR(255) NOT NULL
+    name VARCHAR(255) NOT NULL UNIQUE
 );
 
 CREATE TABLE benefits (
     id SERIAL PRIMARY KEY,
-    name VARCHAR(255) NOT NULL,
+    name VARCHAR(255) NOT NULL UNIQUE,
     description TEXT,
     created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
@@ -66,7 +86,7 @@ CREATE TABLE locations (
 -- Main Projects table
 CREATE TABLE projects (
     id SERIAL PRIMARY KEY,
-    title VARCHAR(255) NOT NULL UNIQUE,
+    title VARCHAR(255) NOT NULL,
     description TEXT,
     status project_status NOT NULL DEFAULT 'DRAFT',
     start_year INTEGER NOT NULL,
@@ -76,7 +96,15 @@ CREATE TABLE projects (
     notes TEXT,
     managment_level project_management_level NOT NULL,
     created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
-    updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    -- Weighted full text document, kept in sync by PostgreSQL
+    search_vector tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', COALESCE(title, '')), 'A') ||
+        setweight(to_tsvector('english', COALESCE(description, '')), 'B') ||
+        setweight(to_tsvector('english', COALESCE(notes, '')), 'C')
+    ) STORED,
+    -- Titles only have to be unique within a sector; enforced by the index
+    CONSTRAINT uq_projects_sector_title UNIQUE (sector, title)
 );
 
 CREATE TABLE projects_owners (
@@ -117,4 +145,22 @@ CREATE TABLE projects_benefits (
     PRIMARY KEY (project_id, benefit_id),
     FOREIGN KEY (project_id) REFERENCES projects(id),
     FOREIGN KEY (benefit_id) REFERENCES benefits(id)
-);
\ No newline at end of file
+);
+
+-- Aggregated relationship names per project, refreshed by triggers for the
+-- projects whose links change; read through the project_details view
+CREATE TABLE project_details_summary (
+    project_id INTEGER PRIMARY KEY REFERENCES projects(id) ON DELETE CASCADE,
+    owners TEXT,
+    contacts TEXT,
+    locations TEXT,
+    cooperators TEXT,
+    benefits TEXT,
+    refreshed_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Change counters, bumped by triggers and read by the statistics ETags
+CREATE TABLE table_versions (
+    table_name VARCHAR(63) PRIMARY KEY,
+    version BIGINT NOT NULL
+);
@@ -55,12 +55,13 @@ BEGIN
     SELECT EXISTS (
         SELECT FROM pg_trigger 
         WHERE tgname IN (
-            'audit_projects',
+            'audit_projects_insert',
+            'audit_projects_update',
+            'audit_projects_delete',
             'validate_project_dates_trigger',
             'validate_email_format_trigger',
             'prevent_active_project_deletion_trigger',
-            'update_project_status_trigger',
-            'validate_unique_project_title_trigger'
+            'update_project_status_trigger'
         )
     ) INTO test_result;
 
@@ -224,7 +225,7 @@ BEGIN
         RAISE NOTICE 'Test 13 PASSED: Project creation with invalid sector was prevented';
     END;
 
-    -- Test 14: Test project title uniqueness
+    -- Test 14: Test project title uniqueness within a sector
     BEGIN
         INSERT INTO projects (
             title, description, status, start_year, sector, managment_level
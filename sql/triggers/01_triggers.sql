@@ -1,4 +1,6 @@
--- Function to handle audit logging
+-- Function to handle audit logging. Runs once per statement and writes every
+-- affected row with a single INSERT ... SELECT from the transition tables; UPDATEs
+-- only record the columns whose values changed.
 CREATE OR REPLACE FUNCTION audit_log_changes()
 RETURNS TRIGGER AS $$
 BEGIN
@@ -9,14 +11,9 @@ BEGIN
             action_type,
             changed_by,
             old_values
-        ) VALUES (
-            TG_TABLE_NAME,
-            OLD.id,
-            'DELETE',
-            current_user,
-            row_to_json(OLD)
-        );
-        RETURN OLD;
+        )
+        SELECT TG_TABLE_NAME, o.id, 'DELETE', current_user, to_jsonb(o) - 'search_vector'
+        FROM old_rows o;
     ELSIF TG_OP = 'UPDATE' THEN
         INSERT INTO audit_log (
             table_name,
@@ -25,15 +22,20 @@ BEGIN
             changed_by,
             old_values,
             new_values
-        ) VALUES (
-            TG_TABLE_NAME,
-            NEW.id,
-            'UPDATE',
-            current_user,
-            row_to_json(OLD),
-            row_to_json(NEW)
-        );
-        RETURN NEW;
+        )
+        SELECT TG_TABLE_NAME, n.id, 'UPDATE', current_user, changes.old_values, changes.new_values
+        FROM new_rows n
+        JOIN old_rows o ON o.id = n.id
+        CROSS JOIN LATERAL (
+            SELECT
+                jsonb_object_agg(old_column.key, old_column.value) AS old_values,
+                jsonb_object_agg(new_column.key, new_column.value) AS new_values
+            FROM jsonb_each(to_jsonb(n)) new_column
+            JOIN jsonb_each(to_jsonb(o)) old_column ON old_column.key = new_column.key
+            WHERE new_column.value IS DISTINCT FROM old_column.value
+            AND new_column.key NOT IN ('updated_at', 'search_vector')
+        ) changes
+        WHERE changes.new_values IS NOT NULL;
     ELSIF TG_OP = 'INSERT' THEN
         INSERT INTO audit_log (
             table_name,
@@ -41,14 +43,9 @@ BEGIN
             action_type,
             changed_by,
             new_values
-        ) VALUES (
-            TG_TABLE_NAME,
-            NEW.id,
-            'INSERT',
-            current_user,
-            row_to_json(NEW)
-        );
-        RETURN NEW;
+        )
+        SELECT TG_TABLE_NAME, n.id, 'INSERT', current_user, to_jsonb(n) - 'search_vector'
+        FROM new_rows n;
     END IF;
     RETURN NULL;
 END;
@@ -87,20 +84,60 @@ BEGIN
 END;
 $$ LANGUAGE plpgsql;
 
--- Create triggers for audit logging
-CREATE TRIGGER audit_projects
-    AFTER INSERT OR UPDATE OR DELETE ON projects
-    FOR EACH ROW
+-- Create statement-level triggers for audit logging; transition tables need
+-- one trigger per event
+CREATE TRIGGER audit_projects_insert
+    AFTER INSERT ON projects
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT
     EXECUTE FUNCTION audit_log_changes();
 
-CREATE TRIGGER audit_owners
-    AFTER INSERT OR UPDATE OR DELETE ON owners
-    FOR EACH ROW
+CREATE TRIGGER audit_projects_update
+    AFTER UPDATE ON projects
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT
     EXECUTE FUNCTION audit_log_changes();
 
-CREATE TRIGGER audit_contacts
-    AFTER INSERT OR UPDATE OR DELETE ON contacts
-    FOR EACH ROW
+CREATE TRIGGER audit_projects_delete
+    AFTER DELETE ON projects
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION audit_log_changes();
+
+CREATE TRIGGER audit_owners_insert
+    AFTER INSERT ON owners
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION audit_log_changes();
+
+CREATE TRIGGER audit_owners_update
+    AFTER UPDATE ON owners
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION audit_log_changes();
+
+CREATE TRIGGER audit_owners_delete
+    AFTER DELETE ON owners
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION audit_log_changes();
+
+CREATE TRIGGER audit_contacts_insert
+    AFTER INSERT ON contacts
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION audit_log_changes();
+
+CREATE TRIGGER audit_contacts_update
+    AFTER UPDATE ON contacts
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION audit_log_changes();
+
+CREATE TRIGGER audit_contacts_delete
+    AFTER DELETE ON contacts
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT
     EXECUTE FUNCTION audit_log_changes();
 
 -- Create trigger for project date validation
@@ -139,25 +176,3 @@ CREATE TRIGGER update_project_status_trigger
     BEFORE INSERT OR UPDATE ON projects
     FOR EACH ROW
     EXECUTE FUNCTION update_project_status();
-
--- Function to ensure unique project titles within the same sector
-CREATE OR REPLACE FUNCTION validate_unique_project_title()
-RETURNS TRIGGER AS $$
-BEGIN
-    IF EXISTS (
-        SELECT 1 FROM projects 
-        WHERE title = NEW.title 
-        AND sector = NEW.sector 
-        AND id != NEW.id
-    ) THEN
-        RAISE EXCEPTION 'Project title must be unique within the same sector';
-    END IF;
-    RETURN NEW;
-END;
-$$ LANGUAGE plpgsql;
-
--- Create trigger for unique project titles
-CREATE TRIGGER validate_unique_project_title_trigger
-    BEFORE INSERT OR UPDATE ON projects
-    FOR EACH ROW
-    EXECUTE FUNCTION validate_unique_project_title(); 
\ No newline at end of file
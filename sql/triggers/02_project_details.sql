@@ -0,0 +1,258 @@
+-- project_details_summary maintenance for PostgreSQL: the refresh function, the
+-- trigger functions and the statement-level triggers on the junction and entity
+-- tables, and the change counter of the summary itself. This file is the only
+-- copy; init-db.sh runs it after 01_triggers.sql and app.models runs it when
+-- create_all creates project_details_summary, not on later create_all calls. It
+-- can be run again on an existing database. Needs PostgreSQL 11+ (transition
+-- tables, EXECUTE FUNCTION).
+
+-- Function to recompute the project_details_summary rows of the given projects.
+-- Each aggregate is its own correlated subquery, so links are never multiplied
+-- against each other.
+CREATE OR REPLACE FUNCTION refresh_project_details_summary(project_ids INTEGER[])
+RETURNS VOID AS $$
+BEGIN
+    IF cardinality(project_ids) > 0 THEN
+        INSERT INTO project_details_summary (
+            project_id, owners, contacts, locations, cooperators, benefits, refreshed_at
+        )
+        SELECT
+            p.id,
+            (SELECT string_agg(DISTINCT o.name, ', ')
+                FROM projects_owners po JOIN owners o ON po.owner_id = o.id
+                WHERE po.project_id = p.id),
+            (SELECT string_agg(DISTINCT c.name, ', ')
+                FROM projects_contacts pc JOIN contacts c ON pc.contact_id = c.id
+                WHERE pc.project_id = p.id),
+            (SELECT string_agg(DISTINCT a.city || ', ' || a.county, '; ')
+                FROM projects_locations pl
+                JOIN locations l ON pl.location_id = l.id
+                JOIN addresses a ON l.address_id = a.id
+                WHERE pl.project_id = p.id),
+            (SELECT string_agg(DISTINCT co.name, ', ')
+                FROM projects_cooperators pco JOIN cooperators co ON pco.cooperator_id = co.id
+                WHERE pco.project_id = p.id),
+            (SELECT string_agg(DISTINCT b.name, ', ')
+                FROM projects_benefits pb JOIN benefits b ON pb.benefit_id = b.id
+                WHERE pb.project_id = p.id),
+            CURRENT_TIMESTAMP
+        FROM projects p
+        WHERE p.id = ANY(project_ids)
+        ON CONFLICT (project_id) DO UPDATE SET
+            owners = EXCLUDED.owners,
+            contacts = EXCLUDED.contacts,
+            locations = EXCLUDED.locations,
+            cooperators = EXCLUDED.cooperators,
+            benefits = EXCLUDED.benefits,
+            refreshed_at = EXCLUDED.refreshed_at;
+    END IF;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Function to refresh project details for the projects whose links changed
+CREATE OR REPLACE FUNCTION refresh_project_details_from_links()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        PERFORM refresh_project_details_summary(ARRAY(SELECT DISTINCT project_id FROM new_rows));
+    ELSE
+        PERFORM refresh_project_details_summary(ARRAY(SELECT DISTINCT project_id FROM old_rows));
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Function to refresh project details when a linked entity is renamed or moved
+CREATE OR REPLACE FUNCTION refresh_project_details_from_entities()
+RETURNS TRIGGER AS $$
+DECLARE
+    project_ids INTEGER[];
+BEGIN
+    CASE TG_TABLE_NAME
+    WHEN 'owners' THEN
+        project_ids := ARRAY(
+            SELECT po.project_id FROM projects_owners po
+            JOIN new_rows n ON po.owner_id = n.id JOIN old_rows o ON n.id = o.id
+            WHERE n.name IS DISTINCT FROM o.name
+        );
+    WHEN 'contacts' THEN
+        project_ids := ARRAY(
+            SELECT pc.project_id FROM projects_contacts pc
+            JOIN new_rows n ON pc.contact_id = n.id JOIN old_rows o ON n.id = o.id
+            WHERE n.name IS DISTINCT FROM o.name
+        );
+    WHEN 'cooperators' THEN
+        project_ids := ARRAY(
+            SELECT pco.project_id FROM projects_cooperators pco
+            JOIN new_rows n ON pco.cooperator_id = n.id JOIN old_rows o ON n.id = o.id
+            WHERE n.name IS DISTINCT FROM o.name
+        );
+    WHEN 'benefits' THEN
+        project_ids := ARRAY(
+            SELECT pb.project_id FROM projects_benefits pb
+            JOIN new_rows n ON pb.benefit_id = n.id JOIN old_rows o ON n.id = o.id
+            WHERE n.name IS DISTINCT FROM o.name
+        );
+    WHEN 'locations' THEN
+        project_ids := ARRAY(
+            SELECT pl.project_id FROM projects_locations pl
+            JOIN new_rows n ON pl.location_id = n.id JOIN old_rows o ON n.id = o.id
+            WHERE n.address_id IS DISTINCT FROM o.address_id
+        );
+    WHEN 'addresses' THEN
+        project_ids := ARRAY(
+            SELECT pl.project_id FROM projects_locations pl
+            JOIN locations l ON pl.location_id = l.id
+            JOIN new_rows n ON l.address_id = n.id JOIN old_rows o ON n.id = o.id
+            WHERE n.city IS DISTINCT FROM o.city OR n.county IS DISTINCT FROM o.county
+        );
+    END CASE;
+    PERFORM refresh_project_details_summary(ARRAY(SELECT DISTINCT unnest(project_ids)));
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Create statement-level triggers to keep project_details_summary up to date.
+-- Transition tables hand over every affected row at once, so a bulk link or
+-- rename refreshes each project a single time.
+DROP TRIGGER IF EXISTS refresh_project_details_projects_owners_insert ON projects_owners;
+CREATE TRIGGER refresh_project_details_projects_owners_insert
+    AFTER INSERT ON projects_owners
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION refresh_project_details_from_links();
+
+DROP TRIGGER IF EXISTS refresh_project_details_projects_owners_delete ON projects_owners;
+CREATE TRIGGER refresh_project_details_projects_owners_delete
+    AFTER DELETE ON projects_owners
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION refresh_project_details_from_links();
+
+DROP TRIGGER IF EXISTS refresh_project_details_projects_contacts_insert ON projects_contacts;
+CREATE TRIGGER refresh_project_details_projects_contacts_insert
+    AFTER INSERT ON projects_contacts
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION refresh_project_details_from_links();
+
+DROP TRIGGER IF EXISTS refresh_project_details_projects_contacts_delete ON projects_contacts;
+CREATE TRIGGER refresh_project_details_projects_contacts_delete
+    AFTER DELETE ON projects_contacts
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION refresh_project_details_from_links();
+
+DROP TRIGGER IF EXISTS refresh_project_details_projects_locations_insert ON projects_locations;
+CREATE TRIGGER refresh_project_details_projects_locations_insert
+    AFTER INSERT ON projects_locations
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION refresh_project_details_from_links();
+
+DROP TRIGGER IF EXISTS refresh_project_details_projects_locations_delete ON projects_locations;
+CREATE TRIGGER refresh_project_details_projects_locations_delete
+    AFTER DELETE ON projects_locations
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION refresh_project_details_from_links();
+
+DROP TRIGGER IF EXISTS refresh_project_details_projects_cooperators_insert ON projects_cooperators;
+CREATE TRIGGER refresh_project_details_projects_cooperators_insert
+    AFTER INSERT ON projects_cooperators
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION refresh_project_details_from_links();
+
+DROP TRIGGER IF EXISTS refresh_project_details_projects_cooperators_delete ON projects_cooperators;
+CREATE TRIGGER refresh_project_details_projects_cooperators_delete
+    AFTER DELETE ON projects_cooperators
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION refresh_project_details_from_links();
+
+DROP TRIGGER IF EXISTS refresh_project_details_projects_benefits_insert ON projects_benefits;
+CREATE TRIGGER refresh_project_details_projects_benefits_insert
+    AFTER INSERT ON projects_benefits
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION refresh_project_details_from_links();
+
+DROP TRIGGER IF EXISTS refresh_project_details_projects_benefits_delete ON projects_benefits;
+CREATE TRIGGER refresh_project_details_projects_benefits_delete
+    AFTER DELETE ON projects_benefits
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION refresh_project_details_from_links();
+
+DROP TRIGGER IF EXISTS refresh_project_details_owners_update ON owners;
+CREATE TRIGGER refresh_project_details_owners_update
+    AFTER UPDATE ON owners
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION refresh_project_details_from_entities();
+
+DROP TRIGGER IF EXISTS refresh_project_details_contacts_update ON contacts;
+CREATE TRIGGER refresh_project_details_contacts_update
+    AFTER UPDATE ON contacts
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION refresh_project_details_from_entities();
+
+DROP TRIGGER IF EXISTS refresh_project_details_cooperators_update ON cooperators;
+CREATE TRIGGER refresh_project_details_cooperators_update
+    AFTER UPDATE ON cooperators
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION refresh_project_details_from_entities();
+
+DROP TRIGGER IF EXISTS refresh_project_details_benefits_update ON benefits;
+CREATE TRIGGER refresh_project_details_benefits_update
+    AFTER UPDATE ON benefits
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION refresh_project_details_from_entities();
+
+DROP TRIGGER IF EXISTS refresh_project_details_locations_update ON locations;
+CREATE TRIGGER refresh_project_details_locations_update
+    AFTER UPDATE ON locations
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION refresh_project_details_from_entities();
+
+DROP TRIGGER IF EXISTS refresh_project_details_addresses_update ON addresses;
+CREATE TRIGGER refresh_project_details_addresses_update
+    AFTER UPDATE ON addresses
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION refresh_project_details_from_entities();
+
+-- Function to count changes to a table in table_versions. The counter row stays
+-- locked until the writing transaction ends, so concurrent writers take turns and
+-- every commit leaves a new value behind, whatever its start time.
+CREATE OR REPLACE FUNCTION bump_table_version()
+RETURNS TRIGGER AS $$
+BEGIN
+    INSERT INTO table_versions (table_name, version) VALUES (TG_TABLE_NAME, 1)
+    ON CONFLICT (table_name) DO UPDATE SET version = table_versions.version + 1;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS bump_project_details_summary_version_insert ON project_details_summary;
+CREATE TRIGGER bump_project_details_summary_version_insert
+    AFTER INSERT ON project_details_summary
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION bump_table_version();
+
+DROP TRIGGER IF EXISTS bump_project_details_summary_version_update ON project_details_summary;
+CREATE TRIGGER bump_project_details_summary_version_update
+    AFTER UPDATE ON project_details_summary
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION bump_table_version();
+
+DROP TRIGGER IF EXISTS bump_project_details_summary_version_delete ON project_details_summary;
+CREATE TRIGGER bump_project_details_summary_version_delete
+    AFTER DELETE ON project_details_summary
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION bump_table_version();
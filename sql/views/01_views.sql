@@ -1,4 +1,5 @@
--- View for projects with all related information
+-- View for projects with all related information; the aggregates are maintained
+-- incrementally in project_details_summary by triggers on the junction tables
 CREATE VIEW project_details AS
 SELECT 
     p.id,
@@ -11,34 +12,16 @@ SELECT
     p.project_link,
     p.notes,
     p.managment_level,
-    string_agg(DISTINCT o.name, ', ') as owners,
-    string_agg(DISTINCT c.name, ', ') as contacts,
-    string_agg(DISTINCT a.city || ', ' || a.county, '; ') as locations,
-    string_agg(DISTINCT co.name, ', ') as cooperators,
-    string_agg(DISTINCT b.name, ', ') as benefits
+    s.owners,
+    s.contacts,
+    s.locations,
+    s.cooperators,
+    s.benefits
 FROM projects p
-LEFT JOIN projects_owners po ON p.id = po.project_id
-LEFT JOIN owners o ON po.owner_id = o.id
-LEFT JOIN projects_contacts pc ON p.id = pc.project_id
-LEFT JOIN contacts c ON pc.contact_id = c.id
-LEFT JOIN projects_locations pl ON p.id = pl.project_id
-LEFT JOIN locations l ON pl.location_id = l.id
-LEFT JOIN addresses a ON l.address_id = a.id
-LEFT JOIN projects_cooperators pco ON p.id = pco.project_id
-LEFT JOIN cooperators co ON pco.cooperator_id = co.id
-LEFT JOIN projects_benefits pb ON p.id = pb.project_id
-LEFT JOIN benefits b ON pb.benefit_id = b.id
-GROUP BY 
-    p.id,
-    p.title,
-    p.description,
-    p.status,
-    p.start_year,
-    p.end_year,
-    p.sector,
-    p.project_link,
-    p.notes,
-    p.managment_level;
+LEFT JOIN project_details_summary s ON s.project_id = p.id;
+
+-- Backfill summaries for projects that already have links
+SELECT refresh_project_details_summary(ARRAY(SELECT id FROM projects));
 
 -- View for project statistics by sector and status
 CREATE VIEW project_statistics AS
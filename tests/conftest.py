@@ -1,7 +1,9 @@
 import pytest
 import os
+from fastapi import FastAPI
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 
@@ -9,9 +11,11 @@ from sqlalchemy.pool import StaticPool
 os.environ["TEST_DATABASE_URL"] = "sqlite:///:memory:"
 
 from app.main import app
-from app.database import Base, get_db
+from app.async_api import router
+from app.database import Base, get_async_db, get_db
 from app import models
-from app.auth import get_current_user
+from app.auth import get_current_user, get_current_user_async
+from app.instrumentation import MetricsMiddleware
 
 # Create test database
 SQLALCHEMY_DATABASE_URL = os.environ["TEST_DATABASE_URL"]
@@ -22,6 +26,15 @@ engine = create_engine(
 )
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Let SQLAlchemy emit BEGIN itself so SAVEPOINTs stay inside the per-test transaction
+@event.listens_for(engine, "connect")
+def disable_pysqlite_transactions(dbapi_connection, connection_record):
+    dbapi_connection.isolation_level = None
+
+@event.listens_for(engine, "begin")
+def emit_begin(conn):
+    conn.exec_driver_sql("BEGIN")
+
 # Override the get_db dependency
 def override_get_db():
     try:
@@ -52,7 +65,8 @@ def test_db():
 def db_session(test_db):
     connection = test_db.connect()
     transaction = connection.begin()
-    session = TestingSessionLocal(bind=connection)
+    # Session commits and rollbacks become SAVEPOINTs inside the per-test transaction
+    session = TestingSessionLocal(bind=connection, join_transaction_mode="create_savepoint")
     
     yield session
     
@@ -70,4 +84,40 @@ def client(db_session):
         yield test_client
     
     # Clear the overrides
-    app.dependency_overrides.clear() 
\ No newline at end of file
+    app.dependency_overrides.clear()
+
+async def create_tables(engine):
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+# The async router on its own in-memory database
+@pytest.fixture(scope="function")
+def async_client():
+    engine = create_async_engine(
+        "sqlite+aiosqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    AsyncTestingSessionLocal = async_sessionmaker(engine, autoflush=False, expire_on_commit=False)
+
+    async def override_get_async_db():
+        async with AsyncTestingSessionLocal() as db:
+            yield db
+
+    async_app = FastAPI()
+    async_app.include_router(router)
+    async_app.add_middleware(MetricsMiddleware)
+    async_app.dependency_overrides[get_async_db] = override_get_async_db
+    async_app.dependency_overrides[get_current_user_async] = override_get_current_user
+
+    with TestClient(async_app) as test_client:
+        test_client.portal.call(create_tables, engine)
+        yield test_client
+        test_client.portal.call(engine.dispose)
+
+# Runs a test once against the sync routes and once against the async router;
+# such tests go through the API only, since the two use separate databases
+@pytest.fixture(scope="function", params=["sync", "async"])
+def api_client(request):
+    return request.getfixturevalue("client" if request.param == "sync" else "async_client")
+
@@ -0,0 +1,71 @@
+def test_async_project_crud(async_client):
+    project_data = {
+        "title": "Async Project",
+        "start_year": 2024,
+        "sector": "IT",
+        "managment_level": "NATIONAL"
+    }
+    response = async_client.post("/projects/", json=project_data)
+    assert response.status_code == 200
+    project_id = response.json()["id"]
+
+    assert async_client.post("/projects/", json=project_data).status_code == 409
+
+    response = async_client.put(f"/projects/{project_id}", json={"status": "IN_PROGRESS"})
+    assert response.status_code == 200
+    assert response.json()["status"] == "IN_PROGRESS"
+
+    response = async_client.get(f"/projects/{project_id}/full")
+    assert response.status_code == 200
+    assert response.json()["owners"] == []
+
+    response = async_client.get("/projects/details")
+    assert response.status_code == 200
+    assert [p["title"] for p in response.json()["items"]] == ["Async Project"]
+
+    response = async_client.delete(f"/projects/{project_id}")
+    assert response.status_code == 200
+    assert async_client.get(f"/projects/{project_id}").status_code == 404
+
+def test_async_bulk_and_cursor_pagination(async_client):
+    owners = [{"name": f"Async Owner {i}"} for i in range(3)]
+    response = async_client.post("/owners/bulk", json=owners)
+    assert response.status_code == 200
+    assert response.json()["created"] == 3
+
+    page = async_client.get("/owners/", params={"cursor": "", "limit": 2}).json()
+    assert [o["name"] for o in page["items"]] == ["Async Owner 0", "Async Owner 1"]
+    page = async_client.get("/owners/", params={"cursor": page["next_cursor"], "limit": 2}).json()
+    assert [o["name"] for o in page["items"]] == ["Async Owner 2"]
+    assert page["next_cursor"] is None
+
+def test_async_upsert(async_client):
+    first = async_client.put("/contacts/", json={"name": "Async Contact", "email": "async@example.com"}).json()
+    second = async_client.put("/contacts/bulk", json=[{"name": "Renamed", "email": "async@example.com"}]).json()
+    assert second[0]["id"] == first["id"]
+    assert second[0]["name"] == "Renamed"
+
+def test_async_link_projects(async_client):
+    project = async_client.post("/projects/", json={
+        "title": "Async Linked", "start_year": 2024, "sector": "IT", "managment_level": "LOCAL"
+    }).json()
+    owner = async_client.post("/owners/", json={"name": "Async Link Owner"}).json()
+    link = {"project_id": project["id"], "target_id": owner["id"]}
+    assert async_client.post("/projects/links/owners", json=[link]).json() == {"linked": 1, "unlinked": 0}
+    response = async_client.put(f"/projects/{project['id']}/links/owners", json=[])
+    assert response.json() == {"linked": 0, "unlinked": 1}
+
+def test_async_sparse_fields(async_client):
+    project = async_client.post("/projects/", json={
+        "title": "Async Sparse", "start_year": 2024, "sector": "IT", "managment_level": "LOCAL"
+    }).json()
+    response = async_client.get(f"/projects/{project['id']}", params={"fields": "title"})
+    assert response.json() == {"id": project["id"], "title": "Async Sparse"}
+    page = async_client.get("/projects/", params={"fields": "status", "cursor": ""}).json()
+    assert {"id": project["id"], "status": "DRAFT"} in page["items"]
+
+def test_async_server_timing_counts_queries(async_client):
+    # Statements run in SQLAlchemy's greenlets are attributed to the request
+    response = async_client.get("/owners/")
+    assert response.status_code == 200
+    assert '1 queries' in response.headers["server-timing"]
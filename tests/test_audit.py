@@ -0,0 +1,44 @@
+from datetime import datetime, timedelta
+from app import models
+
+def _create_audit_entries(db_session):
+    changed_at = datetime(2024, 1, 1, 12, 0, 0)
+    db_session.add_all([
+        models.AuditLog(table_name="projects", record_id=1, action_type="INSERT", changed_by="kart_app_user",
+                        changed_at=changed_at, new_values={"title": "First"}),
+        # Rows written by one statement share the transaction timestamp
+        models.AuditLog(table_name="projects", record_id=1, action_type="UPDATE", changed_by="kart_app_user",
+                        changed_at=changed_at + timedelta(minutes=1),
+                        old_values={"status": "DRAFT"}, new_values={"status": "IN_PROGRESS"}),
+        models.AuditLog(table_name="owners", record_id=7, action_type="UPDATE", changed_by="kart_app_user",
+                        changed_at=changed_at + timedelta(minutes=1),
+                        old_values={"name": "Old"}, new_values={"name": "New"}),
+        models.AuditLog(table_name="projects", record_id=2, action_type="DELETE", changed_by="kart_admin",
+                        changed_at=changed_at + timedelta(minutes=2), old_values={"title": "Second"}),
+    ])
+    db_session.commit()
+
+def test_read_audit_log_newest_first(client, db_session):
+    _create_audit_entries(db_session)
+
+    page = client.get("/audit", params={"limit": 2}).json()
+    assert [(e["table_name"], e["action_type"]) for e in page["items"]] == [("projects", "DELETE"), ("owners", "UPDATE")]
+    assert page["items"][1]["new_values"] == {"name": "New"}
+
+    page = client.get("/audit", params={"limit": 2, "cursor": page["next_cursor"]}).json()
+    assert [(e["table_name"], e["action_type"]) for e in page["items"]] == [("projects", "UPDATE"), ("projects", "INSERT")]
+    assert page["next_cursor"] is None
+
+def test_read_audit_log_filters(client, db_session):
+    _create_audit_entries(db_session)
+
+    page = client.get("/audit", params={"table_name": "projects", "record_id": 1, "order": "asc"}).json()
+    assert [e["action_type"] for e in page["items"]] == ["INSERT", "UPDATE"]
+    page = client.get("/audit", params={"action_type": "DELETE"}).json()
+    assert [e["record_id"] for e in page["items"]] == [2]
+
+    page = client.get("/audit", params={"since": "2024-01-01T12:01:00", "until": "2024-01-01T12:02:00"}).json()
+    assert sorted(e["table_name"] for e in page["items"]) == ["owners", "projects"]
+
+    assert client.get("/audit", params={"cursor": "not-a-cursor"}).status_code == 400
+    assert client.get("/audit", params={"sort": "table_name"}).status_code == 400
@@ -52,4 +52,168 @@ def test_login_nonexistent_user(client, db_session):
     
     response = client.post("/token", data=login_data)
     assert response.status_code == 401
-    assert response.json()["detail"] == "Incorrect username or password" 
\ No newline at end of file
+    assert response.json()["detail"] == "Incorrect username or password"
+
+def test_get_current_user_is_cached(db_session):
+    import asyncio
+    from app import crud
+    from app.auth import get_current_user, token_cache, user_cache
+
+    user_cache.clear()
+    token_cache.clear()
+    user = models.User(
+        username="cacheduser",
+        email="cached@example.com",
+        hashed_password="hashed_password",
+        role="USER"
+    )
+    db_session.add(user)
+    db_session.commit()
+    token = crud.create_access_token(data={"sub": "cacheduser"})
+
+    first = asyncio.run(get_current_user(token=token, db=db_session))
+    misses = user_cache.misses
+    second = asyncio.run(get_current_user(token=token, db=db_session))
+    assert first.id == second.id == user.id
+    assert user_cache.misses == misses
+    assert user_cache.hits >= 1
+    assert token_cache.hits >= 1
+
+    # Changing the user row drops the cached entry
+    user.role = "ADMIN"
+    db_session.commit()
+    third = asyncio.run(get_current_user(token=token, db=db_session))
+    assert third.role == "ADMIN"
+
+def test_login_runs_in_login_pool(client, db_session):
+    from app.auth import login_pool
+
+    user = models.User(
+        username="pooluser",
+        email="pool@example.com",
+        hashed_password=get_password_hash("testpassword"),
+        role="USER"
+    )
+    db_session.add(user)
+    db_session.commit()
+
+    completed = login_pool.completed.value
+    response = client.post("/token", data={"username": "pooluser", "password": "testpassword"})
+    assert response.status_code == 200
+    assert login_pool.completed.value == completed + 1
+    assert login_pool.pending == 0
+    # The user lookup on the login worker is attributed to the request
+    assert '"0 queries"' not in response.headers["server-timing"]
+
+    stats = client.get("/internal/auth/login-pool").json()
+    assert stats["run_seconds"]["count"] >= 1
+
+def test_login_pool_rejects_when_full():
+    import asyncio
+    import threading
+    from app.auth import LoginPool, LoginPoolFull
+
+    async def scenario():
+        pool = LoginPool(workers=1, max_pending=1)
+        release = threading.Event()
+        first = asyncio.ensure_future(pool.run(release.wait))
+        await asyncio.sleep(0)
+        with pytest.raises(LoginPoolFull):
+            await pool.run(lambda: None)
+        release.set()
+        await first
+        assert pool.rejected.value == 1
+        assert await pool.run(lambda: "ok") == "ok"
+
+    asyncio.run(scenario())
+
+def test_stateless_auth_uses_token_claims(db_session, test_db, monkeypatch):
+    import asyncio
+    from fastapi import HTTPException
+    from sqlalchemy import event
+    from app import auth, crud
+
+    monkeypatch.setattr(auth, "AUTH_MODE", "stateless")
+    user = models.User(
+        username="statelessuser",
+        email="stateless@example.com",
+        hashed_password="hashed_password",
+        role="USER"
+    )
+    db_session.add(user)
+    db_session.commit()
+    auth.token_versions.refresh(db_session)
+    token = crud.create_access_token(data=crud.access_token_claims(user))
+
+    statements = []
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+    event.listen(test_db, "before_cursor_execute", record)
+    try:
+        current = asyncio.run(auth.get_current_user(token=token, db=db_session))
+    finally:
+        event.remove(test_db, "before_cursor_execute", record)
+    assert (current.id, current.username, current.role) == (user.id, "statelessuser", models.UserRole.USER)
+    assert statements == []
+
+    # A role change bumps the token version, so tokens with the old role stop working
+    user.role = "ADMIN"
+    db_session.commit()
+    assert user.token_version == 1
+    with pytest.raises(HTTPException):
+        asyncio.run(auth.get_current_user(token=token, db=db_session))
+    token = crud.create_access_token(data=crud.access_token_claims(user))
+    assert asyncio.run(auth.get_current_user(token=token, db=db_session)).role == models.UserRole.ADMIN
+
+    # Tokens without the claims cannot be used statelessly
+    with pytest.raises(HTTPException):
+        asyncio.run(auth.get_current_user(token=crud.create_access_token(data={"sub": "statelessuser"}), db=db_session))
+    auth.token_versions.clear()
+
+def test_user_changes_reach_caches_on_commit(db_session):
+    from app import auth
+
+    user = models.User(username="pendinguser", email="pending@example.com", hashed_password="x", role="USER")
+    db_session.add(user)
+    db_session.commit()
+    auth.token_versions.refresh(db_session)
+    auth.user_cache.set("pendinguser", auth.snapshot_user(user))
+
+    # Flushed but rolled back changes leave the caches alone
+    user.role = "ADMIN"
+    db_session.flush()
+    assert auth.token_versions.get(user.id) == 0
+    assert auth.user_cache.get("pendinguser") is not None
+    db_session.rollback()
+    db_session.commit()
+    assert auth.token_versions.get(user.id) == 0
+
+    user.role = "ADMIN"
+    db_session.commit()
+    assert auth.token_versions.get(user.id) == 1
+    assert auth.user_cache.get("pendinguser") is None
+
+    db_session.delete(user)
+    db_session.commit()
+    assert auth.token_versions.get(user.id) is None
+    auth.token_versions.clear()
+
+def test_revoke_tokens(client, db_session):
+    from app.auth import get_current_user
+    from app.main import app
+
+    user = models.User(
+        username="revokeuser",
+        email="revoke@example.com",
+        hashed_password=get_password_hash("testpassword"),
+        role="USER"
+    )
+    db_session.add(user)
+    db_session.commit()
+    app.dependency_overrides.pop(get_current_user)
+
+    token = client.post("/token", data={"username": "revokeuser", "password": "testpassword"}).json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    assert client.get("/owners/", headers=headers).status_code == 200
+    assert client.post("/token/revoke", headers=headers).status_code == 200
+    assert client.get("/owners/", headers=headers).status_code == 401
@@ -1,5 +1,6 @@
 import pytest
-from sqlalchemy import create_engine
+import re
+from sqlalchemy import create_engine, inspect
 from sqlalchemy.orm import sessionmaker
 from app.database import Base, init_db, engine
 from app import models
@@ -89,4 +90,78 @@ def test_database_initialization_idempotency(db_session):
     
     # Test if we still have exactly 7 users after double initialization
     users = db_session.query(models.User).all()
-    assert len(users) == 7, "Double initialization should not create duplicate users" 
\ No newline at end of file
+    assert len(users) == 7, "Double initialization should not create duplicate users"
+
+def test_migrations_match_models(tmp_path):
+    from alembic import command
+    from alembic.autogenerate import compare_metadata
+    from alembic.migration import MigrationContext
+    from app import manage
+
+    migrated = create_engine(f"sqlite:///{tmp_path / 'migrated.db'}")
+    with migrated.begin() as connection:
+        manage.migrate(connection=connection)
+    with migrated.connect() as connection:
+        diff = compare_metadata(MigrationContext.configure(connection), Base.metadata)
+        triggers = connection.exec_driver_sql("SELECT name FROM sqlite_master WHERE type = 'trigger'").scalars().all()
+        # check() skips the FTS5 tables, which exist only in the database
+        manage.check(connection)
+    assert [change for change in diff if change[0] != "remove_table"] == []
+    assert "refresh_project_details_projects_owners_insert" in triggers
+
+    with migrated.begin() as connection:
+        command.downgrade(manage.alembic_config(connection), "base")
+    assert inspect(migrated).get_table_names() == ["alembic_version"]
+
+def test_unique_names_migration_renames_duplicates(tmp_path):
+    from app import manage
+
+    migrated = create_engine(f"sqlite:///{tmp_path / 'migrated.db'}")
+    with migrated.begin() as connection:
+        manage.migrate("0003", connection=connection)
+        # A database from before names were unique
+        connection.exec_driver_sql("DROP INDEX ix_owners_name")
+        connection.exec_driver_sql("CREATE INDEX ix_owners_name ON owners (name)")
+        connection.exec_driver_sql("INSERT INTO owners (name) VALUES ('Acme'), ('Acme'), ('Other')")
+    with migrated.begin() as connection:
+        manage.migrate(connection=connection)
+        names = connection.exec_driver_sql("SELECT name FROM owners ORDER BY id").scalars().all()
+    assert names == ["Acme", "Acme (2)", "Other"]
+    indexes = {index["name"]: index["unique"] for index in inspect(migrated).get_indexes("owners")}
+    assert indexes["ix_owners_name"]
+
+def test_project_details_triggers_cover_same_tables():
+    # The SQLite shim in app.models has to follow sql/triggers/02_project_details.sql
+    postgresql = set(re.findall(r"^CREATE TRIGGER (\w+)", models.PROJECT_DETAILS_SQL.read_text(), re.M))
+    sqlite = {re.match(r"CREATE TRIGGER IF NOT EXISTS (\w+)", statement).group(1) for statement in models.SQLITE_PROJECT_DETAILS_DDL}
+    # SQLite has no ON DELETE CASCADE by default, so it needs one extra trigger
+    assert sqlite - postgresql == {"refresh_project_details_projects_delete"}
+    assert postgresql <= sqlite
+
+def test_project_details_triggers_run_only_with_new_summary_table():
+    from types import SimpleNamespace
+
+    statements = []
+    connection = SimpleNamespace(
+        dialect=SimpleNamespace(name="postgresql"),
+        exec_driver_sql=lambda statement, **kw: statements.append(statement),
+    )
+    # A create_all that found the schema in place creates no tables
+    models.create_project_details_triggers(Base.metadata, connection, tables=[])
+    assert statements == []
+    models.create_project_details_triggers(Base.metadata, connection, tables=[models.ProjectDetailsSummary.__table__])
+    assert len(statements) == 1
+
+def test_prepare_database_modes(monkeypatch):
+    from app import database, startup
+
+    calls = []
+    monkeypatch.setattr(database, "create_schema", lambda: calls.append("create_schema"))
+    monkeypatch.setattr(database, "seed_default_users", lambda: calls.append("seed_default_users"))
+    startup.prepare_database("none")
+    assert calls == []
+    startup.prepare_database("create_all")
+    assert calls == ["create_schema", "seed_default_users"]
+    assert {"create_schema", "seed_default_users"} <= set(startup.startup_phases)
+    with pytest.raises(ValueError):
+        startup.prepare_database("drop_all")
@@ -0,0 +1,68 @@
+import csv
+import io
+import json
+from app import export, models
+
+def _create_projects(db_session):
+    address = models.Address(city="Bergen", county="Vestland", postal_code="5003")
+    db_session.add(address)
+    db_session.flush()
+    location = models.Location(name="Harbour", address_id=address.id)
+    owners = [models.Owner(name="Ministry"), models.Owner(name="Agency")]
+    db_session.add_all([
+        models.Project(title="Export One", start_year=2023, sector="IT", managment_level="LOCAL",
+                       owners=owners, locations=[location],
+                       benefits=[models.Benefit(name="Savings")]),
+        models.Project(title="Export Two", start_year=2024, sector="HEALTH", managment_level="NATIONAL",
+                       notes="Line one,\nline two"),
+    ])
+    db_session.commit()
+
+def test_export_projects_ndjson(client, db_session):
+    _create_projects(db_session)
+
+    response = client.get("/export/projects")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [row["title"] for row in rows] == ["Export One", "Export Two"]
+    assert rows[0]["owners"] == "Agency, Ministry"
+    assert rows[0]["locations"] == "Bergen, Vestland"
+    assert rows[0]["benefits"] == "Savings"
+    assert rows[1]["owners"] is None
+
+    response = client.get("/export/projects", params={"sector": "HEALTH"})
+    assert [json.loads(line)["title"] for line in response.text.splitlines()] == ["Export Two"]
+
+def test_export_projects_csv(client, db_session):
+    _create_projects(db_session)
+
+    response = client.get("/export/projects", params={"format": "csv"})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert [row["title"] for row in rows] == ["Export One", "Export Two"]
+    assert rows[1]["notes"] == "Line one,\nline two"
+    assert rows[0]["sector"] == "IT"
+
+def test_iter_project_rows_batches_relationship_loads(db_session, test_db):
+    from sqlalchemy import event
+
+    for i in range(7):
+        db_session.add(models.Project(title=f"Batch {i}", start_year=2024, sector="IT", managment_level="LOCAL"))
+    db_session.commit()
+
+    statements = []
+    def count(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith("SELECT"):
+            statements.append(statement)
+
+    event.listen(test_db, "before_cursor_execute", count)
+    try:
+        rows = list(export.iter_project_rows(db_session, batch_size=3))
+    finally:
+        event.remove(test_db, "before_cursor_execute", count)
+
+    assert len(rows) == 7
+    # One id query, then per batch of three the projects plus five relationship loads
+    assert len(statements) == 1 + 3 * 6
@@ -1,14 +1,14 @@
 import pytest
 from datetime import datetime
-from app import models
+from app import models, response_cache
 
-def test_create_owner(client, db_session):
+def test_create_owner(api_client):
     owner_data = {
         "name": "Test Owner",
         "description": "Test Description"
     }
     
-    response = client.post("/owners/", json=owner_data)
+    response = api_client.post("/owners/", json=owner_data)
     assert response.status_code == 200
     data = response.json()
     assert data["name"] == owner_data["name"]
@@ -28,4 +28,124 @@ def test_read_owners(client, db_session):
     data = response.json()
     assert len(data) > 0
     assert data[0]["name"] == "Test Owner"
-    assert data[0]["description"] == "Test Description" 
\ No newline at end of file
+    assert data[0]["description"] == "Test Description"
+
+def test_read_owners_cursor_pagination(api_client):
+    api_client.post("/owners/bulk", json=[{"name": f"Owner {i}"} for i in range(3)])
+
+    response = api_client.get("/owners/", params={"cursor": "", "limit": 2})
+    assert response.status_code == 200
+    page = response.json()
+    assert [o["name"] for o in page["items"]] == ["Owner 0", "Owner 1"]
+    assert page["next_cursor"]
+
+    page = api_client.get("/owners/", params={"cursor": page["next_cursor"], "limit": 2}).json()
+    assert [o["name"] for o in page["items"]] == ["Owner 2"]
+    assert page["next_cursor"] is None
+
+def test_create_owners_bulk(api_client):
+    owners = [{"name": f"Bulk Owner {i}"} for i in range(3)]
+    response = api_client.post("/owners/bulk", json=owners)
+    assert response.status_code == 200
+    data = response.json()
+    assert data["created"] == 3
+    assert data["failed"] == 0
+    assert [o["name"] for o in api_client.get("/owners/").json()] == [o["name"] for o in owners]
+
+def test_upsert_owners(api_client):
+    response = api_client.put("/owners/", json={"name": "Upsert Owner", "description": "First"})
+    assert response.status_code == 200
+    owner_id = response.json()["id"]
+
+    # Re-sending the same natural key updates the existing row
+    response = api_client.put("/owners/", json={"name": "Upsert Owner", "description": "Second"})
+    assert response.status_code == 200
+    assert response.json()["id"] == owner_id
+    assert response.json()["description"] == "Second"
+
+    owners = [
+        {"name": "Upsert Owner", "description": "Third"},
+        {"name": "New Owner 1"},
+        {"name": "New Owner 2"},
+        {"name": "New Owner 1", "description": "Last one wins"},
+    ]
+    response = api_client.put("/owners/bulk", params={"chunk_size": 2}, json=owners)
+    assert response.status_code == 200
+    data = response.json()
+    assert [o["name"] for o in data] == [o["name"] for o in owners]
+    assert data[0]["id"] == owner_id
+    assert data[0]["description"] == "Third"
+    assert data[1]["id"] == data[3]["id"]
+    assert data[1]["description"] == "Last one wins"
+    assert len(api_client.get("/owners/").json()) == 3
+
+def test_entity_names_unique(api_client):
+    assert api_client.post("/owners/", json={"name": "Taken Owner"}).status_code == 200
+    response = api_client.post("/owners/", json={"name": "Taken Owner"})
+    assert response.status_code == 409
+    assert response.json()["detail"] == "Owner with this name already exists"
+
+    # Renaming onto a taken name is rejected and leaves the row unchanged
+    owner_id = api_client.post("/owners/", json={"name": "Other Owner"}).json()["id"]
+    assert api_client.put(f"/owners/{owner_id}", json={"name": "Taken Owner"}).status_code == 409
+    assert api_client.get(f"/owners/{owner_id}").json()["name"] == "Other Owner"
+
+    for path in ("/cooperators/", "/benefits/"):
+        assert api_client.post(path, json={"name": "Taken"}).status_code == 200
+        assert api_client.post(path, json={"name": "Taken"}).status_code == 409
+
+def test_read_owners_sparse_fields(api_client):
+    owner = api_client.post("/owners/", json={"name": "Sparse Owner", "description": "Long text"}).json()
+    assert api_client.get("/owners/", params={"fields": "name"}).json() == [{"id": owner["id"], "name": "Sparse Owner"}]
+    page = api_client.get("/owners/", params={"fields": "name", "cursor": "", "sort": "name"}).json()
+    assert page["items"] == [{"id": owner["id"], "name": "Sparse Owner"}]
+    assert api_client.get("/benefits/", params={"fields": "description"}).json() == []
+    assert api_client.get("/owners/", params={"fields": "projects"}).status_code == 400
+
+def test_sparse_fields_in_openapi():
+    from app.main import app
+
+    # The sync routes document the API, sparse rows next to the full ones
+    paths = app.openapi()["paths"]
+    response = paths["/owners/"]["get"]["responses"]["200"]["content"]["application/json"]["schema"]
+    assert {"$ref": "#/components/schemas/OwnerFields"} in [option.get("items") for option in response["anyOf"]]
+    response = paths["/projects/{project_id}"]["get"]["responses"]["200"]["content"]["application/json"]["schema"]
+    assert {"$ref": "#/components/schemas/ProjectFields"} in response["anyOf"]
+
+class FakeRedis:
+    # Local stand-in for the subset of the Redis client the response cache uses
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value, ex=None):
+        self.data[key] = value
+
+    def incr(self, key):
+        self.data[key] = int(self.data.get(key, 0)) + 1
+        return self.data[key]
+
+@pytest.mark.parametrize("backend", [
+    lambda: response_cache.MemoryBackend(maxsize=128, ttl=60),
+    lambda: response_cache.RedisBackend(FakeRedis(), ttl=60),
+], ids=["memory", "redis"])
+def test_response_cache(client, db_session, monkeypatch, backend):
+    monkeypatch.setattr(response_cache, "backend", backend())
+    owner_id = client.post("/owners/", json={"name": "Cached Owner"}).json()["id"]
+    before = response_cache.get_stats()["entities"]["owners"]
+
+    first = client.get(f"/owners/{owner_id}").json()
+    assert client.get(f"/owners/{owner_id}").json() == first
+    assert client.get("/owners/").json() == client.get("/owners/").json()
+    stats = response_cache.get_stats()["entities"]["owners"]
+    assert stats["hits"] - before["hits"] == 2
+    assert stats["misses"] - before["misses"] == 2
+
+    # Updates and creates through crud invalidate the cached reads
+    client.put(f"/owners/{owner_id}", json={"name": "Renamed Owner"})
+    assert client.get(f"/owners/{owner_id}").json()["name"] == "Renamed Owner"
+    client.post("/owners/", json={"name": "Second Owner"})
+    assert {o["name"] for o in client.get("/owners/").json()} == {"Renamed Owner", "Second Owner"}
+    assert response_cache.get_stats()["entities"]["owners"]["invalidations"] - before["invalidations"] >= 2
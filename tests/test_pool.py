@@ -0,0 +1,105 @@
+import pytest
+from collections import deque
+from sqlalchemy import create_engine, exc
+from app import database, models, slow_queries
+from app.auth import get_current_user
+from app.main import app
+
+def test_engine_options_for_postgresql(monkeypatch):
+    monkeypatch.setattr(database, "DB_STATEMENT_TIMEOUT_MS", 5000)
+    options = database.engine_options("postgresql://user:pass@db:5432/kart")
+    assert options["poolclass"] is database.InstrumentedQueuePool
+    assert options["pool_size"] == database.DB_POOL_SIZE
+    assert options["connect_args"] == {"options": "-c statement_timeout=5000"}
+
+    options = database.engine_options("postgresql+asyncpg://user:pass@db:5432/kart", is_async=True)
+    assert options["poolclass"] is database.InstrumentedAsyncQueuePool
+    assert options["connect_args"] == {"server_settings": {"statement_timeout": "5000"}}
+
+    assert database.engine_options("sqlite:///./test.db") == {}
+
+def test_instrumented_pool_records_waits_and_timeouts(tmp_path):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}",
+        poolclass=database.InstrumentedQueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.05,
+    )
+    waits = database.pool_wait_seconds.count
+    timeouts = database.pool_timeouts.value
+
+    connection = engine.connect()
+    status = database.pool_status(engine)
+    assert status["checked_out"] == 1
+    assert status["size"] == 1
+    with pytest.raises(exc.TimeoutError):
+        engine.connect()
+    connection.close()
+    engine.dispose()
+
+    assert database.pool_wait_seconds.count == waits + 2
+    assert database.pool_timeouts.value == timeouts + 1
+
+def test_read_pool_metrics(client):
+    response = client.get("/internal/pool")
+    assert response.status_code == 200
+    data = response.json()
+    assert "sync" in data
+    assert "+Inf" in data["wait_seconds"]["buckets"]
+
+@pytest.mark.parametrize("path", [
+    "/internal/auth/cache",
+    "/internal/auth/login-pool",
+    "/internal/stats/cache",
+    "/internal/response-cache",
+    "/internal/pool",
+    "/internal/slow-queries",
+])
+def test_internal_routes_require_admin(client, monkeypatch, path):
+    assert client.get(path).status_code == 200
+    viewer = models.User(id=2, username="viewer", role=models.UserRole.USER)
+    monkeypatch.setitem(app.dependency_overrides, get_current_user, lambda: viewer)
+    assert client.get(path).status_code == 403
+
+def test_health(client):
+    response = client.get("/health")
+    assert response.status_code == 200
+    assert response.json()["status"] == "ok"
+    assert "imports" in response.json()["startup_phases"]
+
+def test_request_metrics(client, db_session):
+    owner_id = client.post("/owners/", json={"name": "Metrics Owner"}).json()["id"]
+    response = client.get(f"/owners/{owner_id}")
+    assert response.status_code == 200
+    timing = dict(part.strip().split(";", 1) for part in response.headers["server-timing"].split(","))
+    assert set(timing) == {"app", "db"}
+    assert 'desc="0 queries"' not in timing["db"]
+
+    client.get("/no-such-path")
+    body = client.get("/metrics").text
+    assert 'kart_http_request_duration_seconds_count{method="GET",route="/owners/{owner_id}"}' in body
+    assert 'kart_http_request_db_queries_bucket{method="GET",route="/owners/{owner_id}",le="+Inf"}' in body
+    assert 'kart_http_responses_total{method="GET",route="unmatched",status="404"}' in body
+    assert "/no-such-path" not in body
+
+def test_slow_query_log(client, db_session, monkeypatch):
+    monkeypatch.setattr(slow_queries, "SLOW_QUERY_MS", 0)
+    monkeypatch.setattr(slow_queries, "recent", deque(maxlen=50))
+    owner_id = client.post("/owners/", json={"name": "Slow Owner"}).json()["id"]
+    client.get(f"/owners/{owner_id}")
+
+    response = client.get("/internal/slow-queries")
+    assert response.status_code == 200
+    queries = response.json()["queries"]
+    insert = next(q for q in queries if q["statement"].startswith("INSERT INTO owners"))
+    assert insert["source"] == "crud.create_owner"
+    assert "Slow Owner" not in str(insert["parameters"])
+    select = next(q for q in queries if q["source"] == "crud.get_owner")
+    assert owner_id in select["parameters"]
+    assert select["plan"] is None
+
+def test_slow_query_log_requires_admin(client, monkeypatch):
+    viewer = models.User(id=2, username="viewer", role=models.UserRole.USER)
+    monkeypatch.setitem(app.dependency_overrides, get_current_user, lambda: viewer)
+    assert client.get("/internal/slow-queries").status_code == 403
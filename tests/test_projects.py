@@ -1,6 +1,6 @@
 import pytest
 from datetime import datetime
-from app import models
+from app import models, response_cache
 from app.schemas import ProjectCreate, ProjectUpdate
 
 def test_create_project(client, db_session):
@@ -148,4 +148,478 @@ def test_delete_project(client, db_session):
     
     # Verify the project is deleted
     deleted_project = db_session.query(models.Project).filter(models.Project.id == project.id).first()
-    assert deleted_project is None 
\ No newline at end of file
+    assert deleted_project is None
+
+def test_read_projects_cursor_pagination(client, db_session):
+    for year in range(2020, 2025):
+        db_session.add(models.Project(
+            title=f"Project {year}",
+            status="DRAFT",
+            start_year=year,
+            sector="IT",
+            managment_level="NATIONAL"
+        ))
+    db_session.commit()
+
+    response = client.get("/projects/", params={"cursor": "", "limit": 2})
+    assert response.status_code == 200
+    page = response.json()
+    titles = [p["title"] for p in page["items"]]
+    assert titles == ["Project 2020", "Project 2021"]
+
+    while page["next_cursor"]:
+        response = client.get("/projects/", params={"cursor": page["next_cursor"], "limit": 2})
+        assert response.status_code == 200
+        page = response.json()
+        titles.extend(p["title"] for p in page["items"])
+    assert titles == [f"Project {year}" for year in range(2020, 2025)]
+
+def test_read_projects_cursor_sorted_by_title(client, db_session):
+    for title in ["Charlie", "Alpha", "Bravo"]:
+        db_session.add(models.Project(title=title, start_year=2024, sector="IT", managment_level="LOCAL"))
+    db_session.commit()
+
+    first = client.get("/projects/", params={"cursor": "", "sort": "title", "limit": 2}).json()
+    assert [p["title"] for p in first["items"]] == ["Alpha", "Bravo"]
+    second = client.get("/projects/", params={"cursor": first["next_cursor"], "sort": "title", "limit": 2}).json()
+    assert [p["title"] for p in second["items"]] == ["Charlie"]
+    assert second["next_cursor"] is None
+
+    # A cursor is bound to the sort it was issued for
+    response = client.get("/projects/", params={"cursor": first["next_cursor"], "sort": "id"})
+    assert response.status_code == 400
+
+def test_read_projects_invalid_cursor(api_client):
+    response = api_client.get("/projects/", params={"cursor": "not-a-cursor"})
+    assert response.status_code == 400
+    response = api_client.get("/projects/", params={"cursor": "", "sort": "description"})
+    assert response.status_code == 400
+
+def test_create_projects_bulk(client, db_session):
+    projects = [
+        {"title": f"Bulk Project {i}", "start_year": 2024, "sector": "IT", "managment_level": "LOCAL"}
+        for i in range(5)
+    ]
+    # The duplicate title is rejected without aborting the rest of the batch
+    projects.append(dict(projects[0]))
+
+    response = client.post("/projects/bulk", params={"chunk_size": 2}, json=projects)
+    assert response.status_code == 200
+    data = response.json()
+    assert data["created"] == 5
+    assert data["failed"] == 1
+    assert [item["index"] for item in data["items"]] == list(range(6))
+    assert data["items"][5]["id"] is None
+    assert data["items"][5]["error"]
+
+    for item in data["items"][:5]:
+        project = db_session.get(models.Project, item["id"])
+        assert project.title == projects[item["index"]]["title"]
+        assert project.created_at is not None
+
+def _create_linked_projects(db_session, count):
+    address = models.Address(city="Oslo", county="Oslo", postal_code="0150")
+    db_session.add(address)
+    db_session.flush()
+    owner = models.Owner(name="Linked Owner")
+    benefit = models.Benefit(name="Linked Benefit")
+    location = models.Location(name="Linked Location", address_id=address.id)
+    for i in range(count):
+        db_session.add(models.Project(
+            title=f"Linked Project {i}",
+            start_year=2024,
+            sector="IT",
+            managment_level="LOCAL",
+            owners=[owner],
+            benefits=[benefit],
+            locations=[location]
+        ))
+    db_session.commit()
+
+def test_read_project_full(client, db_session):
+    _create_linked_projects(db_session, 1)
+    project = db_session.query(models.Project).filter_by(title="Linked Project 0").one()
+
+    response = client.get(f"/projects/{project.id}/full")
+    assert response.status_code == 200
+    data = response.json()
+    assert [o["name"] for o in data["owners"]] == ["Linked Owner"]
+    assert [b["name"] for b in data["benefits"]] == ["Linked Benefit"]
+    assert [l["name"] for l in data["locations"]] == ["Linked Location"]
+    assert data["contacts"] == []
+    assert data["cooperators"] == []
+
+    assert client.get("/projects/999999/full").status_code == 404
+
+def test_read_projects_expand_uses_constant_queries(client, db_session, test_db):
+    from sqlalchemy import event
+
+    statements = []
+    def count_selects(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append(statement)
+
+    _create_linked_projects(db_session, 5)
+    event.listen(test_db, "before_cursor_execute", count_selects)
+    try:
+        response = client.get("/projects/", params={"expand": "owners,benefits"})
+    finally:
+        event.remove(test_db, "before_cursor_execute", count_selects)
+
+    assert response.status_code == 200
+    data = response.json()
+    assert len(data) == 5
+    assert all([o["name"] for o in p["owners"]] == ["Linked Owner"] for p in data)
+    assert all("contacts" not in p for p in data)
+    # Projects plus one batched query per expanded relationship
+    assert len(statements) == 3
+
+def test_read_projects_expand_unknown_relationship(api_client):
+    response = api_client.get("/projects/", params={"expand": "owners,users"})
+    assert response.status_code == 400
+
+def test_read_projects_filters_and_sort(client, db_session):
+    rows = [
+        ("Filter A", "IT", "DRAFT", "LOCAL", 2019, 2021),
+        ("Filter B", "IT", "COMPLETED", "NATIONAL", 2020, 2022),
+        ("Filter C", "HEALTH", "COMPLETED", "LOCAL", 2021, None),
+        ("Filter D", "IT", "COMPLETED", "LOCAL", 2023, 2025),
+    ]
+    for title, sector, status, level, start, end in rows:
+        db_session.add(models.Project(
+            title=title, sector=sector, status=status, managment_level=level, start_year=start, end_year=end
+        ))
+    db_session.commit()
+
+    response = client.get("/projects/", params={"sector": "IT", "status": "COMPLETED"})
+    assert response.status_code == 200
+    assert [p["title"] for p in response.json()] == ["Filter B", "Filter D"]
+
+    response = client.get("/projects/", params={"status": ["DRAFT", "COMPLETED"], "managment_level": "LOCAL",
+                                                 "start_year_min": 2020, "order": "desc", "sort": "start_year"})
+    assert [p["title"] for p in response.json()] == ["Filter D", "Filter C"]
+
+    response = client.get("/projects/", params={"end_year_max": 2022, "sort": "title", "order": "desc"})
+    assert [p["title"] for p in response.json()] == ["Filter B", "Filter A"]
+
+    # Filters and sort order also apply to keyset pages
+    first = client.get("/projects/", params={"cursor": "", "sector": "IT", "order": "desc", "limit": 2}).json()
+    assert [p["title"] for p in first["items"]] == ["Filter D", "Filter B"]
+    second = client.get("/projects/", params={"cursor": first["next_cursor"], "sector": "IT", "order": "desc",
+                                              "limit": 2}).json()
+    assert [p["title"] for p in second["items"]] == ["Filter A"]
+
+    assert client.get("/projects/", params={"sector": "SPACE"}).status_code == 422
+    assert client.get("/projects/", params={"sort": "notes"}).status_code == 400
+
+def test_search_projects(client, db_session):
+    db_session.add_all([
+        models.Project(title="Climate Research", description="Measuring glaciers", notes="Funded by research council",
+                       start_year=2024, sector="ENVIRONMENT", managment_level="NATIONAL"),
+        models.Project(title="School Meals", description="Healthy food for research on nutrition",
+                       start_year=2024, sector="EDUCATION", managment_level="LOCAL"),
+        models.Project(title="Road Upgrade", description="Resurfacing county roads",
+                       start_year=2024, sector="GOVERNMENT", managment_level="REGIONAL"),
+    ])
+    db_session.commit()
+
+    response = client.get("/projects/search", params={"q": "research"})
+    assert response.status_code == 200
+    results = response.json()
+    # Title and repeated matches rank above a single description match
+    assert [r["title"] for r in results] == ["Climate Research", "School Meals"]
+    assert results[0]["rank"] > results[1]["rank"]
+
+    response = client.get("/projects/search", params={"q": "research", "skip": 1, "limit": 1})
+    assert [r["title"] for r in response.json()] == ["School Meals"]
+
+    # Stemmed and multi-term queries require every term
+    assert [r["title"] for r in client.get("/projects/search", params={"q": "glacier research"}).json()] == ["Climate Research"]
+    # Query syntax characters are matched literally instead of failing
+    assert [r["title"] for r in client.get("/projects/search", params={"q": 'roads"'}).json()] == ["Road Upgrade"]
+    assert client.get("/projects/search", params={"q": "county OR ("}).status_code == 200
+
+    # Updates and deletes keep the index in sync
+    road = db_session.query(models.Project).filter_by(title="Road Upgrade").one()
+    road.description = "Bridge repairs"
+    db_session.commit()
+    assert client.get("/projects/search", params={"q": "resurfacing"}).json() == []
+    db_session.delete(road)
+    db_session.commit()
+    assert client.get("/projects/search", params={"q": "bridge"}).json() == []
+
+    assert client.get("/projects/search", params={"q": ""}).status_code == 422
+
+def test_read_project_details(client, db_session):
+    address = models.Address(city="Oslo", county="Oslo", postal_code="0150")
+    location = models.Location(name="Office", address=address)
+    owners = [models.Owner(name="Owner B"), models.Owner(name="Owner A")]
+    benefit = models.Benefit(name="Time")
+    linked = models.Project(title="Detailed", start_year=2024, sector="IT", managment_level="LOCAL",
+                            owners=owners, locations=[location], benefits=[benefit])
+    plain = models.Project(title="Plain", start_year=2024, sector="IT", managment_level="LOCAL")
+    db_session.add_all([linked, plain])
+    db_session.commit()
+
+    page = client.get("/projects/details", params={"limit": 1}).json()
+    assert len(page["items"]) == 1
+    details = page["items"][0]
+    assert details["title"] == "Detailed"
+    assert details["owners"] == "Owner A, Owner B"
+    assert details["locations"] == "Oslo, Oslo"
+    assert details["benefits"] == "Time"
+    assert details["contacts"] is None
+
+    page = client.get("/projects/details", params={"limit": 1, "cursor": page["next_cursor"]}).json()
+    assert page["items"][0]["title"] == "Plain"
+    assert page["items"][0]["owners"] is None
+    assert page["next_cursor"] is None
+
+    # Renames and unlinks refresh the summary of the affected project only
+    owners[0].name = "Owner C"
+    address.city = "Bergen"
+    linked.benefits.remove(benefit)
+    db_session.commit()
+    details = client.get("/projects/details", params={"sector": "IT", "limit": 1}).json()["items"][0]
+    assert details["owners"] == "Owner A, Owner C"
+    assert details["locations"] == "Bergen, Oslo"
+    assert details["benefits"] is None
+
+    linked.owners = []
+    linked.locations = []
+    db_session.delete(linked)
+    db_session.commit()
+    assert db_session.query(models.ProjectDetailsSummary).count() == 0
+    assert client.get("/projects/details", params={"sort": "unknown"}).status_code == 400
+
+def test_read_sector_statistics(client, db_session):
+    from app.stats import stats_cache
+
+    db_session.add_all([
+        models.Project(title="Stats 1", start_year=2010, end_year=2014, sector="IT", status="COMPLETED",
+                       managment_level="LOCAL"),
+        models.Project(title="Stats 2", start_year=2010, end_year=2012, sector="IT", status="IN_PROGRESS",
+                       managment_level="LOCAL"),
+        models.Project(title="Stats 3", start_year=2020, end_year=2021, sector="HEALTH", managment_level="LOCAL"),
+    ])
+    db_session.commit()
+
+    response = client.get("/stats/sectors")
+    assert response.status_code == 200
+    statistics = {row["sector"]: row for row in response.json()}
+    assert statistics["IT"] == {
+        "sector": "IT", "total_projects": 2, "active_projects": 1, "completed_projects": 1, "avg_duration_years": 3.0
+    }
+    assert statistics["HEALTH"]["total_projects"] == 1
+
+    hits = stats_cache.hits
+    assert client.get("/stats/sectors").json() == response.json()
+    assert stats_cache.hits == hits + 1
+
+    # Writes through the API and bulk inserts both invalidate the cached result
+    client.post("/projects/", json={"title": "Stats 4", "start_year": 2020, "sector": "HEALTH", "managment_level": "LOCAL"})
+    statistics = {row["sector"]: row for row in client.get("/stats/sectors").json()}
+    assert statistics["HEALTH"]["total_projects"] == 2
+
+    client.post("/projects/bulk", json=[{"title": "Stats 5", "start_year": 2020, "sector": "EDUCATION", "managment_level": "LOCAL"}])
+    statistics = {row["sector"]: row for row in client.get("/stats/sectors").json()}
+    assert statistics["EDUCATION"]["total_projects"] == 1
+
+def test_statistics_views_use_etags(client, db_session):
+    address = models.Address(city="Oslo", county="Oslo", postal_code="0150")
+    owner = models.Owner(name="Stats Owner")
+    db_session.add_all([
+        models.Project(title="View 1", start_year=2020, sector="IT", status="DRAFT", managment_level="LOCAL",
+                       owners=[owner], locations=[models.Location(name="Office", address=address)]),
+        models.Project(title="View 2", start_year=2022, end_year=2023, sector="HEALTH", status="COMPLETED",
+                       managment_level="LOCAL", owners=[owner]),
+    ])
+    db_session.commit()
+
+    response = client.get("/stats/projects")
+    assert response.status_code == 200
+    assert {(row["sector"], row["total_projects"], row["active_projects"]) for row in response.json()} == {
+        ("IT", 1, 1), ("HEALTH", 1, 0)
+    }
+    assert client.get("/stats/management-levels").json() == [
+        {"managment_level": "LOCAL", "project_count": 2, "sectors_covered": 2, "sectors": ["HEALTH", "IT"]}
+    ]
+    locations = client.get("/stats/locations").json()
+    assert locations == [
+        {"city": "Oslo", "county": "Oslo", "project_count": 1, "sectors": ["IT"], "statuses": ["DRAFT"]}
+    ]
+    owners = client.get("/stats/owners")
+    assert owners.json()[0]["owner_name"] == "Stats Owner"
+    assert owners.json()[0]["statuses"] == ["COMPLETED", "DRAFT"]
+
+    etag = owners.headers["etag"]
+    response = client.get("/stats/owners", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.headers["etag"] == etag
+    assert response.content == b""
+
+    # Renaming a linked owner refreshes the project summaries, which bumps their
+    # change counter and so the ETag
+    version = db_session.get(models.TableVersion, "project_details_summary").version
+    owner.name = "Renamed Owner"
+    db_session.commit()
+    assert db_session.get(models.TableVersion, "project_details_summary").version > version
+    response = client.get("/stats/owners", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json()[0]["owner_name"] == "Renamed Owner"
+    assert response.headers["etag"] != etag
+
+    etag = client.get("/stats/projects").headers["etag"]
+    client.put(f"/projects/{owner.projects[0].id}", json={"status": "ON_HOLD"})
+    response = client.get("/stats/projects", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert "ON_HOLD" in {row["status"] for row in response.json()}
+
+def test_project_title_unique_per_sector(api_client):
+    project_data = {"title": "Shared Title", "start_year": 2024, "sector": "IT", "managment_level": "LOCAL"}
+    assert api_client.post("/projects/", json=project_data).status_code == 200
+
+    response = api_client.post("/projects/", json=project_data)
+    assert response.status_code == 409
+    assert "sector" in response.json()["detail"]
+
+    # The same title is allowed in another sector, but cannot be moved into a taken one
+    response = api_client.post("/projects/", json={**project_data, "sector": "HEALTH"})
+    assert response.status_code == 200
+    project_id = response.json()["id"]
+    assert api_client.put(f"/projects/{project_id}", json={"sector": "IT"}).status_code == 409
+    assert api_client.get(f"/projects/{project_id}").json()["sector"] == "HEALTH"
+
+def test_commit_project_reraises_other_integrity_errors(db_session):
+    from sqlalchemy.exc import IntegrityError
+    from app import crud
+
+    project = crud.create_project(db_session, ProjectCreate(title="Keyed", start_year=2024, sector="IT", managment_level="LOCAL"))
+    # A primary key clash is not a title conflict
+    db_session.add(models.Project(id=project.id, title="Other", sector="HEALTH"))
+    with pytest.raises(IntegrityError):
+        crud.commit_project(db_session)
+
+def test_upsert_projects_by_sector_and_title(api_client):
+    project_data = {"title": "Upsert Project", "start_year": 2024, "sector": "IT", "managment_level": "LOCAL"}
+    project_id = api_client.put("/projects/", json=project_data).json()["id"]
+
+    response = api_client.put("/projects/bulk", json=[
+        {**project_data, "status": "IN_PROGRESS"},
+        {**project_data, "sector": "HEALTH"},
+    ])
+    assert response.status_code == 200
+    updated, created = response.json()
+    assert updated["id"] == project_id
+    assert updated["status"] == "IN_PROGRESS"
+    assert created["id"] != project_id
+    assert len(api_client.get("/projects/").json()) == 2
+
+def test_link_projects(client, db_session):
+    projects = [
+        models.Project(title=f"Linked {i}", start_year=2024, sector="IT", managment_level="LOCAL")
+        for i in range(2)
+    ]
+    benefits = [models.Benefit(name=f"Benefit {i}") for i in range(3)]
+    db_session.add_all(projects + benefits)
+    db_session.commit()
+    links = [{"project_id": project.id, "target_id": benefit.id} for project in projects for benefit in benefits]
+
+    # Existing links are skipped, so adding is idempotent
+    response = client.post("/projects/links/benefits", json=links, params={"chunk_size": 4})
+    assert response.status_code == 200
+    assert response.json() == {"linked": 6, "unlinked": 0}
+    assert client.post("/projects/links/benefits", json=links[:2]).json() == {"linked": 0, "unlinked": 0}
+    db_session.expire_all()
+    assert len(projects[0].benefits) == 3
+
+    response = client.request("DELETE", "/projects/links/benefits", json=links[:2] + links[:1])
+    assert response.json() == {"linked": 0, "unlinked": 2}
+    db_session.expire_all()
+    assert [benefit.name for benefit in projects[0].benefits] == ["Benefit 2"]
+    assert len(projects[1].benefits) == 3
+
+    # Setting the links writes only the difference
+    response = client.put(f"/projects/{projects[1].id}/links/benefits", json=[benefits[0].id, benefits[0].id])
+    assert response.json() == {"linked": 0, "unlinked": 2}
+    details = client.get("/projects/details", params={"limit": 2}).json()["items"]
+    assert [item["benefits"] for item in details] == ["Benefit 2", "Benefit 0"]
+
+    assert client.put("/projects/999/links/benefits", json=[]).status_code == 404
+    assert client.post("/projects/links/unknown", json=links).status_code == 422
+
+def test_read_projects_sparse_fields(client, db_session, test_db):
+    from sqlalchemy import event
+
+    projects = [
+        models.Project(title=f"Sparse {i}", description="long text", start_year=2020 + i, sector="IT",
+                       managment_level="LOCAL")
+        for i in range(3)
+    ]
+    db_session.add_all(projects)
+    db_session.commit()
+
+    statements = []
+    def record_selects(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append(statement)
+    event.listen(test_db, "before_cursor_execute", record_selects)
+    try:
+        response = client.get("/projects/", params={"fields": "title,status"})
+    finally:
+        event.remove(test_db, "before_cursor_execute", record_selects)
+    assert response.status_code == 200
+    assert response.json()[0] == {"id": projects[0].id, "title": "Sparse 0", "status": "DRAFT"}
+    # Only the requested columns are read
+    assert len(statements) == 1
+    assert "description" not in statements[0]
+
+    params = {"fields": "title", "sort": "start_year", "order": "desc", "limit": 2, "cursor": ""}
+    page = client.get("/projects/", params=params).json()
+    assert page["items"] == [{"id": projects[2].id, "title": "Sparse 2"}, {"id": projects[1].id, "title": "Sparse 1"}]
+    page = client.get("/projects/", params=params | {"cursor": page["next_cursor"]}).json()
+    assert page == {"items": [{"id": projects[0].id, "title": "Sparse 0"}], "next_cursor": None}
+
+    response = client.get(f"/projects/{projects[0].id}", params={"fields": "start_year"})
+    assert response.json() == {"id": projects[0].id, "start_year": 2020}
+    assert client.get("/projects/999", params={"fields": "title"}).status_code == 404
+    assert client.get("/projects/", params={"fields": "title,secret"}).status_code == 400
+    assert client.get("/projects/", params={"fields": "title", "expand": "owners"}).status_code == 400
+
+def test_fast_serialization_matches_response_models(client, db_session, monkeypatch):
+    from app import serialization
+
+    db_session.add_all([
+        models.Project(title=f"Fast {i}", description="text", start_year=2020, sector="IT", managment_level="LOCAL")
+        for i in range(3)
+    ] + [models.Owner(name=f"Fast Owner {i}") for i in range(3)])
+    db_session.commit()
+    requests = [
+        ("/projects/", {}),
+        ("/projects/", {"cursor": "", "limit": 2, "sort": "title"}),
+        ("/owners/", {"skip": 1}),
+        ("/owners/", {"cursor": "", "limit": 2}),
+    ]
+    expected = [client.get(path, params=params).json() for path, params in requests]
+
+    monkeypatch.setattr(serialization, "FAST_SERIALIZATION", True)
+    assert [client.get(path, params=params).json() for path, params in requests] == expected
+    # Expanded relationships still go through the response model
+    assert client.get("/projects/", params={"expand": "owners"}).json()[0]["owners"] == []
+    monkeypatch.setattr(serialization, "orjson", None)
+    assert [client.get(path, params=params).json() for path, params in requests] == expected
+
+def test_cached_projects_match_uncached(client, db_session, monkeypatch):
+    project_id = client.post("/projects/", json={
+        "title": "Cached Project", "start_year": 2020, "sector": "IT", "managment_level": "LOCAL"
+    }).json()["id"]
+    uncached = client.get("/projects/").json(), client.get(f"/projects/{project_id}").json()
+
+    monkeypatch.setattr(response_cache, "backend", response_cache.MemoryBackend(maxsize=128, ttl=60))
+    for _ in range(2):
+        assert (client.get("/projects/").json(), client.get(f"/projects/{project_id}").json()) == uncached
+    assert response_cache.get_stats()["entities"]["projects"]["hits"] >= 2
+
+    client.put(f"/projects/{project_id}", json={"status": "COMPLETED"})
+    assert client.get(f"/projects/{project_id}").json()["status"] == "COMPLETED"
+    assert client.get("/projects/").json()[0]["status"] == "COMPLETED"